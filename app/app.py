@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
@@ -6,12 +7,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.container import Container
 from app.infrastructure.config import config
-from app.infrastructure.db import database, init_db
+from app.infrastructure.db import engine, init_db
+from app.infrastructure.security import password_hash_pool
 from app.presentation.api.v1.routes.auth.jwt import router as jwt_router
 from app.presentation.api.v1.routes.client_router import router as client_router
 from app.presentation.api.v1.routes.photo_router import router as photo_router
 from app.presentation.api.v1.routes.graph_router import router as graph_router
 from app.presentation.api.v1.routes.listing_route import router as listing_router
+from app.presentation.api.v1.routes.metrics_router import router as metrics_router
 from app.presentation.api.v1.routes.note_route import router as note_router
 from app.presentation.api.v1.routes.user_route import router as user_router
 
@@ -26,6 +29,7 @@ container.wire(
         "app.presentation.api.v1.routes.graph_router",
     "app.presentation.api.v1.routes.note_route",
     "app.presentation.api.v1.routes.photo_router",
+    "app.presentation.api.v1.routes.metrics_router",
     ]
 )
 
@@ -34,9 +38,25 @@ container.wire(
 async def lifespan(_: FastAPI) -> AsyncGenerator:
     """Lifespan function working on app startup."""
     await init_db()
-    await database.connect()
+    photo_sweeper = None
+    if config.PHOTO_SWEEP_INTERVAL_SECONDS > 0:
+        photo_sweeper = asyncio.create_task(
+            container.photo_service().sweep_periodically(
+                config.PHOTO_SWEEP_INTERVAL_SECONDS
+            )
+        )
     yield
-    await database.disconnect()
+    if photo_sweeper is not None:
+        photo_sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await photo_sweeper
+    await container.photo_service().wait_for_variants()
+    await container.email_service().disconnect()
+    await engine.dispose()
+    password_hash_pool.shutdown()
+    container.graph_render_pool().shutdown()
+    container.photo_io_pool().shutdown()
+    container.photo_variant_pool().shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -47,6 +67,7 @@ app.include_router(client_router, prefix=config.API_STR)
 app.include_router(graph_router, prefix=config.API_STR)
 app.include_router(note_router, prefix=config.API_STR)
 app.include_router(photo_router, prefix=config.API_STR)
+app.include_router(metrics_router, prefix=config.API_STR)
 
 origins = ["http://localhost:4200"]
 
@@ -1,8 +1,22 @@
 from abc import ABC, abstractmethod
 from io import BytesIO
 
+from app.domain.dtos.rendered_graph_dto import RenderedGraphDTO
+
 class IGraphService(ABC):
 
     @abstractmethod
     async def generate_graph_buffer(self, year_or_all: int | None = None) -> BytesIO:
-        """abstract method"""
\ No newline at end of file
+        """abstract method"""
+
+    @abstractmethod
+    async def get_graph(self, year_or_all: int | None = None) -> RenderedGraphDTO:
+        """Return the rendered graph together with its content based ETag."""
+
+    @abstractmethod
+    def cache_stats(self) -> dict:
+        """abstract method"""
+
+    @abstractmethod
+    def render_stats(self) -> dict:
+        """abstract method"""
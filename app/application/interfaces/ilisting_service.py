@@ -1,12 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterable, AsyncIterator, Iterable, Sequence
 
-from pydantic import UUID4
+from pydantic import UUID4, BaseModel
 
-from app.domain.dtos.filter_dto import FilterDTO
+from app.domain.dtos.filter_dto import FilterDTO, FilterExpressionDTO
 from app.domain.dtos.sort_options_dto import SortOptions
 from app.domain.models.listing_update import ListingUpdate
-from app.presentation.schemas.listing_schema import ListingDB, ListingIn
+from app.presentation.schemas.listing_schema import ListingDB, ListingIn, ListingPage
 
 
 class IListingService(ABC):
@@ -14,16 +14,50 @@ class IListingService(ABC):
     async def save_listing(self, listings: Iterable[ListingIn]) -> Iterable[ListingDB]:
         """abstract method"""
 
+    @abstractmethod
+    async def import_listings(
+        self, batches: AsyncIterable[Sequence[ListingIn]]
+    ) -> int:
+        """Import streamed batches of listings, returning the imported count."""
+
     @abstractmethod
     async def get_listings(
-        self, sort_options: SortOptions, filter: FilterDTO
-    ) -> Iterable[ListingDB]:
+        self,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+        fields: Sequence[str] | None = None,
+    ) -> Iterable[ListingDB] | list[BaseModel]:
         """
 
         Returns:
                 ListingDB: _description_
         """
 
+    @abstractmethod
+    async def export_listings(
+        self,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+    ) -> AsyncIterator[list[dict]]:
+        """Return an iterator streaming every matching listing in row batches."""
+
+    @abstractmethod
+    async def get_listings_page(
+        self,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+        limit: int,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> ListingPage | BaseModel:
+        """Return a single keyset-paginated page of listings."""
+
+    @abstractmethod
+    async def search_listings(
+        self, text: str, limit: int, cursor: str | None = None
+    ) -> ListingPage:
+        """Return one page of listings matching the search text, best match first."""
+
     @abstractmethod
     async def remove_listing(self, listing_id: UUID4):
         """abstract method"""
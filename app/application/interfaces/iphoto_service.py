@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Sequence
+from typing import AsyncIterator, Iterable, Sequence
 
 from pydantic import UUID4
 
+from app.domain.dtos.photo_sweep_dto import PhotoSweepReportDTO
 from app.domain.dtos.photo_upload_dto import ListingPhotoUploadDTO
-from app.presentation.schemas.photo_schema import ListingPhotoDB
+from app.presentation.schemas.photo_schema import (
+    ListingPhotoDB,
+    ListingPhotoVariantDB,
+)
 
 
 class IListingPhotoService(ABC):
@@ -22,6 +26,34 @@ class IListingPhotoService(ABC):
     async def get_photo(self, photo_id: UUID4) -> ListingPhotoDB | None:
         """Fetch stored metadata for a photo."""
 
+    @abstractmethod
+    async def delete_photo(self, photo_id: UUID4) -> bool:
+        """Delete a photo, removing its files once no other photo shares them."""
+
+    @abstractmethod
+    async def sweep_orphans(self, dry_run: bool = False) -> PhotoSweepReportDTO:
+        """Remove files no photo references and report rows missing files."""
+
+    @abstractmethod
+    def sweep_stats(self) -> dict | None:
+        """Return the report of the last orphan sweep, if one ran."""
+
+    @abstractmethod
+    async def get_photo_variant(
+        self, photo_id: UUID4, name: str
+    ) -> ListingPhotoVariantDB | None:
+        """Fetch a generated resized variant of a photo."""
+
+    @abstractmethod
+    async def has_stored_file(self, storage_path: str) -> bool:
+        """Return whether a stored photo or variant file is present on disk."""
+
+    @abstractmethod
+    async def generate_variants(
+        self, photo: ListingPhotoDB
+    ) -> Sequence[ListingPhotoVariantDB]:
+        """Render and persist every configured variant of a stored photo."""
+
     @abstractmethod
     async def list_photos_by_listing(
         self, listing_id: UUID4
@@ -29,11 +61,7 @@ class IListingPhotoService(ABC):
         """Return all stored photo metadata for a listing."""
 
     @abstractmethod
-    async def read_photo(self, photo_id: UUID4) -> tuple[ListingPhotoDB, bytes]:
-        """Return photo metadata along with its binary content."""
-
-    @abstractmethod
-    async def read_photos_by_listing(
+    async def stream_listing_archive(
         self, listing_id: UUID4
-    ) -> Sequence[tuple[ListingPhotoDB, bytes]]:
-        """Return all photo binaries for a listing."""
+    ) -> AsyncIterator[bytes]:
+        """Return a ZIP archive of all photos of a listing as streamed chunks."""
@@ -1,24 +1,29 @@
+import logging
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Iterable
 
-import aiosmtplib
 from jinja2 import Environment
 
 from app.application.interfaces.iemail_service import IEmailService
 from app.application.interfaces.igraph_service import IGraphService
 from app.domain.repositories.ilisting_repository import IListingRepository
 from app.infrastructure.config import config
+from app.infrastructure.smtp_pool import SMTPConnectionPool
+
+logger = logging.getLogger(__name__)
 
 
 class EmailService(IEmailService):
-    def __init__(self, repository: IListingRepository, graph_service: IGraphService):
-        self.smtp_srv_addr: str = "smtp.gmail.com"
-        self.smtp_srv_port = 587
-        self.gmail_pass: str = config.GMAIL_GENERATED_PASSWORD
+    def __init__(
+        self,
+        repository: IListingRepository,
+        graph_service: IGraphService,
+        smtp_pool: SMTPConnectionPool,
+    ):
         self.gmail_addr: str = config.GMAIL_ADDRESS
-        self._smtp: aiosmtplib.SMTP | None = None
+        self._smtp_pool = smtp_pool
 
         self._repository = repository
         self.graph_service = graph_service
@@ -127,15 +132,6 @@ class EmailService(IEmailService):
         listing_data = await self._repository.get_single_listing(listing_id=listing_id)
         return listing_data.model_dump()
 
-    async def get_smtp_conn(self):
-        if self._smtp is None or not self._smtp.is_connected:
-            self._smtp = aiosmtplib.SMTP(
-                hostname=self.smtp_srv_addr, port=self.smtp_srv_port
-            )
-            await self._smtp.connect()
-            await self._smtp.login(self.gmail_addr, self.gmail_pass)
-        return self._smtp
-
     async def send_email(self, to, subject, listing_id: str):
         listing_data = await self.get_listing_data(listing_id=listing_id)
 
@@ -179,18 +175,10 @@ class EmailService(IEmailService):
         body.attach(img)
 
         try:
-            smtp = await self.get_smtp_conn()
-            await smtp.send_message(body)
-            await smtp.quit()
+            await self._smtp_pool.send_message(body)
             return {"response": "email sent successfully"}
         except Exception:
-            self._smtp = None
+            logger.exception("Sending listing %s to %s failed", listing_id, to)
 
     async def disconnect(self):
-        if self._smtp and self._smtp.is_connected:
-            try:
-                await self._smtp.quit()
-            except aiosmtplib.SMTPException:
-                pass
-            finally:
-                self._smtp = None
+        await self._smtp_pool.close()
@@ -1,99 +1,99 @@
+import hashlib
+import io
 from typing import Iterable
 
-import matplotlib
 import pandas as pd
 import seaborn as sns
-from sqlalchemy import select
+from matplotlib.figure import Figure
 
+from app.application.interfaces.igraph_service import IGraphService
+from app.domain.dtos.price_per_area_dto import MonthlyPricePerAreaDTO
+from app.domain.dtos.rendered_graph_dto import RenderedGraphDTO
 from app.domain.repositories.ilisting_repository import IListingRepository
-from app.infrastructure.models.listing_model import Listing
-from app.presentation.schemas.listing_schema import ListingDB
+from app.infrastructure.cache import TTLCache
+from app.infrastructure.config import config
+from app.infrastructure.workers import WorkerPool
 
-matplotlib.use("Agg")
-import io
 
-import matplotlib.pyplot as plt
+def render_graph(
+    monthly_prices: list[MonthlyPricePerAreaDTO], year_or_all: int | None
+) -> bytes:
+    """Render the price per area graph to PNG bytes.
 
+    Runs inside the render worker processes, so it only uses the object
+    oriented Figure API and never touches pyplot global state.
+    """
+    sns.set_theme("poster")
 
-class GraphService:
-    def __init__(self, repository: IListingRepository):
-        self.repository = repository
+    figure = Figure(figsize=(12, 6), dpi=100)
+    ax = figure.subplots()
 
-    async def generate_graph_buffer(self, year_or_all: int | None = None):
-        sns.set_theme("poster")
-
-        plt.figure(figsize=(12, 7), dpi=100)
-
-        listings: Iterable[ListingDB] = await self.repository.get_listings(
-            select(Listing)
-        )
+    df = pd.DataFrame(
+        [
+            {"year": row.year, "month": row.month, "price": row.price}
+            for row in monthly_prices
+        ],
+        columns=["year", "month", "price"],
+    ).set_index(["year", "month"])
 
-        dates_data = []
-        price_data = []
-        area_data = []
+    if year_or_all is not None:
+        sns.lineplot(data=df.loc[year_or_all], x="month", y="price", ax=ax)
+        ax.set_title(f"{year_or_all}")
+    else:
+        sns.lineplot(data=df, x="month", y="price", hue="year", ax=ax)
+        ax.set_title("All years")
 
-        for listing in listings:
-            data = listing.model_dump(include=["price", "area", "created_at"])
+    ax.set_xlim(1, 12)
 
-            dates_data.append(data["created_at"])
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
 
-            price_data.append(data["price"])
+    return buffer.getvalue()
 
-            area_data.append(data["area"])
 
-        datetime_series = datetime_series = pd.Series(
-            pd.to_datetime(dates_data, errors="coerce")
+class GraphService(IGraphService):
+    def __init__(self, repository: IListingRepository, render_pool: WorkerPool):
+        self.repository = repository
+        self._render_pool = render_pool
+        self._cache = TTLCache(
+            max_size=config.GRAPH_CACHE_SIZE,
+            ttl_seconds=config.GRAPH_CACHE_TTL_SECONDS,
         )
 
-        price_series = pd.Series(price_data)
-
-        area_series = pd.Series(area_data)
-
-        price_per_meter = price_series / area_series
-
-        df = pd.DataFrame({"date": datetime_series})
+    async def generate_graph_buffer(self, year_or_all: int | None = None):
+        graph = await self.get_graph(year_or_all=year_or_all)
+        return io.BytesIO(graph.content)
 
-        df = pd.DataFrame(
-            {
-                "year": df["date"].dt.year,
-                "month": df["date"].dt.month,
-                "price": price_per_meter,
-            }
+    async def get_graph(self, year_or_all: int | None = None) -> RenderedGraphDTO:
+        monthly_prices: Iterable[MonthlyPricePerAreaDTO] = list(
+            await self.repository.get_monthly_price_per_area()
         )
 
-        df = df.groupby(["year", "month"]).mean().round()
+        if year_or_all not in {row.year for row in monthly_prices}:
+            year_or_all = None
 
-        date_indexes = df.index.get_level_values(0).tolist()
+        etag = self._build_etag(monthly_prices, year_or_all)
 
-        if year_or_all in date_indexes:
-            sns.relplot(
-                data=df.loc[year_or_all],
-                x="month",
-                y="price",
-                kind="line",
-                height=6,
-                aspect=2,
-            )
-            plt.title(f"{year_or_all}")
-        else:
-            sns.relplot(
-                data=df,
-                x="month",
-                y="price",
-                kind="line",
-                hue="year",
-                height=6,
-                aspect=2,
+        graph = self._cache.get(etag)
+        if graph is None:
+            content = await self._render_pool.run(
+                render_graph, monthly_prices, year_or_all
             )
-            plt.title("All years")
-
-        plt.xlim(1, 12)
+            graph = RenderedGraphDTO(etag=etag, content=content)
+            self._cache.set(etag, graph)
 
-        buffer = io.BytesIO()
+        return graph
 
-        plt.savefig(buffer, format="png")
-        plt.close("all")
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
 
-        buffer.seek(0)
+    def render_stats(self) -> dict:
+        return self._render_pool.stats()
 
-        return buffer
+    def _build_etag(
+        self, monthly_prices: Iterable[MonthlyPricePerAreaDTO], year_or_all: int | None
+    ) -> str:
+        digest = hashlib.sha256(f"year={year_or_all}".encode("utf-8"))
+        for row in monthly_prices:
+            digest.update(f"|{row.year}-{row.month}={row.price}".encode("utf-8"))
+        return f'"{digest.hexdigest()[:32]}"'
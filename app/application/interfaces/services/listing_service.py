@@ -1,15 +1,45 @@
-from typing import Iterable
+import datetime
+import enum
+import re
+import uuid
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Sequence
 
-from pydantic import UUID4
-from sqlalchemy import select
+from pydantic import UUID4, BaseModel
+from sqlalchemy import (
+    REAL,
+    Select,
+    and_,
+    asc,
+    desc,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 
 from app.application.interfaces.ilisting_service import IListingService
-from app.domain.dtos.filter_dto import FilterDTO
+from app.domain.dtos.filter_dto import FilterDTO, FilterExpressionDTO
+from app.domain.dtos.listing_cursor_dto import ListingCursor
 from app.domain.dtos.sort_options_dto import SortOptions
 from app.domain.models.listing_update import ListingUpdate
 from app.domain.repositories.ilisting_repository import IListingRepository
-from app.infrastructure.models.listing_model import Listing
-from app.presentation.schemas.listing_schema import ListingDB, ListingIn
+from app.infrastructure.models.listing_model import SEARCH_TEXT_CONFIG, Listing
+from app.presentation.schemas.listing_schema import (
+    LISTING_FIELDS,
+    ListingDB,
+    ListingIn,
+    ListingPage,
+    listing_fields,
+    listing_projection,
+    listing_projection_page,
+)
+
+
+SEARCH_RANK_CURSOR_COLUMN = "rank"
+
+_SEARCH_TERM = re.compile(r"\w+")
 
 
 class ListingService(IListingService):
@@ -19,26 +49,130 @@ class ListingService(IListingService):
     async def save_listing(self, listings: Iterable[ListingIn]) -> Iterable[ListingDB]:
         return await self._repository.save_listing(listings=listings)
 
+    async def import_listings(
+        self, batches: AsyncIterable[Sequence[ListingIn]]
+    ) -> int:
+        return await self._repository.import_listings(batches=batches)
+
     async def get_listings(
-        self, sort_options: SortOptions, filter: FilterDTO
-    ) -> Iterable[ListingDB]:
-        query = select(Listing)
-        sort_func = sort_options.get_sort_func()
+        self,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+        fields: Sequence[str] | None = None,
+    ) -> Iterable[ListingDB] | list[BaseModel]:
+        query = select(Listing) if fields is None else self._select_fields(fields)
+        query = self._apply_sort_and_filter(query, sort_options, filter)
 
-        if filter is not None:
-            filter_column = getattr(Listing, filter.field)
-            filter_operator = filter.get_operator()
-            filter_exp = getattr(filter_column, filter_operator)
+        if fields is None:
+            return await self._repository.get_listings(query=query)
+        return await self._get_projections(query, fields)
 
-            if filter_operator == "like":
-                query = query.where(filter_exp(f"%{filter.value}%"))
-            else:
-                query = query.where(filter_exp(filter.value))
+    async def export_listings(
+        self,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+    ) -> AsyncIterator[list[dict]]:
+        query = self._apply_sort_and_filter(
+            self._select_fields(LISTING_FIELDS), sort_options, filter
+        )
+        return self._repository.stream_listing_rows(query=query)
 
-        if sort_func is not None:
-            query = query.order_by(sort_func)
+    async def get_listings_page(
+        self,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+        limit: int,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> ListingPage | BaseModel:
+        sort_column = self._get_keyset_column(sort_options.column)
+        descending = sort_options.order.lower() == "desc"
+        order = "desc" if descending else "asc"
+
+        if fields is not None and sort_options.column is not None:
+            # The cursor is built from the sort column of the last row.
+            fields = listing_fields([*fields, sort_options.column])
+
+        query = select(Listing) if fields is None else self._select_fields(fields)
+        query = self._apply_filter(query, filter)
+
+        if cursor is not None:
+            position = ListingCursor.decode(cursor)
+            if position.column != sort_options.column or position.order != order:
+                raise ValueError("Cursor does not match the requested sort options")
+            query = query.where(
+                self._keyset_predicate(sort_column, position, descending)
+            )
+
+        direction = desc if descending else asc
+        if sort_column is not None:
+            query = query.order_by(direction(sort_column))
+        query = query.order_by(direction(Listing.id)).limit(limit + 1)
 
-        return await self._repository.get_listings(query=query)
+        if fields is None:
+            listings = list(await self._repository.get_listings(query=query))
+        else:
+            listings = await self._get_projections(query, fields)
+
+        next_cursor = None
+        if len(listings) > limit:
+            listings = listings[:limit]
+            last = listings[-1]
+            next_cursor = ListingCursor(
+                column=sort_options.column,
+                order=order,
+                value=self._cursor_value(last, sort_options.column),
+                id=str(last.id),
+            ).encode()
+
+        if fields is None:
+            return ListingPage(items=listings, next_cursor=next_cursor)
+        return listing_projection_page(tuple(fields))(
+            items=listings, next_cursor=next_cursor
+        )
+
+    async def search_listings(
+        self, text: str, limit: int, cursor: str | None = None
+    ) -> ListingPage:
+        ts_query = self._build_search_query(text)
+        rank = func.ts_rank_cd(Listing.search_vector, ts_query)
+
+        query = select(Listing, rank).where(
+            Listing.search_vector.bool_op("@@")(ts_query)
+        )
+
+        if cursor is not None:
+            position = ListingCursor.decode(cursor)
+            if position.column != SEARCH_RANK_CURSOR_COLUMN:
+                raise ValueError("Cursor does not belong to a search result")
+            try:
+                last_rank = float(position.value)
+                last_id = uuid.UUID(position.id)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Malformed cursor {cursor}") from e
+            query = query.where(
+                tuple_(rank, Listing.id)
+                < tuple_(literal(last_rank, REAL), literal(last_id, Listing.id.type))
+            )
+
+        query = query.order_by(rank.desc(), Listing.id.desc()).limit(limit + 1)
+
+        results = list(await self._repository.get_ranked_listings(query=query))
+
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last, last_rank = results[-1]
+            next_cursor = ListingCursor(
+                column=SEARCH_RANK_CURSOR_COLUMN,
+                order="desc",
+                value=last_rank,
+                id=str(last.id),
+            ).encode()
+
+        return ListingPage(
+            items=[listing for listing, _ in results], next_cursor=next_cursor
+        )
 
     async def remove_listing(self, listing_id: UUID4):
         return await self._repository.delete_listing(listing_id=listing_id)
@@ -50,3 +184,117 @@ class ListingService(IListingService):
         self, listing_id: UUID4, listing: ListingUpdate
     ) -> ListingDB:
         return await self._repository.patch_listing(listing_id, listing)
+
+    def _apply_sort_and_filter(
+        self,
+        query: Select,
+        sort_options: SortOptions,
+        filter: FilterDTO | FilterExpressionDTO | None,
+    ) -> Select:
+        sort_func = sort_options.get_sort_func()
+
+        query = self._apply_filter(query, filter)
+
+        if sort_func is not None:
+            query = query.order_by(sort_func)
+        return query
+
+    def _apply_filter(
+        self, query: Select, filter: FilterDTO | FilterExpressionDTO | None
+    ) -> Select:
+        if filter is None:
+            return query
+
+        if isinstance(filter, FilterExpressionDTO):
+            return query.where(
+                or_(
+                    *(
+                        and_(*(self._filter_clause(condition) for condition in group))
+                        for group in filter.groups
+                    )
+                )
+            )
+        return query.where(self._filter_clause(filter))
+
+    def _filter_clause(self, filter: FilterDTO):
+        filter_column = getattr(Listing, filter.field)
+        filter_operator = filter.get_operator()
+        filter_exp = getattr(filter_column, filter_operator)
+
+        if filter_operator == "like":
+            return filter_exp(f"%{filter.value}%")
+        if filter_operator == "between":
+            return filter_exp(*filter.value)
+        return filter_exp(filter.value)
+
+    def _select_fields(self, fields: Sequence[str]) -> Select:
+        return select(*(getattr(Listing, name) for name in fields))
+
+    async def _get_projections(
+        self, query: Select, fields: Sequence[str]
+    ) -> list[BaseModel]:
+        projection = listing_projection(tuple(fields))
+        rows = await self._repository.get_listing_rows(query=query)
+        # Rows come straight from typed columns, so they are not validated again.
+        return [projection.model_construct(**row) for row in rows]
+
+    def _build_search_query(self, text: str):
+        # Every term is matched as a prefix so partially typed words still hit
+        # the GIN index on search_vector.
+        terms = _SEARCH_TERM.findall(text.lower())
+        if not terms:
+            raise ValueError("Search text must contain at least one word")
+
+        return func.to_tsquery(
+            literal(SEARCH_TEXT_CONFIG).cast(REGCONFIG),
+            " & ".join(f"{term}:*" for term in terms),
+        )
+
+    def _get_keyset_column(self, column_name: str | None):
+        if column_name is None:
+            return None
+
+        column = Listing.__table__.columns.get(column_name)
+        if column is None or column.nullable:
+            raise ValueError(f"Cannot paginate by column {column_name}")
+        return getattr(Listing, column_name)
+
+    def _keyset_predicate(self, sort_column, position: ListingCursor, descending: bool):
+        try:
+            last_id = uuid.UUID(position.id)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Malformed cursor id {position.id}") from e
+
+        if sort_column is None:
+            return Listing.id < last_id if descending else Listing.id > last_id
+
+        last_value = self._parse_cursor_value(sort_column, position.value)
+        keys = tuple_(sort_column, Listing.id)
+        bound = tuple_(
+            literal(last_value, sort_column.type), literal(last_id, Listing.id.type)
+        )
+        return keys < bound if descending else keys > bound
+
+    def _cursor_value(self, listing: ListingDB, column_name: str | None) -> Any:
+        if column_name is None:
+            return None
+
+        value = getattr(listing, column_name)
+        if isinstance(value, enum.Enum):
+            return value.name
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+    def _parse_cursor_value(self, sort_column, raw_value: Any) -> Any:
+        python_type = sort_column.type.python_type
+        try:
+            if issubclass(python_type, enum.Enum):
+                return python_type[raw_value]
+            if python_type is datetime.datetime:
+                return datetime.datetime.fromisoformat(raw_value)
+            return python_type(raw_value)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed cursor value {raw_value}") from e
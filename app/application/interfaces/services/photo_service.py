@@ -1,13 +1,117 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import time
 import uuid
+import zipfile
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
 
+from PIL import Image, ImageOps
 from pydantic import UUID4
 
 from app.application.interfaces.iphoto_service import IListingPhotoService
+from app.domain.dtos.photo_sweep_dto import PhotoSweepReportDTO
 from app.domain.dtos.photo_upload_dto import ListingPhotoUploadDTO
 from app.domain.repositories.iphoto_repository import IListingPhotoRepository
-from app.presentation.schemas.photo_schema import ListingPhotoCreate, ListingPhotoDB
+from app.infrastructure.config import config
+from app.infrastructure.photo_storage import PhotoStorageLayout, move_file
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.infrastructure.workers import WorkerPool
+from app.presentation.schemas.photo_schema import (
+    ListingPhotoCreate,
+    ListingPhotoDB,
+    ListingPhotoVariantCreate,
+    ListingPhotoVariantDB,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_MISSING_PHOTOS = 100
+
+
+@dataclass(frozen=True, slots=True)
+class PhotoVariantSpec:
+    name: str
+    image_format: str
+    content_type: str
+    extension: str
+    max_size: int | None = None
+
+
+PHOTO_VARIANTS = {
+    spec.name: spec
+    for spec in (
+        PhotoVariantSpec(
+            "thumbnail", "JPEG", "image/jpeg", ".jpg", config.PHOTO_THUMBNAIL_SIZE
+        ),
+        PhotoVariantSpec(
+            "medium", "JPEG", "image/jpeg", ".jpg", config.PHOTO_MEDIUM_SIZE
+        ),
+        PhotoVariantSpec("webp", "WEBP", "image/webp", ".webp"),
+    )
+}
+
+
+def variant_stored_name(stored_name: str, spec: PhotoVariantSpec) -> str:
+    """Name of a variant file, stored in the same directory as its original."""
+    return f"{Path(stored_name).stem}.{spec.name}{spec.extension}"
+
+
+def render_photo_variant(
+    source_path: str, target_path: str, spec: PhotoVariantSpec, quality: int
+) -> tuple[int, int, int]:
+    """Write a resized copy of an image and return its width, height and size.
+
+    Runs inside the variant worker processes.
+    """
+    target = Path(target_path)
+    # Photos sharing a blob may render the same variant at the same time.
+    temp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+
+    with Image.open(source_path) as image:
+        variant = ImageOps.exif_transpose(image)
+        if spec.max_size is not None:
+            variant.thumbnail((spec.max_size, spec.max_size))
+        if spec.image_format == "JPEG" and variant.mode != "RGB":
+            variant = variant.convert("RGB")
+
+        try:
+            variant.save(
+                temp_path, format=spec.image_format, quality=quality, optimize=True
+            )
+            os.replace(temp_path, target)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        return variant.width, variant.height, target.stat().st_size
+
+
+def _variant_file_info(path: Path) -> tuple[int, int, int] | None:
+    """Return the width, height and size of an existing variant file."""
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+        return width, height, path.stat().st_size
+    except FileNotFoundError:
+        return None
 
 
 class ListingPhotoServiceError(Exception):
@@ -26,78 +130,262 @@ class InvalidImageTypeError(ListingPhotoServiceError):
     """Raised when the uploaded file is not a supported image."""
 
 
+def _write_chunk(file: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    digest.update(chunk)
+    file.write(chunk)
+
+
+def _move_into_place(temp_path: Path, target_path: Path) -> bool:
+    """Move a finished upload to its content address, reusing an existing blob.
+
+    Returns whether a new file was created.
+    """
+    if target_path.exists():
+        try:
+            # A fresh mtime keeps the orphan sweeper off a blob being reused.
+            os.utime(target_path)
+        except FileNotFoundError:
+            pass
+        else:
+            temp_path.unlink()
+            return False
+    move_file(temp_path, target_path)
+    return True
+
+
+def _stat_batch(files: Iterator[Path], size: int) -> list[tuple[Path, float, int]]:
+    batch = []
+    for path in islice(files, size):
+        try:
+            stat_result = path.stat()
+        except FileNotFoundError:
+            continue
+        batch.append((path, stat_result.st_mtime, stat_result.st_size))
+    return batch
+
+
+def _missing_paths(paths: Iterable[str]) -> set[str]:
+    return {path for path in paths if not os.path.isfile(path)}
+
+
+class _ArchiveBuffer(io.RawIOBase):
+    """Unseekable sink that lets ``zipfile`` stream an archive in pieces."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_names(
+    photos: Iterable[ListingPhotoDB],
+) -> Iterator[tuple[str, ListingPhotoDB]]:
+    seen: set[str] = set()
+    for photo in photos:
+        name = photo.original_name
+        if name in seen:
+            original = Path(photo.original_name)
+            name = f"{original.stem}-{photo.id.hex[:8]}{original.suffix}"
+        seen.add(name)
+        yield name, photo
+
+
 class ListingPhotoService(IListingPhotoService):
     def __init__(
         self,
         repository: IListingPhotoRepository,
-        storage_dir: str,
+        storage: PhotoStorageLayout,
+        io_pool: WorkerPool,
         max_upload_size_mb: int = 2,
+        batch_concurrency: int = 4,
+        variant_pool: WorkerPool | None = None,
+        variant_quality: int = 82,
+        sweep_batch_size: int = 500,
+        sweep_pause_seconds: float = 0.2,
+        sweep_grace_seconds: float = 3600,
+        unit_of_work: UnitOfWork | None = None,
     ) -> None:
         self._repository = repository
-        self._storage_dir = Path(storage_dir)
-        self._storage_dir.mkdir(parents=True, exist_ok=True)
+        self._storage = storage
+        self._io_pool = io_pool
         self._max_upload_size_bytes = max_upload_size_mb * 1024 * 1024
+        self._batch_concurrency = batch_concurrency
+        self._variant_pool = variant_pool
+        self._variant_quality = variant_quality
+        self._variant_tasks: set[asyncio.Task] = set()
+        self._sweep_batch_size = sweep_batch_size
+        self._sweep_pause_seconds = sweep_pause_seconds
+        self._sweep_grace_seconds = sweep_grace_seconds
+        self._last_sweep: PhotoSweepReportDTO | None = None
+        self._unit_of_work = unit_of_work
 
     async def store_photo(self, photo: ListingPhotoUploadDTO) -> ListingPhotoDB:
-        sanitized_name = self._sanitize_filename(photo.filename)
-        size = len(photo.data)
+        metadata, temp_path = await self._persist_upload(photo)
+        async with self._transaction():
+            created_paths = await self._place_uploads([metadata], [temp_path])
+            try:
+                stored = await self._repository.create_photo(metadata)
+            except BaseException:
+                await self._remove_files(created_paths)
+                raise
 
-        self._ensure_image_type(photo.content_type)
+            self._release_created_on_rollback([metadata], created_paths)
+            await self._schedule_variants([stored])
+        return stored
 
-        if size == 0:
-            raise ListingPhotoServiceError("Uploaded photo is empty.")
+    async def store_photos(
+        self, photos: Iterable[ListingPhotoUploadDTO]
+    ) -> Sequence[ListingPhotoDB]:
+        photos = list(photos)
+        # Reject a bad batch before any file is written.
+        for photo in photos:
+            self._sanitize_filename(photo.filename)
+            self._ensure_image_type(photo.content_type)
 
-        if size > self._max_upload_size_bytes:
-            raise PhotoTooLargeError(
-                f"Photo {sanitized_name} exceeds {self._max_upload_size_bytes} bytes limit."
-            )
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
 
-        stored_name = self._build_stored_name(sanitized_name)
-        target_path = self._storage_dir / stored_name
-        try:
-            target_path.write_bytes(photo.data)
-        except OSError as exc:
-            raise ListingPhotoServiceError(
-                f"Failed to persist photo {sanitized_name}: {exc}"
-            ) from exc
+        async def persist(
+            photo: ListingPhotoUploadDTO,
+        ) -> tuple[ListingPhotoCreate, Path]:
+            async with semaphore:
+                return await self._persist_upload(photo)
 
-        metadata = ListingPhotoCreate(
-            listing_id=photo.listing_id,
-            original_name=sanitized_name,
-            stored_name=stored_name,
-            content_type=photo.content_type,
-            size_bytes=size,
-            storage_path=str(target_path),
+        written, temp_paths = await self._gather_files(
+            persist(photo) for photo in photos
         )
-        return await self._repository.create_photo(metadata)
+        if not written:
+            return []
 
-    async def store_photos(
-        self, photos: Iterable[ListingPhotoUploadDTO]
-    ) -> Sequence[ListingPhotoDB]:
-        stored: list[ListingPhotoDB] = []
-        for photo in photos:
-            stored.append(await self.store_photo(photo))
+        # Only placing the files and inserting the rows share a transaction,
+        # the uploads above are streamed without holding a connection.
+        async with self._transaction():
+            created_paths = await self._place_uploads(written, temp_paths)
+            try:
+                stored = await self._repository.create_photos(written)
+            except BaseException:
+                await self._remove_files(created_paths)
+                raise
+
+            self._release_created_on_rollback(written, created_paths)
+            await self._schedule_variants(stored)
         return stored
 
+    async def generate_variants(
+        self, photo: ListingPhotoDB
+    ) -> list[ListingPhotoVariantDB]:
+        if self._variant_pool is None:
+            return []
+
+        rendered, created_paths = await self._gather_files(
+            self._render_variant(photo, spec) for spec in PHOTO_VARIANTS.values()
+        )
+        try:
+            return await self._repository.create_variants(rendered)
+        except BaseException:
+            await self._remove_files(created_paths)
+            raise
+
+    async def wait_for_variants(self) -> None:
+        if self._variant_tasks:
+            await asyncio.gather(*self._variant_tasks, return_exceptions=True)
+
+    async def sweep_orphans(self, dry_run: bool = False) -> PhotoSweepReportDTO:
+        """Reconcile stored files with the database.
+
+        Unreferenced blobs are released, files no row points at are removed
+        once they are older than the grace period, and rows whose files are
+        missing are reported. Work is done in batches with a pause in between
+        so the sweep can run next to regular traffic. The run is skipped while
+        a storage migration holds the storage lock.
+        """
+        report = PhotoSweepReportDTO(dry_run=dry_run)
+        async with self._repository.lock_storage() as locked:
+            if not locked:
+                # Moved files are not referenced until their batch is updated.
+                logger.info("Photo storage is being migrated, skipping the sweep")
+                report.skipped = True
+                self._last_sweep = report
+                return report
+
+            if not dry_run:
+                report.released_blobs = (
+                    await self._repository.release_unreferenced_blobs()
+                )
+            await self._sweep_files(report)
+            await self._find_missing_files(report)
+
+        if report.missing_files:
+            logger.warning(
+                "%s stored photos are missing on disk, e.g. %s",
+                report.missing_files,
+                report.missing_photo_ids[:10],
+            )
+        self._last_sweep = report
+        return report
+
+    async def sweep_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                report = await self.sweep_orphans()
+            except Exception:
+                logger.exception("Photo sweep failed")
+            else:
+                logger.info("Photo sweep finished: %s", report)
+
+    def sweep_stats(self) -> dict | None:
+        return asdict(self._last_sweep) if self._last_sweep is not None else None
+
     async def get_photo(self, photo_id: UUID4) -> ListingPhotoDB | None:
         return await self._repository.get_photo(photo_id)
 
-    async def read_photo(self, photo_id: UUID4) -> tuple[ListingPhotoDB, bytes]:
-        metadata = await self._repository.get_photo(photo_id)
-        if metadata is None:
-            raise PhotoMissingError(f"Photo with id {photo_id} was not found.")
+    async def delete_photo(self, photo_id: UUID4) -> bool:
+        photo = await self._repository.delete_photo(photo_id)
+        if photo is None:
+            return False
 
-        data = self._read_photo_bytes(metadata)
-        return metadata, data
+        # The rows only go away once the surrounding transaction commits.
+        if photo.sha256 is None:
+            await self._after_commit(
+                lambda: self._remove_files(self._blob_files(photo.storage_path))
+            )
+        else:
+            # Other photos may still reference the same blob.
+            await self._after_commit(
+                lambda: self._release_blobs({photo.sha256: photo.storage_path})
+            )
+        return True
 
-    async def read_photos_by_listing(
+    async def get_photo_variant(
+        self, photo_id: UUID4, name: str
+    ) -> ListingPhotoVariantDB | None:
+        return await self._repository.get_variant(photo_id, name)
+
+    async def has_stored_file(self, storage_path: str) -> bool:
+        return await self._io_pool.run(Path(storage_path).is_file)
+
+    async def stream_listing_archive(
         self, listing_id: UUID4
-    ) -> Sequence[tuple[ListingPhotoDB, bytes]]:
-        metadata_list = await self._repository.list_by_listing(listing_id)
-        results: list[tuple[ListingPhotoDB, bytes]] = []
-        for metadata in metadata_list:
-            results.append((metadata, self._read_photo_bytes(metadata)))
-        return results
+    ) -> AsyncIterator[bytes]:
+        photos = list(await self._repository.list_by_listing(listing_id))
+        for photo in photos:
+            if not await self.has_stored_file(photo.storage_path):
+                raise PhotoMissingError(
+                    f"Stored photo for id {photo.id} not found on disk "
+                    f"at {photo.storage_path}."
+                )
+
+        return self._iter_archive(photos)
 
     async def list_photos_by_listing(
         self, listing_id: UUID4
@@ -110,24 +398,296 @@ class ListingPhotoService(IListingPhotoService):
             raise ListingPhotoServiceError("Filename cannot be empty.")
         return sanitized
 
-    def _build_stored_name(self, sanitized_name: str) -> str:
-        extension = Path(sanitized_name).suffix
-        return f"{uuid.uuid4().hex}{extension}"
-
     def _ensure_image_type(self, content_type: str | None) -> None:
         if content_type is None or not content_type.startswith("image/"):
             raise InvalidImageTypeError("Only image uploads are supported.")
 
-    def _read_photo_bytes(self, metadata: ListingPhotoDB) -> bytes:
-        file_path = Path(metadata.storage_path)
-        if not file_path.exists():
-            raise PhotoMissingError(
-                f"Stored photo for id {metadata.id} not found on disk at {file_path}."
+    async def _persist_upload(
+        self, photo: ListingPhotoUploadDTO
+    ) -> tuple[ListingPhotoCreate, Path]:
+        """Write an upload to a temporary file and return its metadata, which
+        points at the content address, together with the temporary path."""
+        sanitized_name = self._sanitize_filename(photo.filename)
+
+        self._ensure_image_type(photo.content_type)
+
+        temp_path, size, sha256 = await self._write_upload(
+            photo.chunks, sanitized_name
+        )
+        target_path = self._storage.path_for(sha256)
+
+        metadata = ListingPhotoCreate(
+            listing_id=photo.listing_id,
+            original_name=sanitized_name,
+            stored_name=target_path.name,
+            content_type=photo.content_type,
+            size_bytes=size,
+            storage_path=str(target_path),
+            sha256=sha256,
+        )
+        return metadata, temp_path
+
+    async def _place_uploads(
+        self, items: Sequence[ListingPhotoCreate], temp_paths: Sequence[Path]
+    ) -> list[Path | None]:
+        """Move written uploads to their content addresses, returning the files
+        that were created.
+
+        The blob rows are locked first, so a blob cannot be released between
+        deciding to reuse its file and referencing it.
+        """
+        try:
+            await self._repository.lock_blobs(items)
+            _, created_paths = await self._gather_files(
+                self._place_upload(item, temp_path)
+                for item, temp_path in zip(items, temp_paths)
+            )
+        except BaseException:
+            await self._remove_files(temp_paths)
+            raise
+        return created_paths
+
+    async def _place_upload(
+        self, item: ListingPhotoCreate, temp_path: Path
+    ) -> tuple[Path, Path | None]:
+        target_path = Path(item.storage_path)
+        try:
+            created = await self._io_pool.run(
+                _move_into_place, temp_path, target_path
+            )
+        except OSError as exc:
+            raise ListingPhotoServiceError(
+                f"Failed to persist photo {item.original_name}: {exc}"
+            ) from exc
+        return target_path, target_path if created else None
+
+    async def _gather_files(
+        self, jobs: Iterable[Awaitable[tuple[Any, Path | None]]]
+    ) -> tuple[list[Any], list[Path | None]]:
+        """Run file producing jobs concurrently, removing created files if one fails."""
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        written = [
+            result for result in results if not isinstance(result, BaseException)
+        ]
+        failures = [
+            result for result in results if isinstance(result, BaseException)
+        ]
+        created_paths = [path for _, path in written]
+
+        if failures:
+            await self._remove_files(created_paths)
+            raise failures[0]
+        return [item for item, _ in written], created_paths
+
+    async def _remove_files(self, paths: Iterable[str | Path | None]) -> None:
+        await asyncio.gather(
+            *(
+                self._io_pool.run(Path(path).unlink, True)
+                for path in paths
+                if path is not None
+            )
+        )
+
+    def _release_created_on_rollback(
+        self, items: Sequence[ListingPhotoCreate], created_paths: Sequence[Path | None]
+    ) -> None:
+        blobs = {
+            item.sha256: item.storage_path
+            for item, created in zip(items, created_paths)
+            if created is not None and item.sha256 is not None
+        }
+        if blobs:
+            self._after_rollback(lambda: self._release_blobs(blobs))
+
+    async def _release_blobs(self, blobs: dict[str, str]) -> None:
+        """Drop blobs no photo references any more, together with their files.
+
+        Files are removed before the release commits, while the blob rows are
+        still locked: an upload of the same content waits and then stores its
+        own copy instead of reusing a file that is about to disappear.
+        """
+        async with self._transaction():
+            released = await self._repository.release_blobs(blobs)
+            await self._remove_files(
+                path
+                for storage_path in released
+                for path in self._blob_files(storage_path)
+            )
+
+    def _transaction(self) -> AsyncContextManager:
+        if self._unit_of_work is None:
+            return nullcontext()
+        return self._unit_of_work.scope()
+
+    async def _after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        if self._unit_of_work is None:
+            await callback()
+        else:
+            await self._unit_of_work.after_commit(callback)
+
+    def _after_rollback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        if self._unit_of_work is not None:
+            self._unit_of_work.after_rollback(callback)
+
+    def _blob_files(self, storage_path: str) -> list[Path]:
+        """Return a stored original together with all of its variant files."""
+        path = Path(storage_path)
+        return [path] + [
+            path.with_name(variant_stored_name(path.name, spec))
+            for spec in PHOTO_VARIANTS.values()
+        ]
+
+    async def _sweep_files(self, report: PhotoSweepReportDTO) -> None:
+        # Walked lazily, one fan-out directory at a time.
+        files = self._storage.iter_files()
+        while batch := await self._io_pool.run(
+            _stat_batch, files, self._sweep_batch_size
+        ):
+            report.scanned_files += len(batch)
+            referenced = await self._repository.find_referenced_paths(
+                [str(path) for path, _, _ in batch]
             )
+            cutoff = time.time() - self._sweep_grace_seconds
+            orphans = [
+                (path, size)
+                for path, mtime, size in batch
+                if str(path) not in referenced and mtime < cutoff
+            ]
+
+            report.orphaned_files += len(orphans)
+            report.orphaned_bytes += sum(size for _, size in orphans)
+            if not report.dry_run:
+                await self._remove_files(path for path, _ in orphans)
+
+            await asyncio.sleep(self._sweep_pause_seconds)
+
+    async def _find_missing_files(self, report: PhotoSweepReportDTO) -> None:
+        after_id = None
+        while rows := await self._repository.list_photo_paths(
+            after_id, self._sweep_batch_size
+        ):
+            missing = await self._io_pool.run(
+                _missing_paths, [path for _, path in rows]
+            )
+            for photo_id, path in rows:
+                if path in missing:
+                    report.missing_files += 1
+                    if len(report.missing_photo_ids) < MAX_REPORTED_MISSING_PHOTOS:
+                        report.missing_photo_ids.append(photo_id)
+
+            after_id = rows[-1][0]
+            await asyncio.sleep(self._sweep_pause_seconds)
 
+    async def _schedule_variants(self, photos: Sequence[ListingPhotoDB]) -> None:
+        if self._variant_pool is None:
+            return
+
+        async def start() -> None:
+            for photo in photos:
+                task = asyncio.create_task(
+                    self._generate_variants_in_background(photo)
+                )
+                self._variant_tasks.add(task)
+                task.add_done_callback(self._variant_tasks.discard)
+
+        # The variant rows reference the photo rows, and a foreign key check
+        # fails right away on a parent another transaction has not committed.
+        await self._after_commit(start)
+
+    async def _generate_variants_in_background(self, photo: ListingPhotoDB) -> None:
         try:
-            return file_path.read_bytes()
+            await self.generate_variants(photo)
+        except Exception:
+            logger.exception("Failed to generate variants for photo %s", photo.id)
+
+    async def _render_variant(
+        self, photo: ListingPhotoDB, spec: PhotoVariantSpec
+    ) -> tuple[ListingPhotoVariantCreate, Path | None]:
+        # Variants live next to the blob, so duplicates of a photo share them.
+        stored_name = variant_stored_name(photo.stored_name, spec)
+        target_path = Path(photo.storage_path).with_name(stored_name)
+        existing = await self._io_pool.run(_variant_file_info, target_path)
+        if existing is not None:
+            width, height, size = existing
+        else:
+            width, height, size = await self._variant_pool.run(
+                render_photo_variant,
+                photo.storage_path,
+                str(target_path),
+                spec,
+                self._variant_quality,
+            )
+        variant = ListingPhotoVariantCreate(
+            photo_id=photo.id,
+            name=spec.name,
+            stored_name=stored_name,
+            content_type=spec.content_type,
+            width=width,
+            height=height,
+            size_bytes=size,
+            storage_path=str(target_path),
+        )
+        return variant, None if existing is not None else target_path
+
+    async def _write_upload(
+        self, chunks: AsyncIterable[bytes], sanitized_name: str
+    ) -> tuple[Path, int, str]:
+        """Stream chunks into a temporary file while hashing them.
+
+        Returns the temporary path, size and SHA-256.
+        """
+        temp_path = self._storage.temp_path()
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            file = await self._io_pool.run(temp_path.open, "xb")
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self._max_upload_size_bytes:
+                        raise PhotoTooLargeError(
+                            f"Photo {sanitized_name} exceeds "
+                            f"{self._max_upload_size_bytes} bytes limit."
+                        )
+                    await self._io_pool.run(_write_chunk, file, digest, chunk)
+            finally:
+                await self._io_pool.run(file.close)
+
+            if size == 0:
+                raise ListingPhotoServiceError("Uploaded photo is empty.")
         except OSError as exc:
+            await self._io_pool.run(temp_path.unlink, True)
             raise ListingPhotoServiceError(
-                f"Unable to read photo {metadata.original_name}: {exc}"
+                f"Failed to persist photo {sanitized_name}: {exc}"
             ) from exc
+        except BaseException:
+            await self._io_pool.run(temp_path.unlink, True)
+            raise
+
+        return temp_path, size, digest.hexdigest()
+
+    async def _iter_archive(
+        self, photos: Sequence[ListingPhotoDB]
+    ) -> AsyncIterator[bytes]:
+        """Zip photos chunk by chunk, yielding archive bytes as they are produced."""
+        buffer = _ArchiveBuffer()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, photo in _archive_names(photos):
+                info = zipfile.ZipInfo(
+                    name, date_time=photo.created_at.timetuple()[:6]
+                )
+                file = await self._io_pool.run(open, photo.storage_path, "rb")
+                try:
+                    with archive.open(info, "w") as entry:
+                        while chunk := await self._io_pool.run(
+                            file.read, config.PHOTO_UPLOAD_CHUNK_SIZE
+                        ):
+                            entry.write(chunk)
+                            yield buffer.drain()
+                finally:
+                    await self._io_pool.run(file.close)
+                if data := buffer.drain():
+                    yield data
+        if data := buffer.drain():
+            yield data
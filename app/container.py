@@ -1,3 +1,6 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from dependency_injector.containers import DeclarativeContainer
 from dependency_injector.providers import Factory, Singleton
 
@@ -8,17 +11,21 @@ from app.application.interfaces.services.graph_service import GraphService
 from app.application.interfaces.services.listing_service import ListingService
 from app.application.interfaces.services.note_service import NoteService
 from app.application.interfaces.services.user_service import UserService
-from app.infrastructure.db import async_session
+from app.infrastructure.db import engine
+from app.infrastructure.photo_storage import PhotoStorageLayout
 from app.infrastructure.repositories.client_repository import ClientRepository
 from app.infrastructure.repositories.photo_repository import ListingPhotoRepository
 from app.infrastructure.repositories.listing_repository import ListingRepository
 from app.infrastructure.repositories.note_repository import NoteRepository
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.config import config
+from app.infrastructure.smtp_pool import SMTPConnectionPool
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.infrastructure.workers import WorkerPool
 
 
 class Container(DeclarativeContainer):
-    db = Singleton(lambda: async_session)
+    db = Singleton(lambda: UnitOfWork(engine))
 
     client_repository = Factory(ClientRepository, session=db)
 
@@ -34,21 +41,75 @@ class Container(DeclarativeContainer):
 
     photo_repository = Factory(ListingPhotoRepository, session=db)
 
+    photo_io_pool = Singleton(
+        WorkerPool,
+        ThreadPoolExecutor,
+        max_workers=config.PHOTO_IO_WORKERS,
+        max_queue=config.PHOTO_IO_MAX_QUEUE,
+        thread_name_prefix="photo-io",
+    )
+
+    photo_variant_pool = Singleton(
+        WorkerPool,
+        ProcessPoolExecutor,
+        max_workers=config.PHOTO_VARIANT_WORKERS,
+        max_queue=config.PHOTO_VARIANT_MAX_QUEUE,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    photo_storage = Singleton(
+        PhotoStorageLayout,
+        roots=config.PHOTO_STORAGE_ROOTS.split(","),
+        depth=config.PHOTO_STORAGE_FANOUT_DEPTH,
+    )
+
     photo_service = Singleton(
         ListingPhotoService,
         repository=photo_repository,
-        storage_dir=config.UPLOAD_DIR,
+        storage=photo_storage,
+        io_pool=photo_io_pool,
         max_upload_size_mb=config.MAX_UPLOAD_SIZE_MB,
+        batch_concurrency=config.PHOTO_BATCH_CONCURRENCY,
+        variant_pool=photo_variant_pool,
+        variant_quality=config.PHOTO_VARIANT_QUALITY,
+        sweep_batch_size=config.PHOTO_SWEEP_BATCH_SIZE,
+        sweep_pause_seconds=config.PHOTO_SWEEP_PAUSE_SECONDS,
+        sweep_grace_seconds=config.PHOTO_SWEEP_GRACE_SECONDS,
+        unit_of_work=db,
     )
 
     note_repository = Factory(NoteRepository, session=db)
 
     note_service = Factory(NoteService, note_repository=note_repository)
 
-    graph_service = Singleton(GraphService, repository=listing_repository)
+    graph_render_pool = Singleton(
+        WorkerPool,
+        ProcessPoolExecutor,
+        max_workers=config.GRAPH_RENDER_WORKERS,
+        max_queue=config.GRAPH_RENDER_MAX_QUEUE,
+        timeout=config.GRAPH_RENDER_TIMEOUT_SECONDS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    graph_service = Singleton(
+        GraphService, repository=listing_repository, render_pool=graph_render_pool
+    )
+
+    smtp_pool = Singleton(
+        SMTPConnectionPool,
+        hostname=config.SMTP_HOST,
+        port=config.SMTP_PORT,
+        username=config.GMAIL_ADDRESS,
+        password=config.GMAIL_GENERATED_PASSWORD,
+        size=config.SMTP_POOL_SIZE,
+        idle_timeout=config.SMTP_POOL_IDLE_TIMEOUT_SECONDS,
+        noop_after=config.SMTP_POOL_NOOP_AFTER_SECONDS,
+        timeout=config.SMTP_TIMEOUT_SECONDS,
+    )
 
     email_service = Singleton(
         EmailService,
         repository=listing_repository,
         graph_service=graph_service,
+        smtp_pool=smtp_pool,
     )
@@ -4,7 +4,7 @@ from typing import Any
 from app.infrastructure.const import OPERATORS
 
 
-@dataclass()
+@dataclass(frozen=True)
 class FilterDTO:
     field: str | None
     operator: str | None
@@ -15,3 +15,9 @@ class FilterDTO:
         operator = OPERATORS[self.operator]
         return operator
 
+
+@dataclass(frozen=True)
+class FilterExpressionDTO:
+    """Filters in disjunctive normal form: any group matches when all of its filters do."""
+
+    groups: tuple[tuple[FilterDTO, ...], ...]
@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class ListingCursor:
+    column: str | None
+    order: str
+    value: Any
+    id: str
+
+    def encode(self) -> str:
+        payload = json.dumps(
+            {"c": self.column, "o": self.order, "v": self.value, "id": self.id},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def decode(cls, token: str) -> "ListingCursor":
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            return cls(
+                column=payload["c"],
+                order=payload["o"],
+                value=payload["v"],
+                id=payload["id"],
+            )
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Malformed cursor {token}") from e
@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+
+from pydantic import UUID4
+
+
+@dataclass(slots=True)
+class PhotoSweepReportDTO:
+    dry_run: bool = False
+    skipped: bool = False
+    released_blobs: int = 0
+    scanned_files: int = 0
+    orphaned_files: int = 0
+    orphaned_bytes: int = 0
+    missing_files: int = 0
+    missing_photo_ids: list[UUID4] = field(default_factory=list)
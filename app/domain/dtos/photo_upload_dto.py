@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import AsyncIterable
 
 from pydantic import UUID4
 
@@ -8,4 +9,4 @@ class ListingPhotoUploadDTO:
     listing_id: UUID4
     filename: str
     content_type: str | None
-    data: bytes
+    chunks: AsyncIterable[bytes]
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class MonthlyPricePerAreaDTO:
+    year: int
+    month: int
+    price: float
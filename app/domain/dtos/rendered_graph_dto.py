@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class RenderedGraphDTO:
+    etag: str
+    content: bytes
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterable, AsyncIterator, Iterable, Sequence
 
 from pydantic import UUID4
 from sqlalchemy import Select
 
+from app.domain.dtos.price_per_area_dto import MonthlyPricePerAreaDTO
 from app.domain.models.listing_update import ListingUpdate
 from app.presentation.schemas.listing_schema import ListingDB, ListingIn
 
@@ -13,10 +14,34 @@ class IListingRepository(ABC):
     async def save_listing(self, listings: Iterable[ListingIn]) -> Iterable[ListingDB]:
         """abstract method"""
 
+    @abstractmethod
+    async def import_listings(
+        self, batches: AsyncIterable[Sequence[ListingIn]]
+    ) -> int:
+        """Insert streamed batches of listings in one transaction."""
+
     @abstractmethod
     async def get_listings(self, query: Select) -> ListingDB:
         """abstract method"""
 
+    @abstractmethod
+    async def get_listing_rows(self, query: Select) -> list[dict]:
+        """Return the selected columns of each row as a mapping."""
+
+    @abstractmethod
+    def stream_listing_rows(self, query: Select) -> AsyncIterator[list[dict]]:
+        """Stream row mappings in batches through a server-side cursor."""
+
+    @abstractmethod
+    async def get_ranked_listings(
+        self, query: Select
+    ) -> Iterable[tuple[ListingDB, float]]:
+        """Return listings paired with the rank selected next to them."""
+
+    @abstractmethod
+    async def get_monthly_price_per_area(self) -> Iterable[MonthlyPricePerAreaDTO]:
+        """Return the average price per area grouped by year and month."""
+
     @abstractmethod
     async def delete_listing(self, lisitng_id: UUID4):
         """abstract method"""
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncContextManager, Iterable, Mapping, Sequence
 
 from pydantic import UUID4
 
-from app.presentation.schemas.photo_schema import ListingPhotoCreate, ListingPhotoDB
+from app.presentation.schemas.photo_schema import (
+    ListingPhotoCreate,
+    ListingPhotoDB,
+    ListingPhotoVariantCreate,
+    ListingPhotoVariantDB,
+)
 
 
 class IListingPhotoRepository(ABC):
@@ -11,6 +16,44 @@ class IListingPhotoRepository(ABC):
     async def create_photo(self, photo: ListingPhotoCreate) -> ListingPhotoDB:
         """Persist metadata for a stored listing photo."""
 
+    @abstractmethod
+    async def create_photos(
+        self, photos: Sequence[ListingPhotoCreate]
+    ) -> list[ListingPhotoDB]:
+        """Persist metadata for several photos in one multi-row insert."""
+
+    @abstractmethod
+    async def delete_photo(self, photo_id: UUID4) -> ListingPhotoDB | None:
+        """Delete photo metadata, returning the deleted row."""
+
+    @abstractmethod
+    async def lock_blobs(self, photos: Sequence[ListingPhotoCreate]) -> None:
+        """Create or lock the blob rows the photos point at until commit."""
+
+    @abstractmethod
+    async def release_blobs(self, blobs: Mapping[str, str]) -> list[str]:
+        """Lock the given blobs (sha256 to storage path), delete the unreferenced
+        ones and return their paths; the rows stay locked until commit."""
+
+    @abstractmethod
+    async def release_unreferenced_blobs(self) -> int:
+        """Delete every blob no photo references, returning how many went."""
+
+    @abstractmethod
+    def lock_storage(self) -> AsyncContextManager[bool]:
+        """Hold the photo storage lock for the block if it is free, yielding
+        whether it was acquired."""
+
+    @abstractmethod
+    async def find_referenced_paths(self, paths: Sequence[str]) -> set[str]:
+        """Return the given storage paths that a photo, blob or variant uses."""
+
+    @abstractmethod
+    async def list_photo_paths(
+        self, after_id: UUID4 | None, limit: int
+    ) -> list[tuple[UUID4, str]]:
+        """Return photo ids and storage paths in id order, after ``after_id``."""
+
     @abstractmethod
     async def list_photos(
         self, limit: int = 50, offset: int = 0
@@ -24,3 +67,15 @@ class IListingPhotoRepository(ABC):
     @abstractmethod
     async def list_by_listing(self, listing_id: UUID4) -> Iterable[ListingPhotoDB]:
         """Return all photos associated with a given listing."""
+
+    @abstractmethod
+    async def create_variants(
+        self, variants: Sequence[ListingPhotoVariantCreate]
+    ) -> list[ListingPhotoVariantDB]:
+        """Persist metadata for generated photo variants."""
+
+    @abstractmethod
+    async def get_variant(
+        self, photo_id: UUID4, name: str
+    ) -> ListingPhotoVariantDB | None:
+        """Fetch a generated variant of a photo by variant name."""
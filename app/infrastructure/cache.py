@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.infrastructure.config import config
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after a fixed time to live."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+principal_cache = TTLCache(
+    max_size=config.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=config.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -7,14 +7,94 @@ class BaseConfig(BaseSettings):
 
 class AppConfig(BaseConfig):
     DB_CONN_STR: str = cfg("DB_CONN_STR", cast=str)
+    DB_ECHO: bool = cfg("DB_ECHO", default=False, cast=bool)
+    DB_POOL_SIZE: int = cfg("DB_POOL_SIZE", default=10, cast=int)
+    DB_MAX_OVERFLOW: int = cfg("DB_MAX_OVERFLOW", default=20, cast=int)
+    DB_POOL_RECYCLE_SECONDS: int = cfg(
+        "DB_POOL_RECYCLE_SECONDS", default=1800, cast=int
+    )
+    DB_POOL_TIMEOUT_SECONDS: int = cfg("DB_POOL_TIMEOUT_SECONDS", default=30, cast=int)
+    DB_STATEMENT_TIMEOUT_MS: int = cfg(
+        "DB_STATEMENT_TIMEOUT_MS", default=30000, cast=int
+    )
+    DB_STATEMENT_CACHE_SIZE: int = cfg(
+        "DB_STATEMENT_CACHE_SIZE", default=100, cast=int
+    )
     ALGORITHM: str = cfg("ALGORITHM", cast=str)
     SECRET_KEY: str = cfg("SECRET_KEY", cast=str)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = cfg("ACCESS_TOKEN_EXPIRE_MINUTES", cast=int)
     API_STR: str = cfg("API_STR", cast=str)
     GMAIL_GENERATED_PASSWORD: str = cfg("GMAIL_GENERATED_PASSWORD", cast=str)
     GMAIL_ADDRESS: str = cfg("GMAIL_ADDRESS", cast=str)
+    SMTP_HOST: str = cfg("SMTP_HOST", default="smtp.gmail.com", cast=str)
+    SMTP_PORT: int = cfg("SMTP_PORT", default=587, cast=int)
+    SMTP_POOL_SIZE: int = cfg("SMTP_POOL_SIZE", default=2, cast=int)
+    SMTP_POOL_IDLE_TIMEOUT_SECONDS: float = cfg(
+        "SMTP_POOL_IDLE_TIMEOUT_SECONDS", default=240.0, cast=float
+    )
+    SMTP_POOL_NOOP_AFTER_SECONDS: float = cfg(
+        "SMTP_POOL_NOOP_AFTER_SECONDS", default=30.0, cast=float
+    )
+    SMTP_TIMEOUT_SECONDS: float = cfg("SMTP_TIMEOUT_SECONDS", default=30.0, cast=float)
     UPLOAD_DIR: str = cfg("UPLOAD_DIR", default="uploads", cast=str)
+    PHOTO_STORAGE_ROOTS: str = cfg(
+        "PHOTO_STORAGE_ROOTS", default=UPLOAD_DIR, cast=str
+    )
+    PHOTO_STORAGE_FANOUT_DEPTH: int = cfg(
+        "PHOTO_STORAGE_FANOUT_DEPTH", default=2, cast=int
+    )
     MAX_UPLOAD_SIZE_MB: int = cfg("MAX_UPLOAD_SIZE_MB", default=2, cast=int)
+    PHOTO_UPLOAD_CHUNK_SIZE: int = cfg(
+        "PHOTO_UPLOAD_CHUNK_SIZE", default=256 * 1024, cast=int
+    )
+    PHOTO_BATCH_CONCURRENCY: int = cfg("PHOTO_BATCH_CONCURRENCY", default=4, cast=int)
+    PHOTO_IO_WORKERS: int = cfg("PHOTO_IO_WORKERS", default=8, cast=int)
+    PHOTO_IO_MAX_QUEUE: int = cfg("PHOTO_IO_MAX_QUEUE", default=512, cast=int)
+    PHOTO_VARIANT_WORKERS: int = cfg("PHOTO_VARIANT_WORKERS", default=2, cast=int)
+    PHOTO_VARIANT_MAX_QUEUE: int = cfg(
+        "PHOTO_VARIANT_MAX_QUEUE", default=64, cast=int
+    )
+    PHOTO_THUMBNAIL_SIZE: int = cfg("PHOTO_THUMBNAIL_SIZE", default=320, cast=int)
+    PHOTO_MEDIUM_SIZE: int = cfg("PHOTO_MEDIUM_SIZE", default=1280, cast=int)
+    PHOTO_VARIANT_QUALITY: int = cfg("PHOTO_VARIANT_QUALITY", default=82, cast=int)
+    PHOTO_SWEEP_INTERVAL_SECONDS: int = cfg(
+        "PHOTO_SWEEP_INTERVAL_SECONDS", default=6 * 3600, cast=int
+    )
+    PHOTO_SWEEP_GRACE_SECONDS: int = cfg(
+        "PHOTO_SWEEP_GRACE_SECONDS", default=3600, cast=int
+    )
+    PHOTO_SWEEP_BATCH_SIZE: int = cfg("PHOTO_SWEEP_BATCH_SIZE", default=500, cast=int)
+    PHOTO_SWEEP_PAUSE_SECONDS: float = cfg(
+        "PHOTO_SWEEP_PAUSE_SECONDS", default=0.2, cast=float
+    )
+    LISTINGS_PAGE_SIZE: int = cfg("LISTINGS_PAGE_SIZE", default=50, cast=int)
+    LISTINGS_MAX_PAGE_SIZE: int = cfg("LISTINGS_MAX_PAGE_SIZE", default=500, cast=int)
+    LISTINGS_INSERT_CHUNK_SIZE: int = cfg(
+        "LISTINGS_INSERT_CHUNK_SIZE", default=1000, cast=int
+    )
+    LISTINGS_EXPORT_BATCH_SIZE: int = cfg(
+        "LISTINGS_EXPORT_BATCH_SIZE", default=1000, cast=int
+    )
+    LISTINGS_FILTER_CACHE_SIZE: int = cfg(
+        "LISTINGS_FILTER_CACHE_SIZE", default=256, cast=int
+    )
+    PRINCIPAL_CACHE_SIZE: int = cfg("PRINCIPAL_CACHE_SIZE", default=1024, cast=int)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = cfg(
+        "PRINCIPAL_CACHE_TTL_SECONDS", default=60, cast=int
+    )
+    PASSWORD_HASH_WORKERS: int = cfg("PASSWORD_HASH_WORKERS", default=4, cast=int)
+    PASSWORD_HASH_MAX_QUEUE: int = cfg(
+        "PASSWORD_HASH_MAX_QUEUE", default=256, cast=int
+    )
+    GRAPH_CACHE_SIZE: int = cfg("GRAPH_CACHE_SIZE", default=64, cast=int)
+    GRAPH_CACHE_TTL_SECONDS: int = cfg(
+        "GRAPH_CACHE_TTL_SECONDS", default=3600, cast=int
+    )
+    GRAPH_RENDER_WORKERS: int = cfg("GRAPH_RENDER_WORKERS", default=2, cast=int)
+    GRAPH_RENDER_MAX_QUEUE: int = cfg("GRAPH_RENDER_MAX_QUEUE", default=16, cast=int)
+    GRAPH_RENDER_TIMEOUT_SECONDS: int = cfg(
+        "GRAPH_RENDER_TIMEOUT_SECONDS", default=30, cast=int
+    )
 
 
 config = AppConfig()
\ No newline at end of file
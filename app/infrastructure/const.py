@@ -5,5 +5,7 @@ OPERATORS = {
     'lte': '__le__',
     'gte': '__ge__',
     'ne': '__ne__',
-    'like': 'like'
+    'like': 'like',
+    'in': 'in_',
+    'between': 'between'
 }
\ No newline at end of file
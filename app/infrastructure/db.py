@@ -1,31 +1,80 @@
 import asyncio
+from pathlib import Path
 
-import databases
+from alembic import command
+from alembic.config import Config as AlembicConfig
 from asyncpg.exceptions import CannotConnectNowError, ConnectionDoesNotExistError
+from sqlalchemy import Connection, inspect, text
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.infrastructure.config import config
-from app.infrastructure.models.base_model import Base
 
 db_uri = config.DB_CONN_STR
 engine = create_async_engine(
     db_uri,
-    echo=True,
+    echo=config.DB_ECHO,
     future=True,
     pool_pre_ping=True,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+    pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+    connect_args={
+        "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS),
+        },
+    },
 )
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-database = databases.Database(db_uri, force_rollback=True)
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    capacity = pool.size() + config.DB_MAX_OVERFLOW
+    return {
+        "size": pool.size(),
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "utilisation": round(pool.checkedout() / capacity, 4) if capacity else 0.0,
+    }
+
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+# Databases created with Base.metadata.create_all before migrations existed.
+LEGACY_SCHEMA_REVISION = "0001"
+MIGRATION_LOCK_ID = 0x4C495354
+
+
+def migration_config(connection: Connection | None = None) -> AlembicConfig:
+    alembic_config = AlembicConfig()
+    alembic_config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    alembic_config.attributes["connection"] = connection
+    return alembic_config
+
+
+def upgrade_schema(connection: Connection) -> None:
+    alembic_config = migration_config(connection)
+    tables = inspect(connection).get_table_names()
+
+    if "alembic_version" not in tables and "listings" in tables:
+        command.stamp(alembic_config, LEGACY_SCHEMA_REVISION)
+    command.upgrade(alembic_config, "head")
 
 
 async def init_db(retries: int = 5, delay: int = 5) -> None:
     for attempt in range(retries):
         try:
             async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
+                # Only one worker applies migrations when several start at once.
+                await conn.execute(
+                    text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID}
+                )
+                await conn.run_sync(upgrade_schema)
             return
         except (
             OperationalError,
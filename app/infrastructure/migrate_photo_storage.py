@@ -0,0 +1,166 @@
+"""Move stored photos into the configured storage layout.
+
+Run from the repository root after changing PHOTO_STORAGE_ROOTS or
+PHOTO_STORAGE_FANOUT_DEPTH, or once to move files out of the old flat
+UPLOAD_DIR:
+
+    python -m app.infrastructure.migrate_photo_storage [--dry-run]
+
+Every stored original is moved together with its variants before the
+``storage_path`` of its photo, blob and variant rows is updated. Files that
+are already at their new path are left alone, so an interrupted run can
+simply be started again. The photo storage lock is held for the whole run,
+waiting for a running orphan sweep to finish first, so the sweeper cannot
+reclaim files that are moved but not yet repointed.
+"""
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.application.interfaces.services.photo_service import (
+    PHOTO_VARIANTS,
+    variant_stored_name,
+)
+from app.infrastructure.config import config
+from app.infrastructure.db import engine
+from app.infrastructure.models.listing_photo_blob_model import ListingPhotoBlob
+from app.infrastructure.models.listing_photo_file_model import ListingPhotoFile
+from app.infrastructure.models.listing_photo_variant_model import ListingPhotoVariant
+from app.infrastructure.photo_storage import (
+    PHOTO_STORAGE_LOCK_ID,
+    PhotoStorageLayout,
+    move_file,
+)
+
+photos = ListingPhotoFile.__table__
+blobs = ListingPhotoBlob.__table__
+variants = ListingPhotoVariant.__table__
+
+
+def relocate_files(old_path: Path, new_path: Path) -> bool:
+    """Move an original and its variants, returning whether the original is
+    now at its new path."""
+    pairs = [(old_path, new_path)] + [
+        (
+            old_path.with_name(variant_stored_name(old_path.name, spec)),
+            new_path.with_name(variant_stored_name(new_path.name, spec)),
+        )
+        for spec in PHOTO_VARIANTS.values()
+    ]
+    for source, target in pairs:
+        if not source.exists():
+            continue
+        if target.exists():
+            # Same name means same content, the copy at the target wins.
+            source.unlink()
+        else:
+            move_file(source, target)
+
+    return new_path.exists()
+
+
+async def migrate_photo_storage(
+    engine: AsyncEngine,
+    layout: PhotoStorageLayout,
+    batch_size: int = 500,
+    dry_run: bool = False,
+) -> tuple[int, int]:
+    """Relocate stored photos, returning the number moved and missing."""
+    async with engine.connect() as conn:
+        paths = (await conn.scalars(select(photos.c.storage_path).distinct())).all()
+
+    moves = [
+        (Path(path), layout.path_for(Path(path).name))
+        for path in paths
+        if Path(path) != layout.path_for(Path(path).name)
+    ]
+    if dry_run:
+        return len(moves), 0
+
+    async with engine.begin() as lock_conn:
+        await lock_conn.execute(text("SET LOCAL statement_timeout = 0"))
+        await lock_conn.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"), {"id": PHOTO_STORAGE_LOCK_ID}
+        )
+        return await _relocate(engine, moves, batch_size)
+
+
+async def _relocate(
+    engine: AsyncEngine, moves: list[tuple[Path, Path]], batch_size: int
+) -> tuple[int, int]:
+    moved = missing = 0
+    for start in range(0, len(moves), batch_size):
+        relocated = []
+        for old_path, new_path in moves[start : start + batch_size]:
+            if await asyncio.to_thread(relocate_files, old_path, new_path):
+                relocated.append((old_path, new_path))
+            else:
+                missing += 1
+                print(f"missing: {old_path}")
+
+        if not relocated:
+            continue
+
+        params = [
+            {"old_path": str(old_path), "new_path": str(new_path)}
+            for old_path, new_path in relocated
+        ]
+        async with engine.begin() as conn:
+            for table in (photos, blobs):
+                await conn.execute(
+                    table.update()
+                    .where(table.c.storage_path == bindparam("old_path"))
+                    .values(storage_path=bindparam("new_path")),
+                    params,
+                )
+            await conn.execute(
+                variants.update()
+                .where(
+                    variants.c.photo_id.in_(
+                        select(photos.c.id).where(
+                            photos.c.storage_path == bindparam("new_path")
+                        )
+                    )
+                )
+                .values(
+                    storage_path=func.concat(
+                        bindparam("new_dir"), variants.c.stored_name
+                    )
+                ),
+                [
+                    {"new_path": str(new_path), "new_dir": f"{new_path.parent}{os.sep}"}
+                    for _, new_path in relocated
+                ],
+            )
+        moved += len(relocated)
+
+    return moved, missing
+
+
+async def main(batch_size: int, dry_run: bool) -> None:
+    layout = PhotoStorageLayout(
+        config.PHOTO_STORAGE_ROOTS.split(","),
+        depth=config.PHOTO_STORAGE_FANOUT_DEPTH,
+    )
+    moved, missing = await migrate_photo_storage(
+        engine, layout, batch_size=batch_size, dry_run=dry_run
+    )
+    await engine.dispose()
+
+    if dry_run:
+        print(f"{moved} stored photos would be moved")
+    else:
+        print(f"moved {moved} stored photos, {missing} missing on disk")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.dry_run))
@@ -0,0 +1,143 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+        sa.UniqueConstraint("username"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "clients",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+        sa.UniqueConstraint("phone_number"),
+    )
+    op.create_index("ix_clients_id", "clients", ["id"])
+
+    op.create_table(
+        "listings",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("client_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=False),
+        sa.Column("street", sa.String(), nullable=False),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("area", sa.Float(), nullable=False),
+        sa.Column(
+            "property_type",
+            sa.Enum("HOUSE", "APARTMENT", name="propertytype"),
+            nullable=False,
+        ),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column(
+            "transaction_type",
+            sa.Enum("SELL", "RENT", name="transactiontype"),
+            nullable=False,
+        ),
+        sa.Column("floor", sa.String(), nullable=False),
+        sa.Column("num_of_floors", sa.String(), nullable=False),
+        sa.Column("build_year", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("AVAILABLE", "PENDING", "CLOSED", name="status"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("title"),
+    )
+    op.create_index("ix_listings_id", "listings", ["id"])
+
+    op.create_table(
+        "notes",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("note", sa.String(), nullable=False),
+        sa.Column("listing_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["listing_id"], ["listings.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_notes_id", "notes", ["id"])
+    op.create_index("ix_notes_listing_id", "notes", ["listing_id"])
+    op.create_index("ix_notes_user_id", "notes", ["user_id"])
+
+    op.create_table(
+        "listing_photo_files",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("listing_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("original_name", sa.String(length=255), nullable=False),
+        sa.Column("stored_name", sa.String(length=255), nullable=False),
+        sa.Column("content_type", sa.String(length=128), nullable=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("storage_path", sa.String(length=512), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["listing_id"], ["listings.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("stored_name"),
+    )
+    op.create_index("ix_listing_photo_files_id", "listing_photo_files", ["id"])
+    op.create_index(
+        "ix_listing_photo_files_listing_id", "listing_photo_files", ["listing_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("listing_photo_files")
+    op.drop_table("notes")
+    op.drop_table("listings")
+    op.drop_table("clients")
+    op.drop_table("users")
+    sa.Enum(name="status").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="transactiontype").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="propertytype").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,63 @@
+"""Listing full-text search vector and trigram indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', "
+    "coalesce(location, '') || ' ' || coalesce(street, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
+TRIGRAM_COLUMNS = ("title", "location", "street")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "listings",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_listings_search_vector",
+        "listings",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_listings_{column}_trgm",
+            "listings",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f"ix_listings_{column}_trgm", table_name="listings")
+    op.drop_index("ix_listings_search_vector", table_name="listings")
+    op.drop_column("listings", "search_vector")
@@ -0,0 +1,61 @@
+"""Composite and partial indexes for listing sort, filter and graph queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination orders by (column, id); price/area ranges use the prefix.
+    op.create_index("ix_listings_price_id", "listings", ["price", "id"])
+    op.create_index("ix_listings_area_id", "listings", ["area", "id"])
+    # Also covers the monthly price per area graph as an index-only scan.
+    op.create_index(
+        "ix_listings_created_at_id",
+        "listings",
+        ["created_at", "id"],
+        postgresql_include=["price", "area"],
+    )
+    op.create_index(
+        "ix_listings_status_created_at",
+        "listings",
+        ["status", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_listings_transaction_type_price",
+        "listings",
+        ["transaction_type", "price", "id"],
+    )
+    op.create_index(
+        "ix_listings_location_price", "listings", ["location", "price", "id"]
+    )
+    op.create_index(
+        "ix_listings_available_price",
+        "listings",
+        ["price", "id"],
+        postgresql_where=sa.text("status = 'AVAILABLE'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_listings_available_price", table_name="listings")
+    op.drop_index("ix_listings_location_price", table_name="listings")
+    op.drop_index("ix_listings_transaction_type_price", table_name="listings")
+    op.drop_index("ix_listings_status_created_at", table_name="listings")
+    op.drop_index("ix_listings_created_at_id", table_name="listings")
+    op.drop_index("ix_listings_area_id", table_name="listings")
+    op.drop_index("ix_listings_price_id", table_name="listings")
@@ -0,0 +1,41 @@
+"""Stored price_per_area column for sorting and filtering in SQL
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_PER_AREA_EXPRESSION = "CASE WHEN area = 0 THEN 0 ELSE round(price / area) END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "listings",
+        sa.Column(
+            "price_per_area",
+            sa.Float(),
+            sa.Computed(PRICE_PER_AREA_EXPRESSION, persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_listings_price_per_area_id", "listings", ["price_per_area", "id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_listings_price_per_area_id", table_name="listings")
+    op.drop_column("listings", "price_per_area")
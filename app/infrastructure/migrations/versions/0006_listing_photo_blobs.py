@@ -0,0 +1,99 @@
+"""Content-addressed photo blobs with reference counts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REF_COUNT_FUNCTION = """
+CREATE FUNCTION listing_photo_blob_ref_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE listing_photo_blobs SET ref_count = ref_count + 1
+        WHERE sha256 = NEW.sha256;
+    ELSE
+        UPDATE listing_photo_blobs SET ref_count = ref_count - 1
+        WHERE sha256 = OLD.sha256;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+REF_COUNT_TRIGGER = """
+CREATE TRIGGER listing_photo_files_blob_ref_count
+AFTER INSERT OR DELETE ON listing_photo_files
+FOR EACH ROW EXECUTE FUNCTION listing_photo_blob_ref_count()
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "listing_photo_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("storage_path", sa.String(length=512), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.add_column(
+        "listing_photo_files",
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+    )
+    op.create_foreign_key(
+        "listing_photo_files_sha256_fkey",
+        "listing_photo_files",
+        "listing_photo_blobs",
+        ["sha256"],
+        ["sha256"],
+    )
+    op.create_index("ix_listing_photo_files_sha256", "listing_photo_files", ["sha256"])
+    # Duplicates of a photo now share one stored file and its variants.
+    op.drop_constraint(
+        "listing_photo_files_stored_name_key", "listing_photo_files", type_="unique"
+    )
+    op.drop_constraint(
+        "listing_photo_variants_stored_name_key",
+        "listing_photo_variants",
+        type_="unique",
+    )
+    op.execute(REF_COUNT_FUNCTION)
+    op.execute(REF_COUNT_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER listing_photo_files_blob_ref_count ON listing_photo_files")
+    op.execute("DROP FUNCTION listing_photo_blob_ref_count()")
+    op.create_unique_constraint(
+        "listing_photo_variants_stored_name_key",
+        "listing_photo_variants",
+        ["stored_name"],
+    )
+    op.create_unique_constraint(
+        "listing_photo_files_stored_name_key", "listing_photo_files", ["stored_name"]
+    )
+    op.drop_index("ix_listing_photo_files_sha256", table_name="listing_photo_files")
+    op.drop_constraint(
+        "listing_photo_files_sha256_fkey", "listing_photo_files", type_="foreignkey"
+    )
+    op.drop_column("listing_photo_files", "sha256")
+    op.drop_table("listing_photo_blobs")
@@ -1,13 +1,17 @@
 from .client_model import Client
 from .listing_model import Listing
+from .listing_photo_blob_model import ListingPhotoBlob
 from .listing_photo_file_model import ListingPhotoFile
+from .listing_photo_variant_model import ListingPhotoVariant
 from .notes_model import Notes
 from .user_model import User
 
 __all__ = [
     "User",
     "Listing",
+    "ListingPhotoBlob",
     "ListingPhotoFile",
+    "ListingPhotoVariant",
     "Client",
     "Notes",
 ]
@@ -3,9 +3,17 @@ import enum
 import uuid
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum, ForeignKey, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.models.base_model import Base
@@ -27,8 +35,57 @@ class Status(enum.Enum):
     CLOSED = "Closed"
 
 
+SEARCH_TEXT_CONFIG = "simple"
+
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', "
+    "coalesce(location, '') || ' ' || coalesce(street, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(description, '')), 'C')"
+)
+
+
+# Matches Python's round(price / area), which the API computed per row before.
+PRICE_PER_AREA_EXPRESSION = "CASE WHEN area = 0 THEN 0 ELSE round(price / area) END"
+
+
+def _trigram_index(column: str) -> Index:
+    return Index(
+        f"ix_listings_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
 class Listing(Base):
     __tablename__ = "listings"
+    __table_args__ = (
+        Index("ix_listings_search_vector", "search_vector", postgresql_using="gin"),
+        _trigram_index("title"),
+        _trigram_index("location"),
+        _trigram_index("street"),
+        Index("ix_listings_price_id", "price", "id"),
+        Index("ix_listings_area_id", "area", "id"),
+        Index("ix_listings_price_per_area_id", "price_per_area", "id"),
+        Index(
+            "ix_listings_created_at_id",
+            "created_at",
+            "id",
+            postgresql_include=["price", "area"],
+        ),
+        Index("ix_listings_status_created_at", "status", "created_at", "id"),
+        Index(
+            "ix_listings_transaction_type_price", "transaction_type", "price", "id"
+        ),
+        Index("ix_listings_location_price", "location", "price", "id"),
+        Index(
+            "ix_listings_available_price",
+            "price",
+            "id",
+            postgresql_where=text("status = 'AVAILABLE'"),
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
     )
@@ -55,9 +112,9 @@ class Listing(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(), server_default=func.current_timestamp(), nullable=False
     )
-
-    @hybrid_property
-    def price_per_area(self) -> float:
-        if self.area and self.area != 0:
-            return round(self.price / self.area)
-        return 0.0
+    price_per_area: Mapped[float] = mapped_column(
+        Float, Computed(PRICE_PER_AREA_EXPRESSION, persisted=True), nullable=False
+    )
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True), deferred=True
+    )
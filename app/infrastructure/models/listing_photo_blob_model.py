@@ -0,0 +1,26 @@
+import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.models.base_model import Base
+
+
+class ListingPhotoBlob(Base):
+    """A stored photo file, addressed by the SHA-256 of its content.
+
+    ``ref_count`` is kept in sync with ``listing_photo_files`` rows by a
+    database trigger (see migration 0006), so cascaded deletes release it too.
+    """
+
+    __tablename__ = "listing_photo_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    storage_path: Mapped[str] = mapped_column(String(512), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    ref_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,95 @@
+import errno
+import hashlib
+import os
+import random
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterator, Sequence
+
+_SHA256_NAME = re.compile(r"[0-9a-f]{64}")
+
+# Advisory lock held by the storage migration while it moves files ahead of
+# their rows; the orphan sweeper skips its run while the lock is taken.
+PHOTO_STORAGE_LOCK_ID = 0x50484F54
+
+
+class PhotoStorageLayout:
+    """Maps stored photo names to paths under one or more storage roots.
+
+    A file is placed on a root chosen by its hash and fanned out into
+    ``depth`` levels of two hex character directories, e.g.
+    ``<root>/3f/a2/3fa2...``, so no single directory grows unbounded.
+    """
+
+    def __init__(self, roots: Sequence[str | Path], depth: int = 2) -> None:
+        self.roots = [Path(str(root).strip()) for root in roots if str(root).strip()]
+        if not self.roots:
+            raise ValueError("At least one photo storage root is required")
+        self.depth = depth
+        for root in self.roots:
+            root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, stored_name: str) -> Path:
+        key = self._key(stored_name)
+        root = self.roots[int(key[:8], 16) % len(self.roots)]
+        fanout = [key[level * 2 : level * 2 + 2] for level in range(self.depth)]
+        return root.joinpath(*fanout, stored_name)
+
+    def temp_path(self) -> Path:
+        """Return a path for an upload whose final name is not known yet."""
+        root = random.choice(self.roots)
+        return root / f".upload-{uuid.uuid4().hex}.part"
+
+    def iter_files(self) -> Iterator[Path]:
+        """Yield every stored file, including temporary ``.part`` files that
+        a crashed upload or render may have left behind."""
+        for root in self.roots:
+            yield from _scan_files(root)
+
+    @staticmethod
+    def _key(stored_name: str) -> str:
+        # Content addressed names are already uniformly distributed hashes;
+        # older uuid based names are hashed so they spread the same way.
+        stem = Path(stored_name).name.split(".", 1)[0]
+        if _SHA256_NAME.fullmatch(stem):
+            return stem
+        return hashlib.sha256(stem.encode()).hexdigest()
+
+
+def _scan_files(directory: Path) -> Iterator[Path]:
+    # os.scandir reads a directory as it is iterated, so even a large flat
+    # directory is never listed in memory at once.
+    subdirectories = []
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirectories.append(entry.path)
+            elif not entry.name.startswith(".") or entry.name.endswith(".part"):
+                yield Path(entry.path)
+    for subdirectory in subdirectories:
+        yield from _scan_files(Path(subdirectory))
+
+
+def move_file(source: Path, target: Path) -> None:
+    """Atomically move a file into place, copying when it crosses volumes."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(source, target)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        temp_path = target.with_name(f".{target.name}.part")
+        try:
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, target)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        source.unlink()
@@ -1,14 +1,43 @@
-from typing import Iterable
+from typing import AsyncIterable, AsyncIterator, Iterable, Sequence
 
 from pydantic import UUID4
-from sqlalchemy import Select, delete, select, update
-
+from sqlalchemy import (
+    Integer,
+    Select,
+    cast,
+    delete,
+    extract,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.dtos.price_per_area_dto import MonthlyPricePerAreaDTO
 from app.domain.models.listing_update import ListingUpdate
 from app.domain.repositories.ilisting_repository import IListingRepository
+from app.infrastructure.config import config
 from app.infrastructure.models.listing_model import Listing
 from app.presentation.schemas.listing_schema import ListingDB, ListingIn
 
 
+def monthly_price_per_area_query() -> Select:
+    year = cast(extract("year", Listing.created_at), Integer)
+    month = cast(extract("month", Listing.created_at), Integer)
+
+    return (
+        select(
+            year.label("year"),
+            month.label("month"),
+            func.round(func.avg(Listing.price / Listing.area)).label("price"),
+        )
+        .where(Listing.area != 0)
+        .group_by(year, month)
+        .order_by(year, month)
+    )
+
+
 class ListingRepository(IListingRepository):
     def __init__(self, session) -> None:
         self._session = session
@@ -19,21 +48,27 @@ class ListingRepository(IListingRepository):
         if not listings_data:
             return []
 
-        db_listing = [Listing(**listing.model_dump()) for listing in listings_data]
-
         async with self._session() as session:
-            session.add_all(db_listing)
-            await session.flush()
-
-            for listing in db_listing:
-                await session.refresh(listing)
+            saved_listings = await self._insert_listings(session, listings_data)
+            await session.commit()
+            return saved_listings
 
-            saved_listings = [
-                ListingDB.model_validate(listing) for listing in db_listing
-            ]
+    async def import_listings(
+        self, batches: AsyncIterable[Sequence[ListingIn]]
+    ) -> int:
+        imported = 0
 
+        async with self._session() as session:
+            async for batch in batches:
+                if not batch:
+                    continue
+                await session.execute(
+                    insert(Listing), [listing.model_dump() for listing in batch]
+                )
+                imported += len(batch)
             await session.commit()
-            return saved_listings
+
+        return imported
 
     async def get_listings(self, query: Select) -> Iterable[ListingDB]:
         async with self._session() as session:
@@ -41,6 +76,39 @@ class ListingRepository(IListingRepository):
             listings = result.scalars().all()
             return [ListingDB.model_validate(listing) for listing in listings]
 
+    async def get_listing_rows(self, query: Select) -> list[dict]:
+        async with self._session() as session:
+            result = await session.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+    async def stream_listing_rows(self, query: Select) -> AsyncIterator[list[dict]]:
+        async with self._session() as session:
+            result = await session.stream(
+                query.execution_options(yield_per=config.LISTINGS_EXPORT_BATCH_SIZE)
+            )
+            async for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+
+    async def get_ranked_listings(
+        self, query: Select
+    ) -> Iterable[tuple[ListingDB, float]]:
+        async with self._session() as session:
+            result = await session.execute(query)
+            return [
+                (ListingDB.model_validate(listing), rank)
+                for listing, rank in result.all()
+            ]
+
+    async def get_monthly_price_per_area(self) -> Iterable[MonthlyPricePerAreaDTO]:
+        async with self._session() as session:
+            result = await session.execute(monthly_price_per_area_query())
+            return [
+                MonthlyPricePerAreaDTO(
+                    year=int(row.year), month=int(row.month), price=float(row.price)
+                )
+                for row in result
+            ]
+
     async def get_single_listing(self, listing_id) -> ListingDB | None:
         async with self._session() as session:
             result = await session.execute(
@@ -52,14 +120,13 @@ class ListingRepository(IListingRepository):
     async def delete_listing(self, listing_id: UUID4) -> ListingDB | None:
         async with self._session() as session:
             result = await session.execute(
-                select(Listing).where(Listing.id == listing_id)
+                delete(Listing).where(Listing.id == listing_id).returning(Listing)
             )
             listing = result.scalars().one_or_none()
 
             if listing is None:
                 return None
 
-            await session.execute(delete(Listing).where(Listing.id == listing_id))
             await session.commit()
             return ListingDB.model_validate(listing)
 
@@ -72,8 +139,29 @@ class ListingRepository(IListingRepository):
             if not update_data:
                 return None
             # Perform the update
-            await session.execute(
-                update(Listing).where(Listing.id == listing_id).values(**update_data)
+            result = await session.execute(
+                update(Listing)
+                .where(Listing.id == listing_id)
+                .values(**update_data)
+                .returning(Listing)
             )
+            listing = result.scalars().one_or_none()
             await session.commit()
-            return await self.get_single_listing(listing_id)
+            return ListingDB.model_validate(listing) if listing is not None else None
+
+    async def _insert_listings(
+        self, session: AsyncSession, listings: Sequence[ListingIn]
+    ) -> list[ListingDB]:
+        saved_listings: list[ListingDB] = []
+
+        for start in range(0, len(listings), config.LISTINGS_INSERT_CHUNK_SIZE):
+            chunk = listings[start : start + config.LISTINGS_INSERT_CHUNK_SIZE]
+            result = await session.scalars(
+                insert(Listing).returning(Listing, sort_by_parameter_order=True),
+                [listing.model_dump() for listing in chunk],
+            )
+            saved_listings.extend(
+                ListingDB.model_validate(listing) for listing in result.all()
+            )
+
+        return saved_listings
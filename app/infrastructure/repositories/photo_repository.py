@@ -1,11 +1,22 @@
-from typing import Iterable
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Mapping, Sequence
 
 from pydantic import UUID4
-from sqlalchemy import Select, select
+from sqlalchemy import Select, delete, insert, select, text, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.repositories.iphoto_repository import IListingPhotoRepository
+from app.infrastructure.models.listing_photo_blob_model import ListingPhotoBlob
 from app.infrastructure.models.listing_photo_file_model import ListingPhotoFile
-from app.presentation.schemas.photo_schema import ListingPhotoCreate, ListingPhotoDB
+from app.infrastructure.models.listing_photo_variant_model import ListingPhotoVariant
+from app.infrastructure.photo_storage import PHOTO_STORAGE_LOCK_ID
+from app.presentation.schemas.photo_schema import (
+    ListingPhotoCreate,
+    ListingPhotoDB,
+    ListingPhotoVariantCreate,
+    ListingPhotoVariantDB,
+)
 
 
 class ListingPhotoRepository(IListingPhotoRepository):
@@ -14,12 +25,118 @@ class ListingPhotoRepository(IListingPhotoRepository):
 
     async def create_photo(self, photo: ListingPhotoCreate) -> ListingPhotoDB:
         async with self._session() as session:
+            await self._reference_blobs(session, [photo])
             db_photo = ListingPhotoFile(**photo.model_dump())
             session.add(db_photo)
             await session.commit()
             await session.refresh(db_photo)
             return ListingPhotoDB.model_validate(db_photo)
 
+    async def create_photos(
+        self, photos: Sequence[ListingPhotoCreate]
+    ) -> list[ListingPhotoDB]:
+        async with self._session() as session:
+            await self._reference_blobs(session, photos)
+            result = await session.scalars(
+                insert(ListingPhotoFile).returning(
+                    ListingPhotoFile, sort_by_parameter_order=True
+                ),
+                [photo.model_dump() for photo in photos],
+            )
+            saved = [ListingPhotoDB.model_validate(row) for row in result.all()]
+            await session.commit()
+            return saved
+
+    async def delete_photo(self, photo_id: UUID4) -> ListingPhotoDB | None:
+        async with self._session() as session:
+            result = await session.execute(
+                delete(ListingPhotoFile)
+                .where(ListingPhotoFile.id == photo_id)
+                .returning(ListingPhotoFile)
+            )
+            photo = result.scalars().one_or_none()
+
+            if photo is None:
+                return None
+
+            await session.commit()
+            return ListingPhotoDB.model_validate(photo)
+
+    async def lock_blobs(self, photos: Sequence[ListingPhotoCreate]) -> None:
+        async with self._session() as session:
+            await self._reference_blobs(session, photos)
+            await session.commit()
+
+    async def release_blobs(self, blobs: Mapping[str, str]) -> list[str]:
+        if not blobs:
+            return []
+        async with self._session() as session:
+            # Upserting first also waits for uploads that inserted one of the
+            # rows but have not committed yet.
+            await self._lock_blob_rows(
+                session,
+                [
+                    {"sha256": sha256, "storage_path": blobs[sha256], "size_bytes": 0}
+                    for sha256 in sorted(blobs)
+                ],
+            )
+            result = await session.scalars(
+                delete(ListingPhotoBlob)
+                .where(
+                    ListingPhotoBlob.sha256.in_(list(blobs)),
+                    ListingPhotoBlob.ref_count <= 0,
+                )
+                .returning(ListingPhotoBlob.storage_path)
+            )
+            released = list(result.all())
+            await session.commit()
+            return released
+
+    async def release_unreferenced_blobs(self) -> int:
+        async with self._session() as session:
+            result = await session.scalars(
+                delete(ListingPhotoBlob)
+                .where(ListingPhotoBlob.ref_count <= 0)
+                .returning(ListingPhotoBlob.sha256)
+            )
+            released = len(result.all())
+            await session.commit()
+            return released
+
+    @asynccontextmanager
+    async def lock_storage(self) -> AsyncIterator[bool]:
+        # The transaction, and with it the lock, stays open for the block.
+        async with self._session() as session:
+            yield await session.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:id)"),
+                {"id": PHOTO_STORAGE_LOCK_ID},
+            )
+
+    async def find_referenced_paths(self, paths: Sequence[str]) -> set[str]:
+        stmt = union(
+            *(
+                select(model.storage_path).where(model.storage_path.in_(paths))
+                for model in (ListingPhotoFile, ListingPhotoBlob, ListingPhotoVariant)
+            )
+        )
+        async with self._session() as session:
+            result = await session.scalars(stmt)
+            return set(result.all())
+
+    async def list_photo_paths(
+        self, after_id: UUID4 | None, limit: int
+    ) -> list[tuple[UUID4, str]]:
+        stmt = (
+            select(ListingPhotoFile.id, ListingPhotoFile.storage_path)
+            .order_by(ListingPhotoFile.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(ListingPhotoFile.id > after_id)
+        async with self._session() as session:
+            result = await session.execute(stmt)
+            return [(photo_id, path) for photo_id, path in result.all()]
+
     async def list_photos(self, limit: int = 50, offset: int = 0) -> Iterable[ListingPhotoDB]:
         stmt: Select = (
             select(ListingPhotoFile)
@@ -49,3 +166,72 @@ class ListingPhotoRepository(IListingPhotoRepository):
             result = await session.execute(stmt)
             photos = result.scalars().all()
             return [ListingPhotoDB.model_validate(photo) for photo in photos]
+
+    async def create_variants(
+        self, variants: Sequence[ListingPhotoVariantCreate]
+    ) -> list[ListingPhotoVariantDB]:
+        async with self._session() as session:
+            result = await session.scalars(
+                insert(ListingPhotoVariant).returning(
+                    ListingPhotoVariant, sort_by_parameter_order=True
+                ),
+                [variant.model_dump() for variant in variants],
+            )
+            saved = [
+                ListingPhotoVariantDB.model_validate(row) for row in result.all()
+            ]
+            await session.commit()
+            return saved
+
+    async def get_variant(
+        self, photo_id: UUID4, name: str
+    ) -> ListingPhotoVariantDB | None:
+        stmt = select(ListingPhotoVariant).where(
+            ListingPhotoVariant.photo_id == photo_id,
+            ListingPhotoVariant.name == name,
+        )
+        async with self._session() as session:
+            result = await session.execute(stmt)
+            variant = result.scalars().one_or_none()
+            return ListingPhotoVariantDB.model_validate(variant) if variant else None
+
+    @classmethod
+    async def _reference_blobs(
+        cls, session: AsyncSession, photos: Sequence[ListingPhotoCreate]
+    ) -> None:
+        """Make sure every blob the photos point at has a row.
+
+        Reference counts are incremented by a trigger when the photo rows are
+        inserted; the no-op update locks existing blobs until commit so they
+        cannot be released in between. Files of a blob are only reused, created
+        or removed while its row is locked this way.
+        """
+        blobs = {
+            photo.sha256: {
+                "sha256": photo.sha256,
+                "storage_path": photo.storage_path,
+                "size_bytes": photo.size_bytes,
+            }
+            for photo in photos
+            if photo.sha256 is not None
+        }
+        if not blobs:
+            return
+
+        await cls._lock_blob_rows(
+            session, [blobs[sha256] for sha256 in sorted(blobs)]
+        )
+
+    @staticmethod
+    async def _lock_blob_rows(session: AsyncSession, rows: list[dict]) -> None:
+        """Insert missing blob rows and lock all of them.
+
+        Rows are passed in sha256 order so concurrent lockers cannot deadlock.
+        """
+        stmt = pg_insert(ListingPhotoBlob).values(rows)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ListingPhotoBlob.sha256],
+                set_={"ref_count": ListingPhotoBlob.ref_count},
+            )
+        )
@@ -4,6 +4,7 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.repositories.iuser_repository import IUserRepository
+from app.infrastructure.cache import principal_cache
 from app.infrastructure.models.user_model import User
 from app.presentation.schemas.user_schema import UserDB, UserIn
 
@@ -39,9 +40,12 @@ class UserRepository(IUserRepository):
 
     async def delete_user(self, user_id) -> UserDB | None:
         async with self._session() as session:
-            user = await self.get_user(user_id=user_id)
-            if not user:
+            result = await session.execute(
+                delete(User).where(User.id == user_id).returning(User)
+            )
+            user = result.scalar_one_or_none()
+            if user is None:
                 return None
-            await session.execute(delete(User).where(User.id == user_id))
             await session.commit()
+            principal_cache.invalidate(user.username)
             return UserDB.model_validate(user)
@@ -1,4 +1,5 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import jwt
 from dependency_injector.wiring import Provide, inject
@@ -9,21 +10,33 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.container import Container
+from app.infrastructure.cache import principal_cache
 from app.infrastructure.config import config
 from app.infrastructure.models.user_model import User
+from app.infrastructure.workers import WorkerPool
 from app.presentation.schemas.token_schema import TokenData, TokenPayload
+from app.presentation.schemas.user_schema import UserDB
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+password_hash_pool = WorkerPool(
+    ThreadPoolExecutor,
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_queue=config.PASSWORD_HASH_MAX_QUEUE,
+    thread_name_prefix="password-hash",
+)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login", scheme_name="JWT")
 
 
 async def get_password_hash(password: str) -> str:
-    return password_context.hash(password)
+    return await password_hash_pool.run(password_context.hash, password)
 
 
 async def verify_password(password: str, hashed_password: str) -> bool:
-    return password_context.verify(password, hashed_password)
+    return await password_hash_pool.run(
+        password_context.verify, password, hashed_password
+    )
 
 
 async def authenticate_user(username: str, password: str) -> User | None:
@@ -46,6 +59,20 @@ async def get_user_by_username(
         return result.scalar_one_or_none()
 
 
+async def get_principal(username: str) -> UserDB | None:
+    principal = principal_cache.get(username)
+    if principal is not None:
+        return principal
+
+    user = await get_user_by_username(username=username)
+    if user is None:
+        return None
+
+    principal = UserDB.model_validate(user)
+    principal_cache.set(username, principal)
+    return principal
+
+
 async def create_token(
     data: dict, expieres_delta: datetime.timedelta | None = None
 ) -> str:
@@ -87,9 +114,9 @@ async def verify_token(token: str = Depends(oauth2_scheme)) -> bool:
 
         token_data = TokenData(username=username)
 
-        user = await get_user_by_username(username=username)
+        principal = await get_principal(username=username)
 
-        if user is None:
+        if principal is None:
             raise credentials_exception
 
         return True
@@ -98,11 +125,7 @@ async def verify_token(token: str = Depends(oauth2_scheme)) -> bool:
         raise credentials_exception
 
 
-@inject
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(Provide[Container.db]),
-) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserDB:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -125,11 +148,7 @@ async def get_current_user(
         if username is None:
             raise credentials_exception
 
-        async with session() as session:
-            result = await session.execute(
-                select(User).where(User.username == username)
-            )
-            user = result.scalar_one_or_none()
+        user = await get_principal(username=username)
 
         if user is None:
             raise credentials_exception
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from email.message import Message
+
+import aiosmtplib
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open between messages.
+
+    Idle connections are reused most recently used first. A connection idle for
+    longer than ``noop_after`` seconds is probed with NOOP before reuse, and one
+    idle for longer than ``idle_timeout`` seconds is closed instead, since
+    servers drop quiet sessions on their own after a few minutes.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str,
+        password: str,
+        size: int = 2,
+        idle_timeout: float = 240.0,
+        noop_after: float = 30.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.timeout = timeout
+        self._idle: deque[tuple[aiosmtplib.SMTP, float]] = deque()
+        self._slots = asyncio.Semaphore(size)
+        self.in_use = 0
+        self.opened = 0
+        self.reused = 0
+        self.health_checks = 0
+        self.expired = 0
+        self.discarded = 0
+        self.retried = 0
+
+    async def send_message(self, message: Message) -> None:
+        """Send ``message``, retrying once on a fresh connection if a reused one
+        turns out to have been dropped by the server.
+
+        The retry is not safe against duplicates: if the connection drops
+        after the server accepted DATA but before its reply arrived, the
+        message is delivered twice. Servers usually drop idle sessions, so
+        the disconnect is almost always seen at MAIL FROM, before anything
+        was sent.
+        """
+        async with self._slots:
+            smtp, reused = await self._checkout()
+            try:
+                await smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                self._discard(smtp)
+                if not reused:
+                    raise
+                self.retried += 1
+                smtp = await self._open()
+            except BaseException:
+                self._discard(smtp)
+                raise
+            else:
+                self._release(smtp)
+                return
+
+            try:
+                await smtp.send_message(message)
+            except BaseException:
+                self._discard(smtp)
+                raise
+            self._release(smtp)
+
+    async def close(self) -> None:
+        while self._idle:
+            smtp, _ = self._idle.pop()
+            await self._quit(smtp)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "opened": self.opened,
+            "reused": self.reused,
+            "health_checks": self.health_checks,
+            "expired": self.expired,
+            "discarded": self.discarded,
+            "retried": self.retried,
+        }
+
+    async def _checkout(self) -> tuple[aiosmtplib.SMTP, bool]:
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] >= self.idle_timeout:
+            smtp, _ = self._idle.popleft()
+            self.expired += 1
+            await self._quit(smtp)
+
+        while self._idle:
+            smtp, released_at = self._idle.pop()
+            if not smtp.is_connected:
+                self.discarded += 1
+                continue
+            if now - released_at >= self.noop_after:
+                self.health_checks += 1
+                try:
+                    await smtp.noop()
+                except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+                    self.discarded += 1
+                    smtp.close()
+                    continue
+            self.reused += 1
+            self.in_use += 1
+            return smtp, True
+
+        smtp = await self._open()
+        return smtp, False
+
+    async def _open(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname, port=self.port, timeout=self.timeout
+        )
+        await smtp.connect()
+        try:
+            await smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        self.opened += 1
+        self.in_use += 1
+        return smtp
+
+    def _release(self, smtp: aiosmtplib.SMTP) -> None:
+        self.in_use -= 1
+        if smtp.is_connected:
+            self._idle.append((smtp, time.monotonic()))
+        else:
+            self.discarded += 1
+
+    def _discard(self, smtp: aiosmtplib.SMTP) -> None:
+        self.in_use -= 1
+        self.discarded += 1
+        smtp.close()
+
+    async def _quit(self, smtp: aiosmtplib.SMTP) -> None:
+        with suppress(aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+            await smtp.quit()
+        smtp.close()
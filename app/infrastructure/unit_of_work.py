@@ -0,0 +1,162 @@
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    AsyncTransaction,
+    async_sessionmaker,
+)
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class _Scope:
+    __slots__ = (
+        "connection",
+        "transaction",
+        "session",
+        "after_commit",
+        "after_rollback",
+    )
+
+    def __init__(self) -> None:
+        self.connection: AsyncConnection | None = None
+        self.transaction: AsyncTransaction | None = None
+        self.session: AsyncSession | None = None
+        self.after_commit: list[Callback] = []
+        self.after_rollback: list[Callback] = []
+
+
+class UnitOfWork:
+    """Session provider shared by all repositories.
+
+    Inside ``scope()`` every repository call gets the same session, bound to a
+    single connection and transaction; ``commit()`` calls made by repositories
+    only end their part of the work and the scope commits once at the end.
+    Outside a scope each call gets its own short-lived session as before.
+
+    A scope holds its pooled connection until it ends, so it should wrap only
+    the database work that has to be atomic, never executor or network waits.
+
+    Side effects that cannot be rolled back, such as removing files, are queued
+    with ``after_commit()`` and run only once the transaction has committed.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self._current: ContextVar[_Scope | None] = ContextVar(
+            "unit_of_work_scope", default=None
+        )
+
+    @property
+    def in_scope(self) -> bool:
+        return self._current.get() is not None
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[AsyncSession]:
+        scope = self._current.get()
+        if scope is None:
+            async with self._session_factory() as session:
+                yield session
+            return
+
+        if scope.session is None:
+            # The connection is only checked out once a repository needs it.
+            scope.connection = await self._engine.connect()
+            scope.transaction = await scope.connection.begin()
+            scope.session = AsyncSession(
+                bind=scope.connection,
+                expire_on_commit=False,
+                join_transaction_mode="rollback_only",
+            )
+        yield scope.session
+
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator["UnitOfWork"]:
+        if self.in_scope:
+            yield self
+            return
+
+        scope = _Scope()
+        token = self._current.set(scope)
+        try:
+            yield self
+        except BaseException:
+            await self._finish(scope, commit=False)
+            raise
+        else:
+            await self._finish(scope, commit=True)
+        finally:
+            self._current.reset(token)
+
+    async def after_commit(self, callback: Callback) -> None:
+        """Run ``callback`` once the current scope commits, or right away
+        outside a scope where repositories have already committed."""
+        scope = self._current.get()
+        if scope is None:
+            await callback()
+        else:
+            scope.after_commit.append(callback)
+
+    def after_rollback(self, callback: Callback) -> None:
+        """Run ``callback`` if the current scope rolls back or fails to commit."""
+        scope = self._current.get()
+        if scope is not None:
+            scope.after_rollback.append(callback)
+
+    async def _finish(self, scope: _Scope, commit: bool) -> None:
+        committed = False
+        try:
+            await self._end_transaction(scope, commit)
+            committed = commit
+        finally:
+            callbacks = scope.after_commit if committed else scope.after_rollback
+            scope.after_commit, scope.after_rollback = [], []
+            await self._run_callbacks(callbacks)
+
+    async def _run_callbacks(self, callbacks: list[Callback]) -> None:
+        # Callbacks run outside the finished scope, so any database work they
+        # do gets its own session or scope instead of joining this one.
+        token = self._current.set(None)
+        try:
+            for callback in callbacks:
+                try:
+                    await callback()
+                except Exception:
+                    logger.exception("Unit of work callback %r failed", callback)
+        finally:
+            self._current.reset(token)
+
+    @staticmethod
+    async def _end_transaction(scope: _Scope, commit: bool) -> None:
+        if scope.session is None:
+            return
+
+        session, connection, transaction = (
+            scope.session,
+            scope.connection,
+            scope.transaction,
+        )
+        scope.session = scope.connection = scope.transaction = None
+        try:
+            if commit:
+                await session.flush()
+                await transaction.commit()
+            else:
+                await transaction.rollback()
+        except BaseException:
+            if transaction.is_active:
+                await transaction.rollback()
+            raise
+        finally:
+            await session.close()
+            await connection.close()
@@ -0,0 +1,215 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import (
+    BrokenExecutor,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+)
+from contextlib import suppress
+from typing import Any, Callable
+
+_RESUBMIT = object()
+
+
+class WorkerPoolFullError(Exception):
+    """Raised when a worker pool queue is already at its configured limit."""
+
+
+class _Job:
+    __slots__ = ("executor", "future", "waiter", "started", "resubmit", "timer")
+
+    def __init__(
+        self, executor: Executor, future: Future, waiter: asyncio.Future
+    ) -> None:
+        self.executor = executor
+        self.future = future
+        self.waiter = waiter
+        self.started = False
+        self.resubmit = False
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class WorkerPool:
+    """Runs blocking callables on a bounded executor off the event loop."""
+
+    def __init__(
+        self,
+        executor_class: type[Executor],
+        max_workers: int,
+        max_queue: int | None = None,
+        timeout: float | None = None,
+        **executor_kwargs: Any,
+    ) -> None:
+        self._executor_class = executor_class
+        self._executor_kwargs = executor_kwargs
+        self._executor: Executor | None = None
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.recycled = 0
+        self._waiting: deque[_Job] = deque()
+        self._running = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def active(self) -> int:
+        return min(self.in_flight, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        return max(self.in_flight - self.max_workers, 0)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.max_queue is not None and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise WorkerPoolFullError(
+                f"Worker pool queue is full ({self.max_queue} pending jobs)."
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        while True:
+            job = self._submit(loop, func, args, submitted)
+            try:
+                result = await job.waiter
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            if result is not _RESUBMIT:
+                return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        func: Callable[..., Any],
+        args: tuple,
+        submitted: float,
+    ) -> _Job:
+        executor = self._get_executor()
+        job = _Job(executor, executor.submit(func, *args), loop.create_future())
+        self.in_flight += 1
+        self._waiting.append(job)
+        self._start_waiting(loop)
+        # The job is counted until the executor finishes it, not until the
+        # caller stops waiting, so cancelled or timed out callers cannot hide
+        # work that is still occupying a worker.
+        job.future.add_done_callback(
+            lambda _: self._call_soon(loop, self._job_done, job, submitted)
+        )
+        return job
+
+    def _start_waiting(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Executors hand out jobs in submission order, so a job is running once
+        # fewer than max_workers jobs ahead of it are left. The timeout only
+        # counts from then, not from the time spent queued.
+        while self._waiting and self._running < self.max_workers:
+            job = self._waiting.popleft()
+            job.started = True
+            self._running += 1
+            if self.timeout is not None:
+                job.timer = loop.call_later(self.timeout, self._expire, job)
+
+    def _expire(self, job: _Job) -> None:
+        if job.waiter.done():
+            return
+        self.timed_out += 1
+        if not job.future.cancel() and isinstance(job.executor, ProcessPoolExecutor):
+            self._recycle(job.executor)
+        job.waiter.set_exception(asyncio.TimeoutError())
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the worker processes of ``executor`` so a hung job stops.
+
+        A running job cannot be cancelled, so the whole executor is replaced.
+        Jobs that had not started yet are submitted again to the new one; other
+        jobs running next to the hung one fail with ``BrokenProcessPool``.
+        """
+        if self._executor is executor:
+            self._executor = None
+        for job in self._waiting:
+            if job.executor is executor:
+                job.resubmit = True
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        self.recycled += 1
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "recycled": self.recycled,
+            "avg_seconds": (
+                round(self.total_seconds / self.completed, 4) if self.completed else 0.0
+            ),
+            "max_seconds": round(self.max_seconds, 4),
+        }
+
+    def _job_done(self, job: _Job, submitted: float) -> None:
+        self.in_flight -= 1
+        if job.started:
+            self._running -= 1
+            if job.timer is not None:
+                job.timer.cancel()
+        else:
+            self._waiting.remove(job)
+        self._start_waiting(job.waiter.get_loop())
+
+        future = job.future
+        if future.cancelled():
+            error: BaseException | None = CancelledError()
+        else:
+            error = future.exception()
+            if error is None:
+                elapsed = time.perf_counter() - submitted
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+            elif not (job.resubmit and isinstance(error, BrokenExecutor)):
+                self.failed += 1
+
+        if job.waiter.done():
+            return
+        if error is None:
+            job.waiter.set_result(future.result())
+        elif job.resubmit and isinstance(error, (CancelledError, BrokenExecutor)):
+            job.waiter.set_result(_RESUBMIT)
+        else:
+            job.waiter.set_exception(error)
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback, *args: Any) -> None:
+        with suppress(RuntimeError):
+            loop.call_soon_threadsafe(callback, *args)
+
+    def _get_executor(self) -> Executor:
+        if getattr(self._executor, "_broken", False):
+            # A worker died outside of _recycle, start over with a new executor.
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            self._executor = self._executor_class(
+                max_workers=self.max_workers, **self._executor_kwargs
+            )
+        return self._executor
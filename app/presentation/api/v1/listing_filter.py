@@ -0,0 +1,94 @@
+import datetime
+import enum
+import uuid
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.domain.dtos.filter_dto import FilterDTO, FilterExpressionDTO
+from app.infrastructure.config import config
+from app.infrastructure.const import OPERATORS
+from app.infrastructure.models.listing_model import Listing
+
+OR_SEPARATOR = "|"
+AND_SEPARATOR = ","
+VALUE_SEPARATOR = ";"
+MAX_FILTER_CONDITIONS = 32
+
+FILTER_SYNTAX = (
+    "Filter format 'field_operator=value', conditions joined with "
+    f"'{AND_SEPARATOR}' (AND) and '{OR_SEPARATOR}' (OR), AND binding tighter. "
+    f"'in' and 'between' take values separated by '{VALUE_SEPARATOR}'. "
+    f"Avilable operators [{', '.join(OPERATORS)}]"
+)
+
+FILTERABLE_COLUMNS = {
+    column.name: column
+    for column in Listing.__table__.columns
+    if not isinstance(column.type, TSVECTOR)
+}
+
+
+@lru_cache(maxsize=config.LISTINGS_FILTER_CACHE_SIZE)
+def parse_listing_filter(raw_filter: str) -> FilterExpressionDTO:
+    """Parse and validate a filter string, caching the result by the raw string."""
+    groups = tuple(
+        tuple(_parse_condition(condition) for condition in group.split(AND_SEPARATOR))
+        for group in raw_filter.split(OR_SEPARATOR)
+    )
+
+    if sum(len(group) for group in groups) > MAX_FILTER_CONDITIONS:
+        raise ValueError(f"At most {MAX_FILTER_CONDITIONS} conditions are allowed")
+
+    return FilterExpressionDTO(groups=groups)
+
+
+def _parse_condition(condition: str) -> FilterDTO:
+    field_operator, separator, raw_value = condition.partition("=")
+    field, _, operator = field_operator.strip().rpartition("_")
+
+    if not separator or not field:
+        raise ValueError(f"Condition {condition!r} is not 'field_operator=value'")
+    if operator not in OPERATORS:
+        raise ValueError(f"Incorrect operator {operator}")
+
+    column = FILTERABLE_COLUMNS.get(field)
+    if column is None:
+        raise ValueError(f"Cannot filter by column {field}")
+
+    python_type = column.type.python_type
+
+    if operator == "like":
+        if python_type is not str:
+            raise ValueError("Operator like is only supported on text columns")
+        return FilterDTO(field=field, operator=operator, value=raw_value)
+
+    if operator in ("in", "between"):
+        values = tuple(
+            _coerce(python_type, value) for value in raw_value.split(VALUE_SEPARATOR)
+        )
+        if operator == "between" and len(values) != 2:
+            raise ValueError("Operator between takes exactly two values")
+        return FilterDTO(field=field, operator=operator, value=values)
+
+    return FilterDTO(
+        field=field, operator=operator, value=_coerce(python_type, raw_value)
+    )
+
+
+def _coerce(python_type: type, raw_value: str) -> Any:
+    try:
+        if issubclass(python_type, enum.Enum):
+            if raw_value in python_type.__members__:
+                return python_type[raw_value]
+            return python_type(raw_value)
+        if python_type is datetime.datetime:
+            return datetime.datetime.fromisoformat(raw_value)
+        if python_type is uuid.UUID:
+            return uuid.UUID(raw_value)
+        return python_type(raw_value)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(
+            f"Value {raw_value!r} is not a valid {python_type.__name__}"
+        ) from e
@@ -0,0 +1,110 @@
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from pydantic import ValidationError
+from pydantic_core import to_json, to_jsonable_python
+
+from app.presentation.schemas.listing_schema import ListingIn
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_listings(lines: AsyncIterable[str]) -> AsyncIterator[ListingIn]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield ListingIn.model_validate(json.loads(line))
+        except (ValueError, ValidationError) as e:
+            raise ValueError(f"Invalid listing on line {line_number}: {e}") from e
+
+
+async def iter_csv_listings(lines: AsyncIterable[str]) -> AsyncIterator[ListingIn]:
+    header: list[str] | None = None
+    record = ""
+    line_number = 0
+
+    async for line in lines:
+        line_number += 1
+        record += line
+        # A record spans several lines while a quoted field is still open.
+        if record.count('"') % 2:
+            continue
+
+        row, record = next(csv.reader([record])), ""
+        if not row:
+            continue
+        if header is None:
+            header = row
+            continue
+
+        values = {
+            field: (value if value != "" else None)
+            for field, value in zip(header, row)
+        }
+        try:
+            yield ListingIn.model_validate(values)
+        except ValidationError as e:
+            raise ValueError(f"Invalid listing on line {line_number}: {e}") from e
+
+    if record.strip():
+        raise ValueError("Unterminated quoted field at the end of the CSV body")
+
+
+async def batched(
+    listings: AsyncIterable[ListingIn], size: int
+) -> AsyncIterator[list[ListingIn]]:
+    batch: list[ListingIn] = []
+    async for listing in listings:
+        batch.append(listing)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def iter_ndjson_rows(
+    batches: AsyncIterable[Sequence[dict]],
+) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(to_json(row) + b"\n" for row in rows)
+
+
+async def iter_csv_rows(
+    batches: AsyncIterable[Sequence[dict]], fieldnames: Sequence[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+
+    async for rows in batches:
+        # Same value formatting as the JSON responses, so exports re-import.
+        writer.writerows(to_jsonable_python(rows))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,35 @@
+import os
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import FileResponse, JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response for content that is already validated.
+
+    Routes return it directly so FastAPI skips validating the content against
+    ``response_model`` again; pydantic-core serialises models, enums, UUIDs and
+    datetimes straight to bytes instead of going through ``jsonable_encoder``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class ETagFileResponse(FileResponse):
+    """File response whose ETag is supplied by the caller.
+
+    Starlette derives ``If-Range`` validation from the file's mtime and size,
+    so it is checked against the given ETag instead to keep resumed range
+    requests working.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], etag: str, **kwargs: Any):
+        super().__init__(path, **kwargs)
+        self.headers["etag"] = etag
+
+    def _should_use_range(
+        self, http_if_range: str, stat_result: os.stat_result
+    ) -> bool:
+        return http_if_range == self.headers["etag"]
@@ -15,6 +15,7 @@ from app.infrastructure.security import (
     get_current_user,
     get_password_hash,
 )
+from app.infrastructure.workers import WorkerPoolFullError
 from app.presentation.schemas.token_schema import Token
 from app.presentation.schemas.user_schema import UserDB, UserIn
 
@@ -24,7 +25,14 @@ router = APIRouter()
 @router.post("/login", response_model=Token)
 @inject
 async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]) -> Token:
-    user = await authenticate_user(form_data.username, form_data.password)
+    try:
+        user = await authenticate_user(form_data.username, form_data.password)
+    except WorkerPoolFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, try again shortly",
+            headers={"Retry-After": "1"},
+        )
 
     if not user:
         raise HTTPException(
@@ -54,6 +62,12 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email or password already exists",
         )
+    except WorkerPoolFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent registrations, try again shortly",
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.get("/me", response_model=UserDB)
@@ -1,11 +1,13 @@
+from concurrent.futures import BrokenExecutor, CancelledError
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from dependency_injector.wiring import Provide, inject
-from fastapi.responses import StreamingResponse
 
 from app.application.interfaces.igraph_service import IGraphService
 from app.container import Container
 from app.infrastructure.security import verify_token
+from app.infrastructure.workers import WorkerPoolFullError
+from app.presentation.api.v1.http_cache import etag_matches
 
 
 router = APIRouter(dependencies=[Depends(verify_token)])
@@ -16,7 +18,21 @@ async def get_graph(
     graph_service: IGraphService = Depends(Provide[Container.graph_service]),
     year: Annotated[int | None, 
         Query(description="""Optional query parameter. Pass a year to display that years summary of prices. 
-            If nothing is passed it defaults to whats in the database.""")] = None
+            If nothing is passed it defaults to whats in the database.""")] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    img = await graph_service.generate_graph_buffer(year_or_all=year)
-    return StreamingResponse(img, media_type="image/png")
\ No newline at end of file
+    try:
+        graph = await graph_service.get_graph(year_or_all=year)
+    except (WorkerPoolFullError, TimeoutError, BrokenExecutor, CancelledError):
+        # CancelledError here is the render job's, dropped by a pool shutdown.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Graph rendering is busy, try again shortly",
+            headers={"Retry-After": "5"},
+        )
+    headers = {"ETag": graph.etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(if_none_match, graph.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=graph.content, media_type="image/png", headers=headers)
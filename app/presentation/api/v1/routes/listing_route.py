@@ -1,22 +1,77 @@
-from typing import Annotated, Iterable
+from typing import Annotated, Iterable, Literal
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 from sqlalchemy.exc import IntegrityError
 
 from app.application.interfaces.ilisting_service import IListingService
 from app.container import Container
-from app.domain.dtos.filter_dto import FilterDTO
+from app.domain.dtos.filter_dto import FilterExpressionDTO
 from app.domain.dtos.sort_options_dto import SortOptions
 from app.domain.models.listing_update import ListingUpdate
-from app.infrastructure.const import OPERATORS
+from app.infrastructure.config import config
 from app.infrastructure.security import verify_token
-from app.presentation.schemas.listing_schema import ListingDB, ListingIn
+from app.presentation.api.v1.listing_filter import (
+    FILTER_SYNTAX,
+    parse_listing_filter,
+)
+from app.presentation.api.v1.listing_formats import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    batched,
+    iter_csv_listings,
+    iter_csv_rows,
+    iter_lines,
+    iter_ndjson_listings,
+    iter_ndjson_rows,
+)
+from app.presentation.api.v1.responses import PydanticJSONResponse
+from app.presentation.schemas.listing_schema import (
+    LISTING_FIELDS,
+    ListingDB,
+    ListingIn,
+    ListingPage,
+    listing_fields,
+)
 
 router = APIRouter(dependencies=[Depends(verify_token)])
 
 
+def _parse_filter(filter: str | None) -> FilterExpressionDTO | None:
+    if filter is None:
+        return None
+
+    return parse_listing_filter(filter)
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    if fields is None:
+        return None
+
+    try:
+        return listing_fields(
+            name.strip() for name in fields.split(",") if name.strip()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Wrong fields {fields}. Error {e}")
+
+
+FIELDS_DESCRIPTION = (
+    "Comma separated listing fields to return, id is always included. "
+    f"Available fields [{', '.join(LISTING_FIELDS)}]"
+)
+
+
 @router.post("/listings", response_model=list[ListingDB], status_code=201)
 @inject
 async def add_listing(
@@ -32,39 +87,171 @@ async def add_listing(
         )
 
 
+@router.post("/listings/import", status_code=201)
+@inject
+async def import_listings(
+    request: Request,
+    service: IListingService = Depends(Provide[Container.listing_service]),
+) -> dict:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type == NDJSON_MEDIA_TYPE:
+        listings = iter_ndjson_listings(iter_lines(request.stream()))
+    elif content_type == CSV_MEDIA_TYPE:
+        listings = iter_csv_listings(iter_lines(request.stream()))
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Supported content types are {NDJSON_MEDIA_TYPE} and {CSV_MEDIA_TYPE}",
+        )
+
+    try:
+        imported = await service.import_listings(
+            batches=batched(listings, config.LISTINGS_INSERT_CHUNK_SIZE)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail="A listing with this title already exists."
+        )
+
+    return {"imported": imported}
+
+
 @router.get("/listings")
 @inject
 async def get_listings(
     service: IListingService = Depends(Provide[Container.listing_service]),
     sort_order: Annotated[str | None, Query(description="Sort order")] = None,
     sort_by: Annotated[str | None, Query(description="Column to sort by")] = None,
-    filter: Annotated[
-        str | None,
+    filter: Annotated[str | None, Query(description=FILTER_SYNTAX)] = None,
+    fields: Annotated[str | None, Query(description=FIELDS_DESCRIPTION)] = None,
+) -> Iterable[ListingDB]:
+    field_names = _parse_fields(fields)
+    try:
+        sort_options = SortOptions(column=sort_by, order=sort_order)
+        filter_dto = _parse_filter(filter)
+
+        listings = await service.get_listings(
+            sort_options=sort_options, filter=filter_dto, fields=field_names
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Wrong filter format {filter}. Error {e}"
+        )
+
+    return PydanticJSONResponse(listings)
+
+
+@router.get("/listings/page", response_model=ListingPage)
+@inject
+async def get_listings_page(
+    service: IListingService = Depends(Provide[Container.listing_service]),
+    sort_order: Annotated[str | None, Query(description="Sort order")] = None,
+    sort_by: Annotated[str | None, Query(description="Column to sort by")] = None,
+    filter: Annotated[str | None, Query(description=FILTER_SYNTAX)] = None,
+    limit: Annotated[
+        int,
         Query(
-            description="Filter format 'field_operator=value. Avilable operators [gt, gte, lt, lte, eq, ne, like]'"
+            ge=1,
+            le=config.LISTINGS_MAX_PAGE_SIZE,
+            description="Maximum number of listings in the page",
         ),
+    ] = config.LISTINGS_PAGE_SIZE,
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque cursor taken from next_cursor of the previous page"),
     ] = None,
-) -> Iterable[ListingDB]:
+    fields: Annotated[str | None, Query(description=FIELDS_DESCRIPTION)] = None,
+) -> ListingPage:
+    field_names = _parse_fields(fields)
     try:
         sort_options = SortOptions(column=sort_by, order=sort_order)
+        filter_dto = _parse_filter(filter)
 
-        if filter is not None:
-            field_operator, value = filter.split("=")
-            field, operator = field_operator.split("_")
+        page = await service.get_listings_page(
+            sort_options=sort_options,
+            filter=filter_dto,
+            limit=limit,
+            cursor=cursor,
+            fields=field_names,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Wrong page request. Error {e}")
 
-            if operator not in OPERATORS:
-                raise ValueError(f"Incorrect operator {operator}")
+    return PydanticJSONResponse(page)
 
-            value = int(value) if value.isdigit() else value
 
-            filter = FilterDTO(field=field, operator=operator, value=value)
+@router.get("/listings/export")
+@inject
+async def export_listings(
+    service: IListingService = Depends(Provide[Container.listing_service]),
+    sort_order: Annotated[str | None, Query(description="Sort order")] = None,
+    sort_by: Annotated[str | None, Query(description="Column to sort by")] = None,
+    filter: Annotated[str | None, Query(description=FILTER_SYNTAX)] = None,
+    format: Annotated[
+        Literal["ndjson", "csv"], Query(description="Export file format")
+    ] = "ndjson",
+) -> StreamingResponse:
+    try:
+        sort_options = SortOptions(column=sort_by, order=sort_order)
+        filter_dto = _parse_filter(filter)
 
-        return await service.get_listings(sort_options=sort_options, filter=filter)
+        batches = await service.export_listings(
+            sort_options=sort_options, filter=filter_dto
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=400, detail=f"Wrong filter format {filter}. Error {e}"
         )
 
+    if format == "csv":
+        body = iter_csv_rows(batches, LISTING_FIELDS)
+        media_type = CSV_MEDIA_TYPE
+    else:
+        body = iter_ndjson_rows(batches)
+        media_type = NDJSON_MEDIA_TYPE
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="listings.{format}"'},
+    )
+
+
+@router.get("/listings/search", response_model=ListingPage)
+@inject
+async def search_listings(
+    q: Annotated[
+        str,
+        Query(
+            min_length=1,
+            max_length=200,
+            description="Words matched against title, location, street and description",
+        ),
+    ],
+    service: IListingService = Depends(Provide[Container.listing_service]),
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=config.LISTINGS_MAX_PAGE_SIZE,
+            description="Maximum number of listings in the page",
+        ),
+    ] = config.LISTINGS_PAGE_SIZE,
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque cursor taken from next_cursor of the previous page"),
+    ] = None,
+) -> ListingPage:
+    try:
+        page = await service.search_listings(text=q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Wrong search request. Error {e}")
+
+    return PydanticJSONResponse(page)
+
 
 @router.delete("/listings/{listing_id}")
 @inject
@@ -0,0 +1,37 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+
+from app.application.interfaces.igraph_service import IGraphService
+from app.application.interfaces.iphoto_service import IListingPhotoService
+from app.container import Container
+from app.infrastructure.cache import principal_cache
+from app.infrastructure.db import pool_stats
+from app.infrastructure.security import password_hash_pool, verify_token
+from app.infrastructure.smtp_pool import SMTPConnectionPool
+from app.infrastructure.workers import WorkerPool
+from app.presentation.api.v1.listing_filter import parse_listing_filter
+
+router = APIRouter(dependencies=[Depends(verify_token)])
+
+
+@router.get("/metrics")
+@inject
+async def get_metrics(
+    graph_service: IGraphService = Depends(Provide[Container.graph_service]),
+    photo_io_pool: WorkerPool = Depends(Provide[Container.photo_io_pool]),
+    photo_variant_pool: WorkerPool = Depends(Provide[Container.photo_variant_pool]),
+    photo_service: IListingPhotoService = Depends(Provide[Container.photo_service]),
+    smtp_pool: SMTPConnectionPool = Depends(Provide[Container.smtp_pool]),
+) -> dict:
+    return {
+        "db_pool": pool_stats(),
+        "principal_cache": principal_cache.stats(),
+        "listing_filter_cache": parse_listing_filter.cache_info()._asdict(),
+        "password_hash_pool": password_hash_pool.stats(),
+        "graph_cache": graph_service.cache_stats(),
+        "graph_render_pool": graph_service.render_stats(),
+        "photo_io_pool": photo_io_pool.stats(),
+        "photo_variant_pool": photo_variant_pool.stats(),
+        "photo_sweep": photo_service.sweep_stats(),
+        "smtp_pool": smtp_pool.stats(),
+    }
@@ -1,14 +1,22 @@
-import base64
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 
 from app.application.interfaces.iphoto_service import IListingPhotoService
 from app.application.interfaces.services.photo_service import (
+    PHOTO_VARIANTS,
     InvalidImageTypeError,
     ListingPhotoServiceError,
     PhotoTooLargeError,
@@ -17,12 +25,17 @@ from app.container import Container
 from app.domain.dtos.photo_upload_dto import ListingPhotoUploadDTO
 from app.infrastructure.config import config
 from app.infrastructure.security import verify_token
-from app.presentation.schemas.photo_schema import ListingPhotoDB, ListingPhotoPayload
+from app.infrastructure.workers import WorkerPoolFullError
+from app.presentation.api.v1.http_cache import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+)
+from app.presentation.api.v1.responses import ETagFileResponse
+from app.presentation.schemas.photo_schema import ListingPhotoDB
 
 router = APIRouter(dependencies=[Depends(verify_token)])
 
-MAX_UPLOAD_SIZE_BYTES = config.MAX_UPLOAD_SIZE_MB * 1024 * 1024
-
 
 def _ensure_image(upload_file: UploadFile) -> None:
     if upload_file.content_type is None or not upload_file.content_type.startswith(
@@ -31,21 +44,18 @@ def _ensure_image(upload_file: UploadFile) -> None:
         raise HTTPException(status_code=415, detail="Only image uploads are allowed.")
 
 
-async def _upload_to_dto(
-    upload_file: UploadFile, listing_id: UUID4
-) -> ListingPhotoUploadDTO:
-    data = await upload_file.read(MAX_UPLOAD_SIZE_BYTES + 1)
-    if len(data) > MAX_UPLOAD_SIZE_BYTES:
-        raise HTTPException(
-            status_code=413,
-            detail=f"Photo exceeds {config.MAX_UPLOAD_SIZE_MB}MB limit.",
-        )
+async def _iter_upload(upload_file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload_file.read(config.PHOTO_UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+def _upload_to_dto(upload_file: UploadFile, listing_id: UUID4) -> ListingPhotoUploadDTO:
     _ensure_image(upload_file)
     return ListingPhotoUploadDTO(
         listing_id=listing_id,
         filename=upload_file.filename or "uploaded_photo",
         content_type=upload_file.content_type,
-        data=data,
+        chunks=_iter_upload(upload_file),
     )
 
 
@@ -59,14 +69,19 @@ async def upload_photo(
     service: IListingPhotoService = Depends(Provide[Container.photo_service]),
 ) -> ListingPhotoDB:
     try:
-        dto = await _upload_to_dto(file, listing_id)
-        stored = await service.store_photo(dto)
+        stored = await service.store_photo(_upload_to_dto(file, listing_id))
     except PhotoTooLargeError as exc:
         raise HTTPException(status_code=413, detail=str(exc)) from exc
     except InvalidImageTypeError as exc:
         raise HTTPException(status_code=415, detail=str(exc)) from exc
     except ListingPhotoServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except WorkerPoolFullError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Photo storage is busy, try again shortly.",
+            headers={"Retry-After": "1"},
+        ) from exc
     finally:
         await file.close()
     return stored
@@ -84,7 +99,7 @@ async def upload_photos(
     service: IListingPhotoService = Depends(Provide[Container.photo_service]),
 ) -> list[ListingPhotoDB]:
     try:
-        dtos = [await _upload_to_dto(file, listing_id) for file in files]
+        dtos = [_upload_to_dto(file, listing_id) for file in files]
         stored = await service.store_photos(dtos)
     except PhotoTooLargeError as exc:
         raise HTTPException(status_code=413, detail=str(exc)) from exc
@@ -92,6 +107,12 @@ async def upload_photos(
         raise HTTPException(status_code=415, detail=str(exc)) from exc
     except ListingPhotoServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except WorkerPoolFullError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Photo storage is busy, try again shortly.",
+            headers={"Retry-After": "1"},
+        ) from exc
     finally:
         for file in files:
             await file.close()
@@ -108,51 +129,105 @@ async def get_photo_metadata(
     return list(metadata)
 
 
-@router.get(
-    "/listings/{listing_id}/photos/download",
-    response_model=list[ListingPhotoPayload],
-)
+@router.get("/listings/{listing_id}/photos/download")
 @inject
 async def download_listing_photos(
     listing_id: UUID4,
     service: IListingPhotoService = Depends(Provide[Container.photo_service]),
-):
+) -> StreamingResponse:
     try:
-        photos = await service.read_photos_by_listing(listing_id)
+        archive = await service.stream_listing_archive(listing_id)
     except ListingPhotoServiceError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    payload: list[ListingPhotoPayload] = []
-    for metadata, data in photos:
-        payload.append(
-            ListingPhotoPayload(
-                id=metadata.id,
-                listing_id=metadata.listing_id,
-                original_name=metadata.original_name,
-                content_type=metadata.content_type,
-                size_bytes=metadata.size_bytes,
-                data=base64.b64encode(data).decode("utf-8"),
+    return StreamingResponse(
+        archive,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="listing-{listing_id}-photos.zip"'
             )
-        )
-    return payload
+        },
+    )
 
 
 @router.get("/photos/{photo_id}/file")
 @inject
 async def download_photo_file(
     photo_id: UUID4,
+    variant: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
     service: IListingPhotoService = Depends(Provide[Container.photo_service]),
 ):
+    if variant is not None and variant not in PHOTO_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Wrong variant, available variants [{', '.join(PHOTO_VARIANTS)}]",
+        )
+
     metadata = await service.get_photo(photo_id)
     if metadata is None:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    file_path = Path(metadata.storage_path)
-    if not file_path.is_file():
-        raise HTTPException(status_code=404, detail="Stored photo missing")
+    # Stored files are named by their content hash, which makes a strong ETag.
+    served = metadata
+    filename = metadata.original_name
+    cache_control = IMMUTABLE_CACHE_CONTROL
+    if variant is not None:
+        variant_metadata = await service.get_photo_variant(photo_id, variant)
+        if variant_metadata is not None:
+            served = variant_metadata
+            suffix = Path(variant_metadata.stored_name).suffix
+            filename = Path(metadata.original_name).stem + suffix
+        else:
+            # Variants are generated in the background, the original is
+            # served until they are ready and must not be cached under the
+            # variant URL.
+            cache_control = REVALIDATE_CACHE_CONTROL
+
+    etag = f'"{served.stored_name}"'
+    headers = {"Cache-Control": cache_control}
+
+    # The ETag comes from the stored metadata, a revalidation never touches
+    # the file.
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, **headers})
 
-    return FileResponse(
-        path=file_path,
-        media_type=metadata.content_type,
-        filename=metadata.original_name,
+    try:
+        if served is not metadata and not await service.has_stored_file(
+            served.storage_path
+        ):
+            # The variant row is there but its file is not, fall back to the
+            # original like for a variant that is not generated yet.
+            served = metadata
+            filename = metadata.original_name
+            etag = f'"{metadata.stored_name}"'
+            headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+
+        if not await service.has_stored_file(served.storage_path):
+            raise HTTPException(status_code=404, detail="Stored photo missing")
+    except WorkerPoolFullError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Photo storage is busy, try again shortly.",
+            headers={"Retry-After": "1"},
+        ) from exc
+
+    return ETagFileResponse(
+        path=served.storage_path,
+        etag=etag,
+        headers=headers,
+        media_type=served.content_type,
+        filename=filename,
     )
+
+
+@router.delete("/photos/{photo_id}")
+@inject
+async def delete_photo(
+    photo_id: UUID4,
+    service: IListingPhotoService = Depends(Provide[Container.photo_service]),
+) -> dict:
+    if not await service.delete_photo(photo_id):
+        raise HTTPException(status_code=404, detail="Photo not found")
+    return {"message": "Photo deleted successfully"}
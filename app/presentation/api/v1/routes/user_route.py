@@ -8,6 +8,7 @@ from app.container import Container
 from app.domain.dtos.sort_options_dto import SortOptions
 from app.infrastructure.models.user_model import User
 from app.infrastructure.security import get_password_hash, verify_token
+from app.infrastructure.workers import WorkerPoolFullError
 from app.presentation.schemas.user_schema import UserIn, UserDB
 
 
@@ -49,6 +50,11 @@ async def add_user(user_data: UserIn, service: IUserService = Depends(Provide[Co
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email or password already exists")
+    except WorkerPoolFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent registrations, try again shortly",
+            headers={"Retry-After": "1"})
     
 @router.get("/users/{id}", response_model=UserDB, status_code=200)
 @inject
@@ -1,7 +1,8 @@
 import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional
 
-from pydantic import UUID4, BaseModel, ConfigDict
+from pydantic import UUID4, BaseModel, ConfigDict, create_model
 
 from app.infrastructure.models.listing_model import (
     PropertyType,
@@ -32,3 +33,41 @@ class ListingDB(ListingIn):
     created_at: datetime.datetime
     price_per_area: float
     model_config = ConfigDict(from_attributes=True)
+
+
+class ListingPage(BaseModel):
+    items: list[ListingDB]
+    next_cursor: Optional[str] = None
+
+
+LISTING_FIELDS = tuple(ListingDB.model_fields)
+
+
+def listing_fields(names: Iterable[str]) -> tuple[str, ...]:
+    """Validate a sparse fieldset, returning it in ListingDB order with id included."""
+    requested = {"id", *names}
+    unknown = requested.difference(LISTING_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown listing fields {', '.join(sorted(unknown))}")
+    return tuple(name for name in LISTING_FIELDS if name in requested)
+
+
+@lru_cache(maxsize=128)
+def listing_projection(fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        "ListingProjection",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (ListingDB.model_fields[name].annotation, ...)
+            for name in fields
+        },
+    )
+
+
+@lru_cache(maxsize=128)
+def listing_projection_page(fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        "ListingProjectionPage",
+        items=(list[listing_projection(fields)], ...),
+        next_cursor=(Optional[str], None),
+    )
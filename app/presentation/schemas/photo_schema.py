@@ -9,6 +9,7 @@ class ListingPhotoCreate(BaseModel):
     content_type: str | None
     size_bytes: int
     storage_path: str
+    sha256: str | None = None
 
 
 class ListingPhotoDB(ListingPhotoCreate):
@@ -17,10 +18,19 @@ class ListingPhotoDB(ListingPhotoCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
-class ListingPhotoPayload(BaseModel):
-    id: UUID4
-    listing_id: UUID4
-    original_name: str
-    content_type: str | None
+class ListingPhotoVariantCreate(BaseModel):
+    photo_id: UUID4
+    name: str
+    stored_name: str
+    content_type: str
+    width: int
+    height: int
     size_bytes: int
-    data: str
+    storage_path: str
+
+
+class ListingPhotoVariantDB(ListingPhotoVariantCreate):
+    id: UUID4
+    created_at: datetime.datetime
+    model_config = ConfigDict(from_attributes=True)
+
@@ -0,0 +1,123 @@
+"""Record EXPLAIN plans for every listing sort and filter combination.
+
+Run from the repository root against a populated, migrated database:
+
+    python -m benchmarks.explain_listing_queries --output plans.jsonl
+
+Each query is built by ``ListingService`` exactly as the API builds it, then
+run through ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)``. One JSON line per
+combination is written with the full plan, and a summary of the scan nodes,
+indexes used and execution time is printed.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+
+from app.application.interfaces.services.listing_service import ListingService
+from app.domain.dtos.sort_options_dto import SortOptions
+from app.infrastructure.db import engine
+from app.infrastructure.repositories.listing_repository import (
+    monthly_price_per_area_query,
+)
+from app.presentation.api.v1.listing_filter import parse_listing_filter
+
+SORT_COLUMNS = [None, "price", "area", "created_at", "title"]
+SORT_ORDERS = ["asc", "desc"]
+FILTERS = [
+    None,
+    "status_eq=AVAILABLE",
+    "transaction_type_eq=SELL",
+    "location_eq=Beograd",
+    "price_between=50000;150000",
+    "area_lte=80",
+    "title_like=stan",
+    "status_eq=AVAILABLE,price_lte=150000",
+    "status_in=AVAILABLE;PENDING,transaction_type_eq=RENT",
+]
+PAGE_SIZE = 50
+
+
+class _CapturingRepository:
+    def __init__(self) -> None:
+        self.query: Select | None = None
+
+    async def get_listings(self, query: Select) -> list:
+        self.query = query
+        return []
+
+
+async def _build_queries() -> AsyncIterator[tuple[dict, Select]]:
+    repository = _CapturingRepository()
+    service = ListingService(repository=repository)
+
+    for column, order, raw_filter in itertools.product(
+        SORT_COLUMNS, SORT_ORDERS, FILTERS
+    ):
+        if column is None and order == "desc":
+            continue
+        sort_options = SortOptions(column=column, order=order)
+        filter = parse_listing_filter(raw_filter) if raw_filter else None
+
+        case = {"sort": column, "order": order, "filter": raw_filter}
+
+        await service.get_listings(sort_options=sort_options, filter=filter)
+        yield {"endpoint": "/listings", **case}, repository.query
+
+        await service.get_listings_page(
+            sort_options=sort_options, filter=filter, limit=PAGE_SIZE
+        )
+        yield {"endpoint": "/listings/page", **case}, repository.query
+
+    yield {"endpoint": "/graph"}, monthly_price_per_area_query()
+
+
+def _summarise(plan: dict) -> dict:
+    nodes: list[dict] = []
+    pending = [plan["Plan"]]
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+
+    return {
+        "scans": sorted(
+            {node["Node Type"] for node in nodes if "Scan" in node["Node Type"]}
+        ),
+        "indexes": sorted(
+            {node["Index Name"] for node in nodes if "Index Name" in node}
+        ),
+        "execution_ms": plan.get("Execution Time"),
+    }
+
+
+async def main(output: str) -> None:
+    async with engine.connect() as conn:
+        with open(output, "w", encoding="utf-8") as fp:
+            async for case, query in _build_queries():
+                sql = query.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"
+                )
+                plan = result.scalar_one()[0]
+                summary = _summarise(plan)
+
+                fp.write(json.dumps({**case, **summary, "plan": plan}) + "\n")
+                print(json.dumps({**case, **summary}))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="listing_query_plans.jsonl")
+    args = parser.parse_args()
+    asyncio.run(main(args.output))
@@ -0,0 +1,101 @@
+"""Compare response serialisation paths of GET /listings for many rows.
+
+Run from the repository root with the application environment configured:
+
+    python -m benchmarks.listing_serialisation --rows 10000
+
+The same already validated ``ListingDB`` rows are served by two minimal
+routes: one returning them through ``response_model`` (FastAPI validates the
+list again and serialises it with ``jsonable_encoder``), the other returning
+``PydanticJSONResponse`` as the listing routes do. No database is involved.
+"""
+
+import argparse
+import datetime
+import statistics
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.infrastructure.models.listing_model import (
+    PropertyType,
+    Status,
+    TransactionType,
+)
+from app.presentation.api.v1.responses import PydanticJSONResponse
+from app.presentation.schemas.listing_schema import ListingDB
+
+
+def _make_listings(rows: int) -> list[ListingDB]:
+    created_at = datetime.datetime(2024, 1, 1)
+    return [
+        ListingDB(
+            id=uuid.uuid4(),
+            title=f"Listing {index}",
+            location="Beograd",
+            street=f"Knez Mihailova {index}",
+            price=100_000 + index,
+            area=55.5,
+            property_type=PropertyType.APARTMENT,
+            description="Sunny two bedroom apartment close to the city centre. " * 8,
+            transaction_type=TransactionType.SELL,
+            floor="3",
+            num_of_floors="6",
+            build_year="1998",
+            status=Status.AVAILABLE,
+            created_at=created_at,
+            price_per_area=round((100_000 + index) / 55.5),
+        )
+        for index in range(rows)
+    ]
+
+
+def _build_app(listings: list[ListingDB]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[ListingDB])
+    async def default() -> list[ListingDB]:
+        return listings
+
+    @app.get("/fast", response_model=list[ListingDB])
+    async def fast() -> list[ListingDB]:
+        return PydanticJSONResponse(listings)
+
+    return app
+
+
+def _measure(client: TestClient, path: str, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    return {
+        "bytes": len(response.content),
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+    }
+
+
+def main(rows: int, repeats: int) -> None:
+    listings = _make_listings(rows)
+    client = TestClient(_build_app(listings))
+
+    default = _measure(client, "/default", repeats)
+    fast = _measure(client, "/fast", repeats)
+
+    print(f"response_model + jsonable_encoder: {default}")
+    print(f"PydanticJSONResponse:              {fast}")
+    print(f"speedup: {default['median_ms'] / fast['median_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.repeats)
@@ -0,0 +1,78 @@
+"""Measure event loop latency seen by unrelated requests during a login storm.
+
+Run from the repository root with the application environment configured:
+
+    python -m benchmarks.login_storm --logins 40
+
+A probe coroutine stands in for an unrelated endpoint: it repeatedly sleeps
+for a short interval and records how late the event loop wakes it up. The
+storm is run twice, once verifying passwords inline on the event loop (the
+previous behaviour) and once through ``password_hash_pool``.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.infrastructure.security import (
+    password_context,
+    password_hash_pool,
+    verify_password,
+)
+
+PROBE_INTERVAL = 0.005
+
+
+async def _probe(stop: asyncio.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def _inline_verify(password: str, hashed_password: str) -> bool:
+    return password_context.verify(password, hashed_password)
+
+
+async def _run_storm(verify, logins: int, hashed_password: str) -> dict:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop, samples))
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(verify("password123", hashed_password) for _ in range(logins))
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+
+    samples.sort()
+    return {
+        "logins": logins,
+        "storm_seconds": round(elapsed, 3),
+        "probe_samples": len(samples),
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "p99_ms": round(samples[int(len(samples) * 0.99) - 1] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+async def main(logins: int) -> None:
+    hashed_password = password_context.hash("password123")
+
+    inline = await _run_storm(_inline_verify, logins, hashed_password)
+    pooled = await _run_storm(verify_password, logins, hashed_password)
+    password_hash_pool.shutdown()
+
+    print(f"inline: {inline}")
+    print(f"pooled: {pooled}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
@@ -0,0 +1,126 @@
+"""Compare email throughput of per-message SMTP sessions and SMTPConnectionPool.
+
+Run from the repository root:
+
+    python -m benchmarks.smtp_throughput --messages 200 --latency-ms 5
+
+A minimal SMTP stand-in is started on localhost that accepts any credentials
+and sleeps ``--latency-ms`` before every reply to model the network round trip.
+The same messages are sent twice: once opening, authenticating and quitting a
+session per message (the previous behaviour), once through the pool. The
+stand-in does not offer STARTTLS, so against a real server the per-message
+path also pays a TLS handshake and the gap is wider.
+"""
+
+import argparse
+import asyncio
+import time
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from app.infrastructure.smtp_pool import SMTPConnectionPool
+
+EHLO_REPLY = b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n"
+
+
+async def _serve_session(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float
+) -> None:
+    async def reply(line: bytes) -> None:
+        await asyncio.sleep(latency)
+        writer.write(line)
+        await writer.drain()
+
+    await reply(b"220 localhost ESMTP stand-in\r\n")
+    while line := await reader.readline():
+        command = line[:4].upper()
+        if command in (b"EHLO", b"HELO"):
+            await reply(EHLO_REPLY)
+        elif command == b"AUTH":
+            await reply(b"235 2.7.0 Authentication successful\r\n")
+        elif command == b"DATA":
+            await reply(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            while await reader.readline() not in (b".\r\n", b""):
+                pass
+            await reply(b"250 2.0.0 Queued\r\n")
+        elif command == b"QUIT":
+            await reply(b"221 2.0.0 Bye\r\n")
+            break
+        else:
+            await reply(b"250 2.0.0 OK\r\n")
+    writer.close()
+
+
+def _make_message(index: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "sender@example.com"
+    message["To"] = "recipient@example.com"
+    message["Subject"] = f"Listing {index}"
+    message.set_content("Sunny two bedroom apartment close to the city centre. " * 40)
+    return message
+
+
+async def _send_reconnecting(port: int, message: EmailMessage) -> None:
+    smtp = aiosmtplib.SMTP(hostname="127.0.0.1", port=port)
+    await smtp.connect()
+    await smtp.login("sender@example.com", "secret")
+    await smtp.send_message(message)
+    await smtp.quit()
+
+
+async def _measure(send, messages: int, concurrency: int) -> dict:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send_one(index: int) -> None:
+        async with slots:
+            await send(_make_message(index))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send_one(index) for index in range(messages)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "messages": messages,
+        "seconds": round(elapsed, 3),
+        "messages_per_second": round(messages / elapsed, 1),
+    }
+
+
+async def main(messages: int, concurrency: int, latency_ms: float) -> None:
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve_session(reader, writer, latency_ms / 1000),
+        "127.0.0.1",
+        0,
+    )
+    port = server.sockets[0].getsockname()[1]
+
+    async with server:
+        reconnecting = await _measure(
+            lambda message: _send_reconnecting(port, message), messages, concurrency
+        )
+
+        pool = SMTPConnectionPool(
+            hostname="127.0.0.1",
+            port=port,
+            username="sender@example.com",
+            password="secret",
+            size=concurrency,
+        )
+        pooled = await _measure(pool.send_message, messages, concurrency)
+        pool_stats = pool.stats()
+        await pool.close()
+
+    print(f"session per message: {reconnecting}")
+    print(f"SMTPConnectionPool:  {pooled}")
+    print(f"pool stats:          {pool_stats}")
+    print(f"speedup: {reconnecting['seconds'] / pooled['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency, args.latency_ms))
@@ -27,12 +27,14 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.mock_listing_repo = AsyncMock()
         self.mock_graph_service = AsyncMock()
+        self.mock_smtp_pool = AsyncMock()
 
         self.email_service = EmailService(
-            repository=self.mock_listing_repo, graph_service=self.mock_graph_service
+            repository=self.mock_listing_repo,
+            graph_service=self.mock_graph_service,
+            smtp_pool=self.mock_smtp_pool,
         )
         self.email_service.gmail_addr = "test_sender@example.com"
-        self.email_service.gmail_pass = "test_password"
 
         self.listing_id = "test_listing_123"
         self.recipient_email = "recipient@example.com"
@@ -87,23 +89,6 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
         self.patcher_mimemultipart.stop()
         self.patcher_mimetext.stop()
         self.patcher_mimeimage.stop()
-        try:
-            if self.email_service._smtp and self.email_service._smtp.is_connected:
-                original_side_effect = None
-                if hasattr(self.email_service._smtp.quit, "side_effect_temp_removed"):
-                    original_side_effect = self.email_service._smtp.quit.side_effect
-                    self.email_service._smtp.quit.side_effect = None
-
-                await self.email_service._smtp.quit()
-
-                if original_side_effect:
-                    self.email_service._smtp.quit.side_effect = original_side_effect
-                    delattr(self.email_service._smtp.quit, "side_effect_temp_removed")
-
-        except Exception:
-            pass
-        finally:
-            self.email_service._smtp = None
 
     async def test_get_listing_data_success(self):
         mock_listing_obj = MockListingData(self.mock_listing_details_dict_full)
@@ -119,77 +104,6 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(ValueError):
             await self.email_service.get_listing_data(self.listing_id)
 
-    @patch("app.application.interfaces.services.email_service.aiosmtplib.SMTP")
-    async def test_get_smtp_conn_new_connection_success(self, mock_smtp_class):
-        mock_smtp_instance = AsyncMock()
-        mock_smtp_instance.is_connected = False
-        mock_smtp_class.return_value = mock_smtp_instance
-        self.email_service._smtp = None
-        smtp_conn = await self.email_service.get_smtp_conn()
-        mock_smtp_class.assert_called_once_with(
-            hostname=self.email_service.smtp_srv_addr,
-            port=self.email_service.smtp_srv_port,
-        )
-        mock_smtp_instance.connect.assert_called_once()
-        mock_smtp_instance.login.assert_called_once_with(
-            self.email_service.gmail_addr, self.email_service.gmail_pass
-        )
-        self.assertIs(smtp_conn, mock_smtp_instance)
-
-    @patch("app.application.interfaces.services.email_service.aiosmtplib.SMTP")
-    async def test_get_smtp_conn_new_connection_connect_fails(self, mock_smtp_class):
-        mock_smtp_instance = AsyncMock()
-        mock_smtp_instance.connect.side_effect = aiosmtplib.SMTPConnectError(
-            "Failed to connect"
-        )
-        mock_smtp_class.return_value = mock_smtp_instance
-        self.email_service._smtp = None
-        with self.assertRaises(aiosmtplib.SMTPConnectError):
-            await self.email_service.get_smtp_conn()
-        mock_smtp_instance.login.assert_not_called()
-
-    @patch("app.application.interfaces.services.email_service.aiosmtplib.SMTP")
-    async def test_get_smtp_conn_new_connection_login_fails(self, mock_smtp_class):
-        mock_smtp_instance = AsyncMock()
-        mock_smtp_instance.is_connected = False
-        mock_smtp_instance.login.side_effect = aiosmtplib.SMTPAuthenticationError(
-            535, "Login failed"
-        )
-        mock_smtp_class.return_value = mock_smtp_instance
-        self.email_service._smtp = None
-        with self.assertRaises(aiosmtplib.SMTPAuthenticationError):
-            await self.email_service.get_smtp_conn()
-        mock_smtp_instance.connect.assert_called_once()
-
-    async def test_get_smtp_conn_existing_connected(self):
-        mock_existing_smtp = AsyncMock()
-        mock_existing_smtp.is_connected = True
-        self.email_service._smtp = mock_existing_smtp
-        smtp_conn = await self.email_service.get_smtp_conn()
-        self.assertIs(smtp_conn, mock_existing_smtp)
-        mock_existing_smtp.connect.assert_not_called()
-
-    @patch("app.application.interfaces.services.email_service.aiosmtplib.SMTP")
-    async def test_get_smtp_conn_existing_not_connected_reconnects(
-        self, mock_smtp_class_reconnect
-    ):
-        mock_old_smtp_instance = AsyncMock()
-        mock_old_smtp_instance.is_connected = False
-        self.email_service._smtp = mock_old_smtp_instance
-
-        mock_new_smtp_instance = AsyncMock()
-        mock_smtp_class_reconnect.return_value = mock_new_smtp_instance
-
-        smtp_conn = await self.email_service.get_smtp_conn()
-
-        mock_smtp_class_reconnect.assert_called_once_with(
-            hostname=self.email_service.smtp_srv_addr,
-            port=self.email_service.smtp_srv_port,
-        )
-        mock_new_smtp_instance.connect.assert_called_once()
-        mock_new_smtp_instance.login.assert_called_once()
-        self.assertIs(smtp_conn, mock_new_smtp_instance)
-
     async def common_send_email_setup_mocks(self):
         self.mock_listing_repo.get_single_listing.return_value = MockListingData(
             self.mock_listing_details_dict_full
@@ -197,12 +111,9 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
         self.mock_graph_service.generate_graph_buffer.return_value = io.BytesIO(
             self.mock_graph_image_bytes
         )
-        return AsyncMock()
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_fetches_listing_and_graph(self, mock_get_smtp_conn):
+    async def test_send_email_fetches_listing_and_graph(self):
         await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = AsyncMock()
 
         await self.email_service.send_email(
             self.recipient_email, self.email_subject, self.listing_id
@@ -212,10 +123,8 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
         )
         self.mock_graph_service.generate_graph_buffer.assert_called_once_with()
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_prepares_correct_template_data(self, mock_get_smtp_conn):
+    async def test_send_email_prepares_correct_template_data(self):
         await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = AsyncMock()
 
         await self.email_service.send_email(
             self.recipient_email, self.email_subject, self.listing_id
@@ -246,12 +155,8 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
                 f"Template data for '{key}' mismatch",
             )
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_constructs_mime_multipart_correctly_single_recipient(
-        self, mock_get_smtp_conn
-    ):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_constructs_mime_multipart_correctly_single_recipient(self):
+        await self.common_send_email_setup_mocks()
 
         await self.email_service.send_email(
             self.recipient_email, self.email_subject, self.listing_id
@@ -266,12 +171,8 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
             "Subject", self.email_subject
         )
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_constructs_mime_multipart_correctly_multiple_recipients(
-        self, mock_get_smtp_conn
-    ):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_constructs_mime_multipart_correctly_multiple_recipients(self):
+        await self.common_send_email_setup_mocks()
         recipients = ["r1@example.com", "r2@example.com"]
 
         await self.email_service.send_email(
@@ -281,10 +182,8 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
             "To", "r1@example.com, r2@example.com"
         )
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_attaches_mime_text(self, mock_get_smtp_conn):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_attaches_mime_text(self):
+        await self.common_send_email_setup_mocks()
 
         await self.email_service.send_email(
             self.recipient_email, self.email_subject, self.listing_id
@@ -295,10 +194,8 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
         )
         self.mock_multipart_msg.attach.assert_any_call(self.mock_mime_text)
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_attaches_mime_image(self, mock_get_smtp_conn):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_attaches_mime_image(self):
+        await self.common_send_email_setup_mocks()
 
         await self.email_service.send_email(
             self.recipient_email, self.email_subject, self.listing_id
@@ -311,36 +208,28 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
         )
         self.mock_multipart_msg.attach.assert_any_call(self.mock_mime_image)
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_smtp_send_and_quit_successful(self, mock_get_smtp_conn):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_sends_through_pool(self):
+        await self.common_send_email_setup_mocks()
 
         response = await self.email_service.send_email(
             self.recipient_email, self.email_subject, self.listing_id
         )
 
-        mock_get_smtp_conn.assert_called_once()
-        mock_smtp_conn.send_message.assert_called_once_with(self.mock_multipart_msg)
-        mock_smtp_conn.quit.assert_called_once()
+        self.mock_smtp_pool.send_message.assert_called_once_with(
+            self.mock_multipart_msg
+        )
         self.assertEqual(response, {"response": "email sent successfully"})
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_handles_listing_data_fetch_failure(
-        self, mock_get_smtp_conn
-    ):
+    async def test_send_email_handles_listing_data_fetch_failure(self):
         self.mock_listing_repo.get_single_listing.side_effect = ValueError("Repo error")
         with self.assertRaises(ValueError):
             await self.email_service.send_email(
                 self.recipient_email, self.email_subject, self.listing_id
             )
         self.mock_graph_service.generate_graph_buffer.assert_not_called()
-        mock_get_smtp_conn.assert_not_called()
+        self.mock_smtp_pool.send_message.assert_not_called()
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_handles_graph_generation_failure(
-        self, mock_get_smtp_conn
-    ):
+    async def test_send_email_handles_graph_generation_failure(self):
         self.mock_listing_repo.get_single_listing.return_value = MockListingData(
             self.mock_listing_details_dict_full
         )
@@ -351,91 +240,62 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
             await self.email_service.send_email(
                 self.recipient_email, self.email_subject, self.listing_id
             )
-        mock_get_smtp_conn.assert_not_called()
+        self.mock_smtp_pool.send_message.assert_not_called()
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_handles_template_render_failure(self, mock_get_smtp_conn):
+    async def test_send_email_handles_template_render_failure(self):
         await self.common_send_email_setup_mocks()
         self.mock_render_async.side_effect = Exception("Template render error")
         with self.assertRaises(Exception):
             await self.email_service.send_email(
                 self.recipient_email, self.email_subject, self.listing_id
             )
-        mock_get_smtp_conn.assert_not_called()
+        self.mock_smtp_pool.send_message.assert_not_called()
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_handles_get_smtp_conn_failure_during_send(
-        self, mock_get_smtp_conn
-    ):
+    async def test_send_email_handles_connect_failure(self):
         await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.side_effect = aiosmtplib.SMTPException(
+        self.mock_smtp_pool.send_message.side_effect = aiosmtplib.SMTPConnectError(
             "Cannot connect for send"
         )
 
-        response = await self.email_service.send_email(
-            self.recipient_email, self.email_subject, self.listing_id
-        )
-        self.assertIsNone(response)
-        self.assertIsNone(self.email_service._smtp)
-
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_handles_smtp_send_message_failure(
-        self, mock_get_smtp_conn
-    ):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_smtp_conn.send_message.side_effect = aiosmtplib.SMTPServerDisconnected(
-            "Server disconnected"
-        )
-        mock_get_smtp_conn.return_value = mock_smtp_conn
-        self.email_service._smtp = mock_smtp_conn
-
-        response = await self.email_service.send_email(
-            self.recipient_email, self.email_subject, self.listing_id
-        )
+        with self.assertLogs(
+            "app.application.interfaces.services.email_service", "ERROR"
+        ):
+            response = await self.email_service.send_email(
+                self.recipient_email, self.email_subject, self.listing_id
+            )
         self.assertIsNone(response)
-        self.assertIsNone(
-            self.email_service._smtp, "SMTP connection should be reset on send failure."
-        )
-        mock_smtp_conn.quit.assert_not_called()
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_handles_smtp_quit_failure_after_send(
-        self, mock_get_smtp_conn
-    ):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_smtp_conn.quit.side_effect = aiosmtplib.SMTPException("Quit failed")
-        mock_get_smtp_conn.return_value = mock_smtp_conn
-        self.email_service._smtp = mock_smtp_conn
-
-        response = await self.email_service.send_email(
-            self.recipient_email, self.email_subject, self.listing_id
+    async def test_send_email_handles_smtp_send_message_failure(self):
+        await self.common_send_email_setup_mocks()
+        self.mock_smtp_pool.send_message.side_effect = (
+            aiosmtplib.SMTPServerDisconnected("Server disconnected")
         )
 
+        with self.assertLogs(
+            "app.application.interfaces.services.email_service", "ERROR"
+        ):
+            response = await self.email_service.send_email(
+                self.recipient_email, self.email_subject, self.listing_id
+            )
         self.assertIsNone(response)
-        self.assertIsNone(self.email_service._smtp)
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_empty_recipient_string(self, mock_get_smtp_conn):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_empty_recipient_string(self):
+        await self.common_send_email_setup_mocks()
 
         await self.email_service.send_email(
             to="", subject="Empty To", listing_id=self.listing_id
         )
         self.mock_multipart_msg.__setitem__.assert_any_call("To", "")
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_empty_recipient_list(self, mock_get_smtp_conn):
-        mock_smtp_conn = await self.common_send_email_setup_mocks()
-        mock_get_smtp_conn.return_value = mock_smtp_conn
+    async def test_send_email_empty_recipient_list(self):
+        await self.common_send_email_setup_mocks()
 
         await self.email_service.send_email(
             to=[], subject="Empty To List", listing_id=self.listing_id
         )
         self.mock_multipart_msg.__setitem__.assert_any_call("To", "")
 
-    @patch.object(EmailService, "get_smtp_conn", new_callable=AsyncMock)
-    async def test_send_email_listing_data_missing_keys(self, mock_get_smtp_conn):
+    async def test_send_email_listing_data_missing_keys(self):
         incomplete_listing_data = self.mock_listing_details_dict_full.copy()
         del incomplete_listing_data["street"]
         self.mock_listing_repo.get_single_listing.return_value = MockListingData(
@@ -451,37 +311,9 @@ class TestEmailService(unittest.IsolatedAsyncioTestCase):
             )
         self.mock_render_async.assert_not_called()
 
-    async def test_disconnect_when_connected_quits_and_resets(self):
-        mock_smtp = AsyncMock()
-        mock_smtp.is_connected = True
-        self.email_service._smtp = mock_smtp
+    async def test_disconnect_closes_pool(self):
         await self.email_service.disconnect()
-        mock_smtp.quit.assert_called_once()
-        self.assertIsNone(self.email_service._smtp)
-
-    async def test_disconnect_when_not_connected_does_nothing(self):
-        mock_smtp = AsyncMock()
-        mock_smtp.is_connected = False
-        self.email_service._smtp = mock_smtp
-        await self.email_service.disconnect()
-        mock_smtp.quit.assert_not_called()
-        self.assertIs(self.email_service._smtp, mock_smtp)
-
-    async def test_disconnect_when_smtp_is_none(self):
-        self.email_service._smtp = None
-        await self.email_service.disconnect()
-
-    async def test_disconnect_handles_quit_exception(self):
-        mock_smtp = AsyncMock()
-        mock_smtp.is_connected = True
-        quit_error = aiosmtplib.SMTPException("Quit error")
-        mock_smtp.quit.side_effect = quit_error
-        self.email_service._smtp = mock_smtp
-
-        await self.email_service.disconnect()
-
-        mock_smtp.quit.assert_called_once()
-        self.assertIsNone(self.email_service._smtp)
+        self.mock_smtp_pool.close.assert_called_once_with()
 
 
 if __name__ == "__main__":
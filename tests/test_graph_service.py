@@ -1,144 +1,156 @@
+import asyncio
 import io
+import multiprocessing
+import threading
+import time
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import ANY, AsyncMock, patch
 
-import numpy as np
 import pandas as pd
+from sqlalchemy.dialects import postgresql
 
-from app.application.interfaces.services.graph_service import GraphService
+from app.application.interfaces.services.graph_service import (
+    GraphService,
+    render_graph,
+)
+from app.domain.dtos.price_per_area_dto import MonthlyPricePerAreaDTO
+from app.infrastructure.repositories.listing_repository import (
+    monthly_price_per_area_query,
+)
+from app.infrastructure.workers import WorkerPool, WorkerPoolFullError
 
 
-class MockListingDB:
-    def __init__(self, price: float, area: float, created_at: datetime):
-        self.price = price
-        self.area = area
-        self.created_at = created_at
+def axes(mock_figure):
+    return mock_figure.return_value.subplots.return_value
 
-    def model_dump(self, include=None):
-        return {"price": self.price, "area": self.area, "created_at": self.created_at}
+
+def monthly(created_at: datetime, price: float) -> MonthlyPricePerAreaDTO:
+    return MonthlyPricePerAreaDTO(
+        year=created_at.year, month=created_at.month, price=price
+    )
 
 
 class TestGraphServiceExpanded(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.mock_listing_repo = AsyncMock()
-        self.graph_service = GraphService(repository=self.mock_listing_repo)
+        self.render_pool = WorkerPool(ThreadPoolExecutor, max_workers=1)
+        self.addCleanup(self.render_pool.shutdown)
+        self.graph_service = GraphService(
+            repository=self.mock_listing_repo, render_pool=self.render_pool
+        )
 
         self.mock_listings_data_multi_year = [
-            MockListingDB(price=100000, area=50, created_at=datetime(2022, 1, 15)),
-            MockListingDB(price=120000, area=60, created_at=datetime(2022, 1, 20)),
-            MockListingDB(price=110000, area=55, created_at=datetime(2022, 2, 10)),
-            MockListingDB(price=150000, area=70, created_at=datetime(2023, 3, 5)),
-            MockListingDB(price=160000, area=75, created_at=datetime(2023, 3, 12)),
-            MockListingDB(price=140000, area=65, created_at=datetime(2023, 4, 1)),
-        ]
-        self.single_listing_data = [
-            MockListingDB(price=200000, area=100, created_at=datetime(2023, 5, 10))
+            monthly(datetime(2022, 1, 1), price=2000),
+            monthly(datetime(2022, 2, 1), price=2000),
+            monthly(datetime(2023, 3, 1), price=2138),
+            monthly(datetime(2023, 4, 1), price=2154),
         ]
+        self.single_listing_data = [monthly(datetime(2023, 5, 1), price=2000)]
 
     def assert_common_plot_calls(
-        self, mock_sns, mock_plt, expected_title, is_all_years_plot=True
+        self, mock_sns, mock_figure, expected_title, is_all_years_plot=True
     ):
         mock_sns.set_theme.assert_called_once_with("poster")
-        mock_plt.figure.assert_called_once_with(figsize=(12, 7), dpi=100)
-        mock_sns.relplot.assert_called_once()
+        mock_figure.assert_called_once_with(figsize=(12, 6), dpi=100)
+        mock_sns.lineplot.assert_called_once()
 
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         self.assertEqual(call_kwargs["x"], "month")
         self.assertEqual(call_kwargs["y"], "price")
-        self.assertEqual(call_kwargs["kind"], "line")
+        self.assertIs(call_kwargs["ax"], axes(mock_figure))
         if is_all_years_plot:
             self.assertEqual(call_kwargs["hue"], "year")
         else:
             self.assertNotIn("hue", call_kwargs)
 
-        mock_plt.title.assert_called_once_with(expected_title)
-        mock_plt.xlim.assert_called_once_with(1, 12)
-        mock_plt.savefig.assert_called_once_with(ANY, format="png")
-        mock_plt.close.assert_called_once_with("all")
+        axes(mock_figure).set_title.assert_called_once_with(expected_title)
+        axes(mock_figure).set_xlim.assert_called_once_with(1, 12)
+        mock_figure.return_value.savefig.assert_called_once_with(ANY, format="png")
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_all_years_repo_and_initial_plot_setup(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_all_years_repo_and_initial_plot_setup(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        self.mock_listing_repo.get_listings.assert_called_once()
+        self.mock_listing_repo.get_monthly_price_per_area.assert_called_once()
         mock_sns.set_theme.assert_called_once_with("poster")
-        mock_plt.figure.assert_called_once_with(figsize=(12, 7), dpi=100)
+        mock_figure.assert_called_once_with(figsize=(12, 6), dpi=100)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_all_years_relplot_data_structure(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_all_years_lineplot_data_structure(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        mock_sns.relplot.assert_called_once()
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        mock_sns.lineplot.assert_called_once()
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         actual_df_arg = call_kwargs["data"]
         self.assertIsInstance(actual_df_arg, pd.DataFrame)
         self.assertIn("price", actual_df_arg.columns)
         self.assertEqual(actual_df_arg.index.names, ["year", "month"])
         self.assertFalse(actual_df_arg.empty)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_all_years_relplot_arguments(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_all_years_lineplot_arguments(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         self.assertEqual(call_kwargs["x"], "month")
         self.assertEqual(call_kwargs["y"], "price")
-        self.assertEqual(call_kwargs["kind"], "line")
         self.assertEqual(call_kwargs["hue"], "year")
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_all_years_plot_finalization(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_all_years_plot_finalization(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        mock_plt.title.assert_called_once_with("All years")
-        mock_plt.xlim.assert_called_once_with(1, 12)
-        mock_plt.savefig.assert_called_once_with(ANY, format="png")
-        mock_plt.close.assert_called_once_with("all")
+        axes(mock_figure).set_title.assert_called_once_with("All years")
+        axes(mock_figure).set_xlim.assert_called_once_with(1, 12)
+        mock_figure.return_value.savefig.assert_called_once_with(ANY, format="png")
 
     async def test_all_years_return_type(self):
-        self.mock_listing_repo.get_listings.return_value = (
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         with (
-            patch("app.application.interfaces.services.graph_service.plt"),
+            patch("app.application.interfaces.services.graph_service.Figure"),
             patch("app.application.interfaces.services.graph_service.sns"),
         ):
             buffer = await self.graph_service.generate_graph_buffer(year_or_all=None)
         self.assertIsInstance(buffer, io.BytesIO)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_specific_year_repo_and_initial_plot_setup(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_specific_year_repo_and_initial_plot_setup(
+        self, mock_sns, mock_figure
+    ):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=2022)
-        self.mock_listing_repo.get_listings.assert_called_once()
+        self.mock_listing_repo.get_monthly_price_per_area.assert_called_once()
         mock_sns.set_theme.assert_called_once_with("poster")
-        mock_plt.figure.assert_called_once_with(figsize=(12, 7), dpi=100)
+        mock_figure.assert_called_once_with(figsize=(12, 6), dpi=100)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_specific_year_relplot_data_structure(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_specific_year_lineplot_data_structure(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=2022)
-        mock_sns.relplot.assert_called_once()
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        mock_sns.lineplot.assert_called_once()
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         actual_df_arg = call_kwargs["data"]
         self.assertIsInstance(actual_df_arg, pd.DataFrame)
         self.assertIn("price", actual_df_arg.columns)
@@ -146,94 +158,94 @@ class TestGraphServiceExpanded(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(actual_df_arg.empty)
         self.assertEqual(len(actual_df_arg), 2)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_specific_year_relplot_arguments(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_specific_year_lineplot_arguments(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=2022)
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         self.assertEqual(call_kwargs["x"], "month")
         self.assertEqual(call_kwargs["y"], "price")
-        self.assertEqual(call_kwargs["kind"], "line")
         self.assertNotIn("hue", call_kwargs)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_specific_year_plot_finalization(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_specific_year_plot_finalization(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=2022)
-        mock_plt.title.assert_called_once_with("2022")
-        mock_plt.xlim.assert_called_once_with(1, 12)
-        mock_plt.savefig.assert_called_once_with(ANY, format="png")
-        mock_plt.close.assert_called_once_with("all")
+        axes(mock_figure).set_title.assert_called_once_with("2022")
+        axes(mock_figure).set_xlim.assert_called_once_with(1, 12)
+        mock_figure.return_value.savefig.assert_called_once_with(ANY, format="png")
 
     async def test_specific_year_return_type(self):
-        self.mock_listing_repo.get_listings.return_value = (
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         with (
-            patch("app.application.interfaces.services.graph_service.plt"),
+            patch("app.application.interfaces.services.graph_service.Figure"),
             patch("app.application.interfaces.services.graph_service.sns"),
         ):
             buffer = await self.graph_service.generate_graph_buffer(year_or_all=2022)
         self.assertIsInstance(buffer, io.BytesIO)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_year_not_exists_defaults_to_all_years_plot(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_year_not_exists_defaults_to_all_years_plot(
+        self, mock_sns, mock_figure
+    ):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=2025)
         self.assert_common_plot_calls(
-            mock_sns, mock_plt, "All years", is_all_years_plot=True
+            mock_sns, mock_figure, "All years", is_all_years_plot=True
         )
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_year_not_exists_relplot_data_structure(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = (
+    async def test_year_not_exists_lineplot_data_structure(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=2025)
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         actual_df_arg = call_kwargs["data"]
         self.assertIsInstance(actual_df_arg, pd.DataFrame)
         self.assertEqual(actual_df_arg.index.names, ["year", "month"])
 
     async def test_year_not_exists_return_type(self):
-        self.mock_listing_repo.get_listings.return_value = (
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         with (
-            patch("app.application.interfaces.services.graph_service.plt"),
+            patch("app.application.interfaces.services.graph_service.Figure"),
             patch("app.application.interfaces.services.graph_service.sns"),
         ):
             buffer = await self.graph_service.generate_graph_buffer(year_or_all=2025)
         self.assertIsInstance(buffer, io.BytesIO)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_no_listings_setup_calls(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = []
+    async def test_no_listings_setup_calls(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = []
         await self.graph_service.generate_graph_buffer(year_or_all=None)
 
-        self.mock_listing_repo.get_listings.assert_called_once()
+        self.mock_listing_repo.get_monthly_price_per_area.assert_called_once()
         mock_sns.set_theme.assert_called_once_with("poster")
-        mock_plt.figure.assert_called_once_with(figsize=(12, 7), dpi=100)
+        mock_figure.assert_called_once_with(figsize=(12, 6), dpi=100)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_no_listings_relplot_data_structure(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = []
+    async def test_no_listings_lineplot_data_structure(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = []
         await self.graph_service.generate_graph_buffer(year_or_all=None)
 
-        mock_sns.relplot.assert_called_once()
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        mock_sns.lineplot.assert_called_once()
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         actual_df_arg = call_kwargs["data"]
         self.assertIsInstance(actual_df_arg, pd.DataFrame)
         self.assertTrue(
@@ -248,176 +260,298 @@ class TestGraphServiceExpanded(unittest.IsolatedAsyncioTestCase):
         if isinstance(actual_df_arg.index, pd.MultiIndex):
             self.assertEqual(actual_df_arg.index.names, ["year", "month"])
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_no_listings_plot_finalization(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = []
+    async def test_no_listings_plot_finalization(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = []
         await self.graph_service.generate_graph_buffer(year_or_all=None)
 
         self.assert_common_plot_calls(
-            mock_sns, mock_plt, "All years", is_all_years_plot=True
+            mock_sns, mock_figure, "All years", is_all_years_plot=True
         )
 
     async def test_no_listings_return_type(self):
-        self.mock_listing_repo.get_listings.return_value = []
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = []
         with (
-            patch("app.application.interfaces.services.graph_service.plt"),
+            patch("app.application.interfaces.services.graph_service.Figure"),
             patch("app.application.interfaces.services.graph_service.sns"),
         ):
             buffer = await self.graph_service.generate_graph_buffer(year_or_all=None)
         self.assertIsInstance(buffer, io.BytesIO)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_single_listing_repo_and_initial_plot_setup(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = self.single_listing_data
+    async def test_single_listing_repo_and_initial_plot_setup(
+        self, mock_sns, mock_figure
+    ):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.single_listing_data
+        )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        self.mock_listing_repo.get_listings.assert_called_once()
+        self.mock_listing_repo.get_monthly_price_per_area.assert_called_once()
         mock_sns.set_theme.assert_called_once_with("poster")
-        mock_plt.figure.assert_called_once_with(figsize=(12, 7), dpi=100)
+        mock_figure.assert_called_once_with(figsize=(12, 6), dpi=100)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_single_listing_relplot_data_structure(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = self.single_listing_data
+    async def test_single_listing_lineplot_data_structure(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.single_listing_data
+        )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        mock_sns.relplot.assert_called_once()
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        mock_sns.lineplot.assert_called_once()
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         actual_df_arg = call_kwargs["data"]
         self.assertIsInstance(actual_df_arg, pd.DataFrame)
         self.assertIn("price", actual_df_arg.columns)
         self.assertEqual(actual_df_arg.index.names, ["year", "month"])
         self.assertEqual(len(actual_df_arg), 1)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_single_listing_plot_finalization(self, mock_sns, mock_plt):
-        self.mock_listing_repo.get_listings.return_value = self.single_listing_data
+    async def test_single_listing_plot_finalization(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.single_listing_data
+        )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        mock_plt.title.assert_called_once_with("All years")
-        mock_plt.xlim.assert_called_once_with(1, 12)
-        mock_plt.savefig.assert_called_once_with(ANY, format="png")
+        axes(mock_figure).set_title.assert_called_once_with("All years")
+        axes(mock_figure).set_xlim.assert_called_once_with(1, 12)
+        mock_figure.return_value.savefig.assert_called_once_with(ANY, format="png")
 
     async def test_single_listing_return_type(self):
-        self.mock_listing_repo.get_listings.return_value = self.single_listing_data
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.single_listing_data
+        )
         with (
-            patch("app.application.interfaces.services.graph_service.plt"),
+            patch("app.application.interfaces.services.graph_service.Figure"),
             patch("app.application.interfaces.services.graph_service.sns"),
         ):
             buffer = await self.graph_service.generate_graph_buffer(year_or_all=None)
         self.assertIsInstance(buffer, io.BytesIO)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
-    @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_data_with_zero_area_leads_to_inf_price(self, mock_sns, mock_plt):
-        data_with_zero_area = [
-            MockListingDB(price=100000, area=0, created_at=datetime(2022, 1, 15))
-        ]
-        self.mock_listing_repo.get_listings.return_value = data_with_zero_area
-
-        await self.graph_service.generate_graph_buffer(year_or_all=None)
-
-        mock_sns.relplot.assert_called_once()
-        call_args, call_kwargs = mock_sns.relplot.call_args
-        df_arg = call_kwargs["data"]
-        self.assertTrue(np.isinf(df_arg["price"].iloc[0]))
-
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_data_with_negative_area_leads_to_negative_price(
-        self, mock_sns, mock_plt
+    async def test_data_with_negative_price_per_area(
+        self, mock_sns, mock_figure
     ):
-        data_with_neg_area = [
-            MockListingDB(price=100000, area=-50, created_at=datetime(2022, 1, 15))
-        ]
-        self.mock_listing_repo.get_listings.return_value = data_with_neg_area
+        data_with_neg_area = [monthly(datetime(2022, 1, 1), price=-2000)]
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            data_with_neg_area
+        )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
-        mock_sns.relplot.assert_called_once()
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        mock_sns.lineplot.assert_called_once()
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         df_arg = call_kwargs["data"]
         self.assertTrue(df_arg["price"].iloc[0] < 0)
 
     async def test_data_with_malformed_date_string(self):
         pass
 
-    @patch("app.application.interfaces.services.graph_service.plt")
-    @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_data_missing_required_key_from_model_dump(self, mock_sns, mock_plt):
-        class FaultyMockListingDB:
-            def model_dump(self, include=None):
-                return {"price": 100, "created_at": datetime(2022, 1, 1)}
-
-        self.mock_listing_repo.get_listings.return_value = [FaultyMockListingDB()]
-        with self.assertRaises(KeyError):
-            await self.graph_service.generate_graph_buffer(year_or_all=None)
-
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
     async def test_graph_service_handles_repository_raising_general_exception(
-        self, mock_sns, mock_plt
+        self, mock_sns, mock_figure
     ):
-        self.mock_listing_repo.get_listings.side_effect = Exception(
+        self.mock_listing_repo.get_monthly_price_per_area.side_effect = Exception(
             "Unexpected DB Error"
         )
         with self.assertRaisesRegex(Exception, "Unexpected DB Error"):
             await self.graph_service.generate_graph_buffer(year_or_all=None)
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_plotting_functions_called_in_order(self, mock_sns, mock_plt):
+    async def test_plotting_functions_called_in_order(self, mock_sns, mock_figure):
         manager = unittest.mock.Mock()
         manager.attach_mock(mock_sns.set_theme, "set_theme")
-        manager.attach_mock(mock_plt.figure, "figure")
-        manager.attach_mock(mock_sns.relplot, "relplot")
-        manager.attach_mock(mock_plt.title, "title")
-        manager.attach_mock(mock_plt.xlim, "xlim")
-        manager.attach_mock(mock_plt.savefig, "savefig")
-        manager.attach_mock(mock_plt.close, "close")
-
-        self.mock_listing_repo.get_listings.return_value = (
+        manager.attach_mock(mock_figure, "figure")
+        manager.attach_mock(mock_sns.lineplot, "lineplot")
+        manager.attach_mock(axes(mock_figure).set_title, "title")
+        manager.attach_mock(axes(mock_figure).set_xlim, "xlim")
+        manager.attach_mock(mock_figure.return_value.savefig, "savefig")
+
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
             self.mock_listings_data_multi_year
         )
         await self.graph_service.generate_graph_buffer(year_or_all=None)
 
         mock_sns.set_theme.assert_called_once()
-        mock_plt.figure.assert_called_once()
-        mock_sns.relplot.assert_called_once()
-        mock_plt.title.assert_called_once()
-        mock_plt.xlim.assert_called_once()
-        mock_plt.savefig.assert_called_once()
-        mock_plt.close.assert_called_once()
-
-    @patch("app.application.interfaces.services.graph_service.plt")
+        mock_figure.assert_called_once()
+        mock_sns.lineplot.assert_called_once()
+        axes(mock_figure).set_title.assert_called_once()
+        axes(mock_figure).set_xlim.assert_called_once()
+        mock_figure.return_value.savefig.assert_called_once()
+
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_data_with_only_one_year_multiple_months(self, mock_sns, mock_plt):
+    async def test_data_with_only_one_year_multiple_months(self, mock_sns, mock_figure):
         one_year_data = [
-            MockListingDB(price=100, area=10, created_at=datetime(2023, 1, 1)),
-            MockListingDB(price=120, area=10, created_at=datetime(2023, 2, 1)),
-            MockListingDB(price=110, area=10, created_at=datetime(2023, 3, 1)),
+            monthly(datetime(2023, 1, 1), price=10),
+            monthly(datetime(2023, 2, 1), price=12),
+            monthly(datetime(2023, 3, 1), price=11),
         ]
-        self.mock_listing_repo.get_listings.return_value = one_year_data
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = one_year_data
         await self.graph_service.generate_graph_buffer(year_or_all=None)
 
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         df_arg = call_kwargs["data"]
         self.assertEqual(df_arg.index.get_level_values("year").nunique(), 1)
         self.assertEqual(len(df_arg), 3)
         self.assertEqual(call_kwargs["hue"], "year")
 
-    @patch("app.application.interfaces.services.graph_service.plt")
+    @patch("app.application.interfaces.services.graph_service.Figure")
     @patch("app.application.interfaces.services.graph_service.sns")
-    async def test_data_with_all_prices_zero(self, mock_sns, mock_plt):
+    async def test_data_with_all_prices_zero(self, mock_sns, mock_figure):
         zero_price_data = [
-            MockListingDB(price=0, area=50, created_at=datetime(2022, 1, 15)),
-            MockListingDB(price=0, area=60, created_at=datetime(2022, 2, 20)),
+            monthly(datetime(2022, 1, 1), price=0),
+            monthly(datetime(2022, 2, 1), price=0),
         ]
-        self.mock_listing_repo.get_listings.return_value = zero_price_data
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = zero_price_data
         await self.graph_service.generate_graph_buffer(year_or_all=None)
 
-        call_args, call_kwargs = mock_sns.relplot.call_args
+        call_args, call_kwargs = mock_sns.lineplot.call_args
         df_arg = call_kwargs["data"]
         self.assertTrue((df_arg["price"] == 0).all())
 
 
+    def test_monthly_price_per_area_is_aggregated_in_sql(self):
+        query = monthly_price_per_area_query()
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        self.assertIn("avg(listings.price /", sql)
+        self.assertIn("GROUP BY", sql)
+        self.assertIn("listings.area !=", sql)
+
+
+    @patch("app.application.interfaces.services.graph_service.Figure")
+    @patch("app.application.interfaces.services.graph_service.sns")
+    async def test_unchanged_data_reuses_rendered_graph(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.mock_listings_data_multi_year
+        )
+
+        first = await self.graph_service.get_graph(year_or_all=None)
+        second = await self.graph_service.get_graph(year_or_all=None)
+
+        self.assertEqual(first.etag, second.etag)
+        mock_figure.return_value.savefig.assert_called_once()
+        self.assertEqual(self.graph_service.cache_stats()["hits"], 1)
+
+    @patch("app.application.interfaces.services.graph_service.Figure")
+    @patch("app.application.interfaces.services.graph_service.sns")
+    async def test_changed_data_renders_new_graph(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.mock_listings_data_multi_year
+        )
+        first = await self.graph_service.get_graph(year_or_all=None)
+
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.mock_listings_data_multi_year + self.single_listing_data
+        )
+        second = await self.graph_service.get_graph(year_or_all=None)
+
+        self.assertNotEqual(first.etag, second.etag)
+        self.assertEqual(mock_figure.return_value.savefig.call_count, 2)
+
+    @patch("app.application.interfaces.services.graph_service.Figure")
+    @patch("app.application.interfaces.services.graph_service.sns")
+    async def test_unknown_year_shares_all_years_graph(self, mock_sns, mock_figure):
+        self.mock_listing_repo.get_monthly_price_per_area.return_value = (
+            self.mock_listings_data_multi_year
+        )
+
+        all_years = await self.graph_service.get_graph(year_or_all=None)
+        unknown_year = await self.graph_service.get_graph(year_or_all=2025)
+        single_year = await self.graph_service.get_graph(year_or_all=2022)
+
+        self.assertEqual(all_years.etag, unknown_year.etag)
+        self.assertNotEqual(all_years.etag, single_year.etag)
+
+
+    async def test_render_graph_produces_png(self):
+        content = render_graph(self.mock_listings_data_multi_year, year_or_all=2022)
+
+        self.assertTrue(content.startswith(b"\x89PNG"))
+
+
+class TestGraphRenderTimeout(unittest.IsolatedAsyncioTestCase):
+    async def test_timed_out_job_still_occupies_its_worker(self):
+        pool = WorkerPool(ThreadPoolExecutor, max_workers=1, max_queue=1, timeout=0.05)
+        release = threading.Event()
+        self.addCleanup(pool.shutdown)
+        self.addCleanup(release.set)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await pool.run(release.wait)
+
+        self.assertEqual(pool.stats()["timed_out"], 1)
+        self.assertEqual(pool.stats()["active"], 1)
+        waiting = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        self.assertEqual(pool.stats()["queued"], 1)
+        with self.assertRaises(WorkerPoolFullError):
+            await pool.run(release.wait)
+
+        release.set()
+        await waiting
+
+    async def test_timed_out_process_job_recycles_the_pool(self):
+        pool = WorkerPool(
+            ProcessPoolExecutor,
+            max_workers=1,
+            timeout=0.5,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self.addCleanup(pool.shutdown)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 60)
+
+        for _ in range(100):
+            if pool.stats()["active"] == 0:
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual(pool.stats()["active"], 0)
+        self.assertEqual(pool.stats()["recycled"], 1)
+        self.assertEqual(await pool.run(abs, -1), 1)
+
+    def process_pool(self, timeout: float) -> WorkerPool:
+        pool = WorkerPool(
+            ProcessPoolExecutor,
+            max_workers=1,
+            timeout=timeout,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    async def test_time_spent_queued_does_not_count_towards_the_timeout(self):
+        pool = self.process_pool(timeout=1.0)
+        await pool.run(abs, -1)
+
+        results = await asyncio.gather(
+            pool.run(time.sleep, 0.7),
+            pool.run(time.sleep, 0.5),
+            pool.run(abs, -2),
+        )
+
+        self.assertEqual(results, [None, None, 2])
+        self.assertEqual(pool.stats()["timed_out"], 0)
+        self.assertEqual(pool.stats()["recycled"], 0)
+
+    async def test_jobs_queued_behind_a_hung_job_run_on_the_new_pool(self):
+        pool = self.process_pool(timeout=0.5)
+        await pool.run(abs, -1)
+
+        hung, queued = await asyncio.gather(
+            pool.run(time.sleep, 60), pool.run(abs, -2), return_exceptions=True
+        )
+
+        self.assertIsInstance(hung, asyncio.TimeoutError)
+        self.assertEqual(queued, 2)
+        self.assertEqual(pool.stats()["recycled"], 1)
+        # Only the killed job failed, the queued one was not held against it.
+        self.assertEqual(pool.stats()["failed"], 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+import datetime
+import unittest
+from unittest.mock import AsyncMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.application.interfaces.services.listing_service import ListingService
+from app.domain.dtos.filter_dto import FilterDTO
+from app.domain.dtos.sort_options_dto import SortOptions
+from app.infrastructure.models.listing_model import Status, TransactionType
+from app.presentation.api.v1.listing_filter import parse_listing_filter
+
+
+class TestParseListingFilter(unittest.TestCase):
+    def setUp(self):
+        parse_listing_filter.cache_clear()
+
+    def test_single_condition_keeps_legacy_syntax(self):
+        expression = parse_listing_filter("price_gte=1000")
+
+        self.assertEqual(
+            expression.groups,
+            ((FilterDTO(field="price", operator="gte", value=1000),),),
+        )
+
+    def test_and_binds_tighter_than_or(self):
+        expression = parse_listing_filter(
+            "price_gte=1000,area_lte=80.5|status_eq=PENDING"
+        )
+
+        self.assertEqual(
+            expression.groups,
+            (
+                (
+                    FilterDTO(field="price", operator="gte", value=1000),
+                    FilterDTO(field="area", operator="lte", value=80.5),
+                ),
+                (FilterDTO(field="status", operator="eq", value=Status.PENDING),),
+            ),
+        )
+
+    def test_values_are_coerced_to_column_types(self):
+        expression = parse_listing_filter(
+            "transaction_type_in=SELL;Rent,created_at_between=2024-01-01;2024-02-01,"
+            "floor_eq=1"
+        )
+
+        transaction_type, created_at, floor = expression.groups[0]
+        self.assertEqual(
+            transaction_type.value, (TransactionType.SELL, TransactionType.RENT)
+        )
+        self.assertEqual(
+            created_at.value,
+            (datetime.datetime(2024, 1, 1), datetime.datetime(2024, 2, 1)),
+        )
+        self.assertEqual(floor.value, "1")
+
+    def test_rejects_invalid_filters(self):
+        invalid = [
+            "price",
+            "price_gte",
+            "price_approx=1",
+            "secret_eq=1",
+            "search_vector_eq=x",
+            "price_gte=cheap",
+            "price_like=10",
+            "price_between=1;2;3",
+            "status_eq=SOLD",
+            "price_gte=1,",
+        ]
+        for raw_filter in invalid:
+            with self.subTest(raw_filter=raw_filter):
+                with self.assertRaises(ValueError):
+                    parse_listing_filter(raw_filter)
+
+    def test_parse_results_are_cached_by_raw_string(self):
+        first = parse_listing_filter("price_gte=1000,status_eq=AVAILABLE")
+        second = parse_listing_filter("price_gte=1000,status_eq=AVAILABLE")
+
+        self.assertIs(first, second)
+        self.assertEqual(parse_listing_filter.cache_info().hits, 1)
+
+
+class TestListingServiceFilterExpression(unittest.IsolatedAsyncioTestCase):
+    async def test_expression_compiles_into_one_where_clause(self):
+        repository = AsyncMock()
+        repository.get_listings.return_value = []
+        service = ListingService(repository=repository)
+
+        await service.get_listings(
+            sort_options=SortOptions(column=None, order=None),
+            filter=parse_listing_filter(
+                "price_between=1000;2000,title_like=flat|status_in=AVAILABLE;PENDING"
+            ),
+        )
+
+        query = repository.get_listings.call_args.kwargs["query"]
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        self.assertEqual(sql.count("WHERE"), 1)
+        self.assertIn("listings.price BETWEEN", sql)
+        self.assertIn("listings.title LIKE", sql)
+        self.assertIn(" OR listings.status IN", sql)
+
+    async def test_price_per_area_sorts_and_filters_in_sql(self):
+        repository = AsyncMock()
+        repository.get_listings.return_value = []
+        service = ListingService(repository=repository)
+
+        await service.get_listings_page(
+            sort_options=SortOptions(column="price_per_area", order="desc"),
+            filter=parse_listing_filter("price_per_area_lt=2500"),
+            limit=10,
+        )
+
+        query = repository.get_listings.call_args.kwargs["query"]
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        self.assertIn("WHERE listings.price_per_area <", sql)
+        self.assertIn("ORDER BY listings.price_per_area DESC, listings.id DESC", sql)
@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+import unittest
+import uuid
+
+from app.infrastructure.models.listing_model import PropertyType, Status
+from app.presentation.api.v1.listing_formats import (
+    batched,
+    iter_csv_listings,
+    iter_csv_rows,
+    iter_lines,
+    iter_ndjson_listings,
+    iter_ndjson_rows,
+)
+
+LISTING_JSON = (
+    '{"title": "Flat %d", "location": "Springfield", "street": "Evergreen", '
+    '"price": 1000, "area": 50, "property_type": "Apartment", '
+    '"description": "Nice", "transaction_type": "Sell", "floor": "1", '
+    '"num_of_floors": "3", "build_year": "2000", "status": "Available"}'
+)
+
+CSV_HEADER = (
+    "client_id,title,location,street,price,area,property_type,description,"
+    "transaction_type,floor,num_of_floors,build_year,user_id,status\n"
+)
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestListingFormats(unittest.IsolatedAsyncioTestCase):
+    async def test_iter_lines_joins_lines_split_across_chunks(self):
+        lines = await collect(iter_lines(stream(b"first\nsec", b"ond\nth", b"ird")))
+
+        self.assertEqual(lines, ["first\n", "second\n", "third"])
+
+    async def test_iter_lines_handles_multibyte_characters_split_across_chunks(self):
+        encoded = "Łódź\n".encode("utf-8")
+
+        lines = await collect(iter_lines(stream(encoded[:1], encoded[1:])))
+
+        self.assertEqual(lines, ["Łódź\n"])
+
+    async def test_ndjson_listings_are_parsed_and_blank_lines_skipped(self):
+        body = f"{LISTING_JSON % 1}\n\n{LISTING_JSON % 2}\n".encode("utf-8")
+
+        listings = await collect(iter_ndjson_listings(iter_lines(stream(body))))
+
+        self.assertEqual([listing.title for listing in listings], ["Flat 1", "Flat 2"])
+        self.assertEqual(listings[0].property_type, PropertyType.APARTMENT)
+
+    async def test_ndjson_invalid_line_reports_line_number(self):
+        body = f'{LISTING_JSON % 1}\n{{"title": "broken"}}\n'.encode("utf-8")
+
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            await collect(iter_ndjson_listings(iter_lines(stream(body))))
+
+    async def test_csv_listings_support_quoted_multiline_fields(self):
+        body = (
+            CSV_HEADER
+            + ',Flat 1,Springfield,Evergreen,1000,50,Apartment,"Two\n'
+            + 'lines, ""quoted""",Sell,1,3,2000,,Available\n'
+        ).encode("utf-8")
+
+        listings = await collect(iter_csv_listings(iter_lines(stream(body))))
+
+        self.assertEqual(len(listings), 1)
+        self.assertEqual(listings[0].description, 'Two\nlines, "quoted"')
+        self.assertIsNone(listings[0].client_id)
+        self.assertEqual(listings[0].status, Status.AVAILABLE)
+
+    async def test_batched_yields_fixed_size_batches(self):
+        async def numbers():
+            for number in range(5):
+                yield number
+
+        batches = await collect(batched(numbers(), 2))
+
+        self.assertEqual(batches, [[0, 1], [2, 3], [4]])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestListingExportFormats(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.rows = [
+            {
+                "title": "Flat, centre",
+                "status": Status.AVAILABLE,
+                "client_id": None,
+                "id": uuid.UUID(int=1, version=4),
+            },
+            {
+                "title": "House",
+                "status": Status.PENDING,
+                "client_id": None,
+                "id": uuid.UUID(int=2, version=4),
+            },
+        ]
+
+    async def _batches(self):
+        yield self.rows[:1]
+        yield self.rows[1:]
+
+    async def test_ndjson_rows_are_serialised_per_line(self):
+        chunks = [chunk async for chunk in iter_ndjson_rows(self._batches())]
+
+        self.assertEqual(len(chunks), 2)
+        first = json.loads(chunks[0])
+        self.assertEqual(first["status"], "Available")
+        self.assertEqual(first["id"], str(self.rows[0]["id"]))
+
+    async def test_csv_rows_use_api_value_formatting(self):
+        fieldnames = ["title", "status", "client_id", "id"]
+        chunks = [
+            chunk async for chunk in iter_csv_rows(self._batches(), fieldnames)
+        ]
+
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(chunks[0].startswith("title,status,client_id,id\r\n"))
+        records = list(csv.DictReader(io.StringIO("".join(chunks))))
+        self.assertEqual(records[0]["title"], "Flat, centre")
+        self.assertEqual(records[1]["status"], "Pending")
+        self.assertEqual(records[1]["client_id"], "")
+
+    async def test_csv_export_without_rows_still_has_header(self):
+        async def no_batches():
+            return
+            yield
+
+        chunks = [chunk async for chunk in iter_csv_rows(no_batches(), ["id"])]
+
+        self.assertEqual(chunks, ["id\r\n"])
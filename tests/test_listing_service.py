@@ -2,9 +2,26 @@ import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 from unittest.mock import call as mock_call
 
+import datetime
+import json
+import uuid
+
 from pydantic import UUID4
+from pydantic_core import to_json
+from sqlalchemy.dialects import postgresql
 
 from app.application.interfaces.services.listing_service import ListingService
+from app.domain.dtos.listing_cursor_dto import ListingCursor
+from app.domain.dtos.sort_options_dto import SortOptions
+from app.infrastructure.models.listing_model import (
+    PropertyType,
+    Status,
+    TransactionType,
+)
+from app.presentation.schemas.listing_schema import (
+    ListingDB,
+    listing_fields,
+)
 
 
 class MockListingPhoto:
@@ -419,5 +436,265 @@ class TestListingService(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result, [])
 
 
+def make_listing_db(index: int) -> ListingDB:
+    return ListingDB(
+        id=uuid.UUID(int=index, version=4),
+        title=f"Listing {index}",
+        location="Springfield",
+        street="Evergreen Terrace",
+        price=1000 * index,
+        area=50.0,
+        property_type=PropertyType.HOUSE,
+        description="Description",
+        transaction_type=TransactionType.SELL,
+        floor="1",
+        num_of_floors="2",
+        build_year="2000",
+        status=Status.AVAILABLE,
+        created_at=datetime.datetime(2024, 1, index),
+        price_per_area=20.0 * index,
+    )
+
+
+class TestListingServicePagination(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_repository = AsyncMock()
+        self.listing_service = ListingService(repository=self.mock_repository)
+        self.listings = [make_listing_db(i) for i in range(1, 4)]
+
+    def _compiled_query(self):
+        query = self.mock_repository.get_listings.call_args.kwargs["query"]
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    async def test_page_fetches_one_extra_row_and_orders_by_id(self):
+        self.mock_repository.get_listings.return_value = []
+
+        await self.listing_service.get_listings_page(
+            sort_options=SortOptions(column=None, order=None), filter=None, limit=2
+        )
+
+        sql = self._compiled_query()
+        self.assertIn("ORDER BY listings.id ASC", sql)
+        self.assertIn("LIMIT", sql)
+        query = self.mock_repository.get_listings.call_args.kwargs["query"]
+        self.assertEqual(query._limit_clause.value, 3)
+
+    async def test_page_returns_next_cursor_when_more_rows_exist(self):
+        self.mock_repository.get_listings.return_value = self.listings
+
+        page = await self.listing_service.get_listings_page(
+            sort_options=SortOptions(column="price", order="desc"),
+            filter=None,
+            limit=2,
+        )
+
+        self.assertEqual(page.items, self.listings[:2])
+        cursor = ListingCursor.decode(page.next_cursor)
+        self.assertEqual(cursor.column, "price")
+        self.assertEqual(cursor.order, "desc")
+        self.assertEqual(cursor.value, 2000)
+        self.assertEqual(cursor.id, str(self.listings[1].id))
+
+    async def test_last_page_has_no_cursor(self):
+        self.mock_repository.get_listings.return_value = self.listings
+
+        page = await self.listing_service.get_listings_page(
+            sort_options=SortOptions(column=None, order=None), filter=None, limit=3
+        )
+
+        self.assertEqual(len(page.items), 3)
+        self.assertIsNone(page.next_cursor)
+
+    async def test_cursor_adds_keyset_predicate(self):
+        self.mock_repository.get_listings.return_value = []
+        cursor = ListingCursor(
+            column="created_at",
+            order="asc",
+            value=datetime.datetime(2024, 1, 2).isoformat(),
+            id=str(uuid.UUID(int=2)),
+        ).encode()
+
+        await self.listing_service.get_listings_page(
+            sort_options=SortOptions(column="created_at", order="asc"),
+            filter=None,
+            limit=2,
+            cursor=cursor,
+        )
+
+        sql = self._compiled_query()
+        self.assertIn("(listings.created_at, listings.id) >", sql)
+        self.assertIn("ORDER BY listings.created_at ASC, listings.id ASC", sql)
+
+    async def test_cursor_with_different_sort_is_rejected(self):
+        cursor = ListingCursor(
+            column="price", order="asc", value=1000, id=str(uuid.UUID(int=1))
+        ).encode()
+
+        with self.assertRaises(ValueError):
+            await self.listing_service.get_listings_page(
+                sort_options=SortOptions(column="price", order="desc"),
+                filter=None,
+                limit=2,
+                cursor=cursor,
+            )
+        self.mock_repository.get_listings.assert_not_called()
+
+    async def test_nullable_sort_column_is_rejected(self):
+        with self.assertRaises(ValueError):
+            await self.listing_service.get_listings_page(
+                sort_options=SortOptions(column="client_id", order=None),
+                filter=None,
+                limit=2,
+            )
+
+    def test_malformed_cursor_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            ListingCursor.decode("not-a-cursor")
+
+
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestListingServiceSearch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_repository = AsyncMock()
+        self.listing_service = ListingService(repository=self.mock_repository)
+        self.listings = [make_listing_db(i) for i in range(1, 4)]
+
+    def _compiled_query(self):
+        query = self.mock_repository.get_ranked_listings.call_args.kwargs["query"]
+        return query.compile(dialect=postgresql.dialect())
+
+    async def test_search_matches_prefixes_and_orders_by_rank(self):
+        self.mock_repository.get_ranked_listings.return_value = []
+
+        await self.listing_service.search_listings(text="Ever's terr", limit=2)
+
+        compiled = self._compiled_query()
+        sql = str(compiled)
+        self.assertIn("listings.search_vector @@ to_tsquery(", sql)
+        self.assertIn("ts_rank_cd(listings.search_vector", sql)
+        self.assertIn("DESC, listings.id DESC", sql)
+        self.assertIn("ever:* & s:* & terr:*", compiled.params.values())
+
+    async def test_search_rejects_text_without_words(self):
+        with self.assertRaises(ValueError):
+            await self.listing_service.search_listings(text=" &|! ", limit=2)
+
+        self.mock_repository.get_ranked_listings.assert_not_called()
+
+    async def test_search_returns_rank_cursor(self):
+        self.mock_repository.get_ranked_listings.return_value = [
+            (listing, 1.0 / listing.price) for listing in self.listings
+        ]
+
+        page = await self.listing_service.search_listings(text="listing", limit=2)
+
+        self.assertEqual(page.items, self.listings[:2])
+        cursor = ListingCursor.decode(page.next_cursor)
+        self.assertEqual(cursor.column, "rank")
+        self.assertEqual(cursor.value, 1.0 / 2000)
+        self.assertEqual(cursor.id, str(self.listings[1].id))
+
+    async def test_search_cursor_continues_after_last_rank(self):
+        self.mock_repository.get_ranked_listings.return_value = []
+        cursor = ListingCursor(
+            column="rank", order="desc", value=0.5, id=str(self.listings[0].id)
+        ).encode()
+
+        await self.listing_service.search_listings(
+            text="listing", limit=2, cursor=cursor
+        )
+
+        sql = str(self._compiled_query())
+        self.assertIn("(ts_rank_cd(listings.search_vector", sql)
+        self.assertIn(") < (", sql)
+
+    async def test_search_rejects_listing_page_cursor(self):
+        cursor = ListingCursor(
+            column="price", order="desc", value=1000, id=str(self.listings[0].id)
+        ).encode()
+
+        with self.assertRaises(ValueError):
+            await self.listing_service.search_listings(
+                text="listing", limit=2, cursor=cursor
+            )
+
+
+class TestListingServiceProjection(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_repository = AsyncMock()
+        self.listing_service = ListingService(repository=self.mock_repository)
+        self.rows = [
+            {
+                "id": listing.id,
+                "title": listing.title,
+                "price": listing.price,
+                "status": listing.status,
+            }
+            for listing in (make_listing_db(i) for i in range(1, 4))
+        ]
+
+    def _compiled_query(self):
+        query = self.mock_repository.get_listing_rows.call_args.kwargs["query"]
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def test_fieldset_is_validated_and_ordered(self):
+        self.assertEqual(
+            listing_fields(["status", "title", "price"]),
+            ("title", "price", "status", "id"),
+        )
+        with self.assertRaises(ValueError):
+            listing_fields(["title", "hashed_password"])
+
+    async def test_projection_selects_only_requested_columns(self):
+        self.mock_repository.get_listing_rows.return_value = self.rows
+        fields = listing_fields(["title", "price", "status"])
+
+        listings = await self.listing_service.get_listings(
+            sort_options=SortOptions(column="price", order="desc"),
+            filter=None,
+            fields=fields,
+        )
+
+        sql = self._compiled_query()
+        self.assertTrue(
+            sql.startswith(
+                "SELECT listings.title, listings.price, listings.status, listings.id \n"
+            )
+        )
+        self.assertNotIn("description", sql)
+        self.mock_repository.get_listings.assert_not_called()
+        self.assertEqual(
+            json.loads(to_json(listings))[0],
+            {
+                "title": "Listing 1",
+                "price": 1000,
+                "status": "Available",
+                "id": str(self.rows[0]["id"]),
+            },
+        )
+
+    async def test_projection_page_adds_sort_column_for_cursor(self):
+        self.mock_repository.get_listing_rows.return_value = [
+            {key: row[key] for key in ("title", "id")}
+            | {"created_at": datetime.datetime(2024, 1, i + 1)}
+            for i, row in enumerate(self.rows)
+        ]
+
+        page = await self.listing_service.get_listings_page(
+            sort_options=SortOptions(column="created_at", order="asc"),
+            filter=None,
+            limit=2,
+            fields=listing_fields(["title"]),
+        )
+
+        self.assertIn("listings.created_at", self._compiled_query())
+        self.assertEqual(len(page.items), 2)
+        cursor = ListingCursor.decode(page.next_cursor)
+        self.assertEqual(cursor.value, "2024-01-02T00:00:00")
+        self.assertEqual(
+            set(json.loads(page.model_dump_json())["items"][0]),
+            {"id", "title", "created_at"},
+        )
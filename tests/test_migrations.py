@@ -0,0 +1,38 @@
+import io
+import unittest
+
+from alembic import command
+from alembic.script import ScriptDirectory
+
+from app.infrastructure.db import migration_config
+from app.infrastructure.models.base_model import Base
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.alembic_config = migration_config()
+
+    def _offline_sql(self) -> str:
+        buffer = io.StringIO()
+        self.alembic_config.output_buffer = buffer
+        command.upgrade(self.alembic_config, "head", sql=True)
+        return buffer.getvalue()
+
+    def test_revisions_form_a_single_line(self):
+        script = ScriptDirectory.from_config(self.alembic_config)
+
+        self.assertEqual(len(script.get_heads()), 1)
+        self.assertEqual(len(script.get_bases()), 1)
+
+    def test_migrations_create_every_table_and_index_of_the_models(self):
+        sql = self._offline_sql()
+
+        for table in Base.metadata.sorted_tables:
+            with self.subTest(table=table.name):
+                self.assertIn(f"CREATE TABLE {table.name} ", sql)
+            for index in table.indexes:
+                with self.subTest(index=index.name):
+                    self.assertIn(f"CREATE INDEX {index.name} ON {table.name} ", sql)
+            for column in table.columns:
+                with self.subTest(column=f"{table.name}.{column.name}"):
+                    self.assertRegex(sql, rf"\b{column.name}\b")
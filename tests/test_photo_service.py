@@ -0,0 +1,565 @@
+import asyncio
+import datetime
+import hashlib
+import io
+import os
+import tempfile
+import time
+import unittest
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from PIL import Image
+
+from app.application.interfaces.services.photo_service import (
+    PHOTO_VARIANTS,
+    InvalidImageTypeError,
+    ListingPhotoService,
+    ListingPhotoServiceError,
+    PhotoMissingError,
+    PhotoTooLargeError,
+    render_photo_variant,
+)
+from app.domain.dtos.photo_upload_dto import ListingPhotoUploadDTO
+from app.infrastructure.photo_storage import PhotoStorageLayout
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.infrastructure.workers import WorkerPool
+from app.presentation.schemas.photo_schema import ListingPhotoDB
+
+LISTING_ID = uuid.UUID(int=1, version=4)
+
+
+async def iter_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def make_upload(*chunks: bytes, content_type: str = "image/png", filename="a.png"):
+    return ListingPhotoUploadDTO(
+        listing_id=LISTING_ID,
+        filename=filename,
+        content_type=content_type,
+        chunks=iter_chunks(*chunks),
+    )
+
+
+def saved_photo(metadata) -> ListingPhotoDB:
+    return ListingPhotoDB(
+        **metadata.model_dump(),
+        id=uuid.uuid4(),
+        created_at=datetime.datetime(2024, 1, 1),
+    )
+
+
+class PhotoServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.storage = tempfile.TemporaryDirectory()
+        self.addCleanup(self.storage.cleanup)
+        self.storage_dir = Path(self.storage.name)
+        self.io_pool = WorkerPool(ThreadPoolExecutor, max_workers=2)
+        self.addCleanup(self.io_pool.shutdown)
+        self.mock_repository = AsyncMock()
+        self.mock_repository.create_photo.side_effect = saved_photo
+        self.service = ListingPhotoService(
+            repository=self.mock_repository,
+            storage=PhotoStorageLayout([self.storage.name]),
+            io_pool=self.io_pool,
+            max_upload_size_mb=1,
+        )
+
+    def stored_files(self) -> list[Path]:
+        return sorted(path for path in self.storage_dir.rglob("*") if path.is_file())
+
+
+class TestStorePhoto(PhotoServiceTestCase):
+    async def test_streams_chunks_into_final_file(self):
+        stored = await self.service.store_photo(make_upload(b"abc", b"def"))
+
+        self.assertEqual(stored.size_bytes, 6)
+        self.assertEqual(stored.original_name, "a.png")
+        self.assertEqual(Path(stored.storage_path).read_bytes(), b"abcdef")
+        self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+
+    async def test_rejects_upload_over_limit_without_leaving_files(self):
+        chunk = b"x" * (512 * 1024)
+
+        with self.assertRaises(PhotoTooLargeError):
+            await self.service.store_photo(make_upload(chunk, chunk, b"x"))
+
+        self.assertEqual(self.stored_files(), [])
+        self.mock_repository.create_photo.assert_not_called()
+
+    async def test_rejects_empty_upload(self):
+        with self.assertRaises(ListingPhotoServiceError):
+            await self.service.store_photo(make_upload())
+
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_rejects_non_image_before_writing(self):
+        with self.assertRaises(InvalidImageTypeError):
+            await self.service.store_photo(make_upload(b"abc", content_type="text/plain"))
+
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_removes_file_when_metadata_insert_fails(self):
+        self.mock_repository.create_photo.side_effect = RuntimeError("db down")
+
+        with self.assertRaises(RuntimeError):
+            await self.service.store_photo(make_upload(b"abc"))
+
+        self.assertEqual(self.stored_files(), [])
+
+
+    async def test_reports_whether_the_stored_file_exists(self):
+        stored = await self.service.store_photo(make_upload(b"abc"))
+
+        self.assertTrue(await self.service.has_stored_file(stored.storage_path))
+        Path(stored.storage_path).unlink()
+        self.assertFalse(await self.service.has_stored_file(stored.storage_path))
+
+class TestStorePhotos(PhotoServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_repository.create_photos.side_effect = lambda photos: [
+            saved_photo(photo) for photo in photos
+        ]
+
+    async def test_writes_files_and_inserts_metadata_once(self):
+        uploads = [
+            make_upload(f"photo {index}".encode(), filename=f"{index}.png")
+            for index in range(5)
+        ]
+
+        stored = await self.service.store_photos(uploads)
+
+        self.mock_repository.create_photos.assert_awaited_once()
+        self.mock_repository.create_photo.assert_not_called()
+        self.assertEqual(
+            [photo.original_name for photo in stored],
+            [f"{index}.png" for index in range(5)],
+        )
+        self.assertEqual(
+            [Path(photo.storage_path).read_bytes() for photo in stored],
+            [f"photo {index}".encode() for index in range(5)],
+        )
+
+    async def test_removes_written_files_when_one_upload_fails(self):
+        uploads = [
+            make_upload(b"ok", filename="ok.png"),
+            make_upload(filename="empty.png"),
+        ]
+
+        with self.assertRaises(ListingPhotoServiceError):
+            await self.service.store_photos(uploads)
+
+        self.assertEqual(self.stored_files(), [])
+        self.mock_repository.create_photos.assert_not_called()
+
+    async def test_removes_written_files_when_insert_fails(self):
+        self.mock_repository.create_photos.side_effect = RuntimeError("db down")
+
+        with self.assertRaises(RuntimeError):
+            await self.service.store_photos(
+                [make_upload(b"a"), make_upload(b"b", filename="b.png")]
+            )
+
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_rejects_invalid_batch_before_writing(self):
+        uploads = [
+            make_upload(b"ok"),
+            make_upload(b"text", content_type="text/plain", filename="a.txt"),
+        ]
+
+        with self.assertRaises(InvalidImageTypeError):
+            await self.service.store_photos(uploads)
+
+        self.assertEqual(self.stored_files(), [])
+
+
+def png_bytes(size=(800, 600), mode="RGBA") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color=(200, 100, 50, 255)[: len(mode)]).save(
+        buffer, format="PNG"
+    )
+    return buffer.getvalue()
+
+
+class TestPhotoVariants(PhotoServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.variant_pool = WorkerPool(ThreadPoolExecutor, max_workers=2)
+        self.addCleanup(self.variant_pool.shutdown)
+        self.service = ListingPhotoService(
+            repository=self.mock_repository,
+            storage=PhotoStorageLayout([self.storage.name]),
+            io_pool=self.io_pool,
+            max_upload_size_mb=1,
+            variant_pool=self.variant_pool,
+        )
+        self.mock_repository.create_variants.side_effect = lambda variants: list(
+            variants
+        )
+
+    async def test_generates_every_variant_next_to_the_original(self):
+        photo = await self.service.store_photo(make_upload(png_bytes()))
+        await self.service.wait_for_variants()
+
+        self.mock_repository.create_variants.assert_awaited_once()
+        variants = {
+            variant.name: variant
+            for variant in self.mock_repository.create_variants.call_args.args[0]
+        }
+        self.assertEqual(set(variants), set(PHOTO_VARIANTS))
+
+        thumbnail = variants["thumbnail"]
+        self.assertEqual(thumbnail.photo_id, photo.id)
+        self.assertEqual(thumbnail.content_type, "image/jpeg")
+        self.assertEqual(
+            (thumbnail.width, thumbnail.height),
+            (PHOTO_VARIANTS["thumbnail"].max_size, 240),
+        )
+        with Image.open(variants["webp"].storage_path) as webp:
+            self.assertEqual((webp.format, webp.size), ("WEBP", (800, 600)))
+        self.assertEqual(len(self.stored_files()), len(PHOTO_VARIANTS) + 1)
+
+    async def test_failed_variant_insert_removes_rendered_files(self):
+        self.mock_repository.create_variants.side_effect = RuntimeError("db down")
+        photo = await self.service.store_photo(make_upload(png_bytes()))
+        await self.service.wait_for_variants()
+
+        with self.assertRaises(RuntimeError):
+            await self.service.generate_variants(photo)
+
+        self.assertEqual(self.stored_files(), [Path(photo.storage_path)])
+
+    async def test_undecodable_image_does_not_fail_the_upload(self):
+        photo = await self.service.store_photo(make_upload(b"not an image"))
+        await self.service.wait_for_variants()
+
+        self.assertEqual(self.stored_files(), [Path(photo.storage_path)])
+        self.mock_repository.create_variants.assert_not_called()
+
+    async def test_duplicate_upload_reuses_the_rendered_variants(self):
+        with patch(
+            "app.application.interfaces.services.photo_service.render_photo_variant",
+            wraps=render_photo_variant,
+        ) as render:
+            await self.service.store_photo(make_upload(png_bytes()))
+            await self.service.wait_for_variants()
+            await self.service.store_photo(make_upload(png_bytes()))
+            await self.service.wait_for_variants()
+
+        self.assertEqual(render.call_count, len(PHOTO_VARIANTS))
+        first, second = (
+            call.args[0] for call in self.mock_repository.create_variants.call_args_list
+        )
+        self.assertEqual(
+            [(v.storage_path, v.width, v.height, v.size_bytes) for v in first],
+            [(v.storage_path, v.width, v.height, v.size_bytes) for v in second],
+        )
+        self.assertEqual(len(self.stored_files()), len(PHOTO_VARIANTS) + 1)
+
+    def test_each_render_writes_its_own_temp_file(self):
+        source = self.storage_dir / "source.png"
+        source.write_bytes(png_bytes())
+        target = self.storage_dir / "source.thumbnail.jpg"
+
+        with patch(
+            "app.application.interfaces.services.photo_service.os.replace",
+            wraps=os.replace,
+        ) as replace:
+            for _ in range(2):
+                render_photo_variant(
+                    str(source), str(target), PHOTO_VARIANTS["thumbnail"], 82
+                )
+
+        first, second = (call.args[0] for call in replace.call_args_list)
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.stored_files(), [source, target])
+
+    async def test_variants_are_generated_once_the_photo_is_committed(self):
+        unit_of_work = UnitOfWork(MagicMock())
+        self.service = ListingPhotoService(
+            repository=self.mock_repository,
+            storage=PhotoStorageLayout([self.storage.name]),
+            io_pool=self.io_pool,
+            variant_pool=self.variant_pool,
+            unit_of_work=unit_of_work,
+        )
+
+        async with unit_of_work.scope():
+            await self.service.store_photo(make_upload(png_bytes()))
+            await asyncio.sleep(0.1)
+            self.mock_repository.create_variants.assert_not_called()
+        await self.service.wait_for_variants()
+
+        self.mock_repository.create_variants.assert_awaited_once()
+
+
+class TestListingArchive(PhotoServiceTestCase):
+    async def store(self, *chunks: bytes, filename="a.png") -> ListingPhotoDB:
+        return await self.service.store_photo(make_upload(*chunks, filename=filename))
+
+    async def test_streams_every_photo_into_a_zip(self):
+        first = await self.store(b"x" * 300_000, b"y" * 300_000)
+        second = await self.store(b"second", filename="a.png")
+        self.mock_repository.list_by_listing.return_value = [first, second]
+
+        archive = await self.service.stream_listing_archive(LISTING_ID)
+        chunks = [chunk async for chunk in archive]
+
+        self.assertGreater(len(chunks), 2)
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zipped:
+            names = zipped.namelist()
+            self.assertEqual(names[0], "a.png")
+            self.assertEqual(names[1], f"a-{second.id.hex[:8]}.png")
+            self.assertEqual(zipped.read(names[0]), b"x" * 300_000 + b"y" * 300_000)
+            self.assertEqual(zipped.read(names[1]), b"second")
+            self.assertIsNone(zipped.testzip())
+
+    async def test_missing_file_fails_before_streaming(self):
+        photo = await self.store(b"abc")
+        Path(photo.storage_path).unlink()
+        self.mock_repository.list_by_listing.return_value = [photo]
+
+        with self.assertRaises(PhotoMissingError):
+            await self.service.stream_listing_archive(LISTING_ID)
+
+
+class TestContentAddressedStorage(PhotoServiceTestCase):
+    async def test_identical_uploads_share_one_blob(self):
+        first = await self.service.store_photo(make_upload(b"same"))
+        second = await self.service.store_photo(
+            make_upload(b"sa", b"me", filename="b.jpg")
+        )
+
+        self.assertEqual(first.sha256, hashlib.sha256(b"same").hexdigest())
+        self.assertEqual(first.sha256, second.sha256)
+        self.assertEqual(first.storage_path, second.storage_path)
+        self.assertEqual(second.original_name, "b.jpg")
+        self.assertEqual(self.stored_files(), [Path(first.storage_path)])
+
+    async def test_failed_insert_keeps_a_blob_that_already_existed(self):
+        stored = await self.service.store_photo(make_upload(b"same"))
+        self.mock_repository.create_photo.side_effect = RuntimeError("db down")
+
+        with self.assertRaises(RuntimeError):
+            await self.service.store_photo(make_upload(b"same"))
+
+        self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+
+    async def test_blob_is_locked_before_its_file_is_placed(self):
+        placed_before_lock = []
+        self.mock_repository.lock_blobs.side_effect = lambda items: (
+            placed_before_lock.extend(
+                Path(item.storage_path).exists() for item in items
+            )
+        )
+
+        stored = await self.service.store_photo(make_upload(b"same"))
+        await self.service.store_photo(make_upload(b"same"))
+
+        self.assertEqual(placed_before_lock, [False, True])
+        self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+
+    async def test_blob_removed_while_being_reused_is_stored_again(self):
+        stored = await self.service.store_photo(make_upload(b"same"))
+
+        with patch(
+            "app.application.interfaces.services.photo_service.os.utime",
+            side_effect=FileNotFoundError,
+        ):
+            await self.service.store_photo(make_upload(b"same"))
+
+        self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+        self.assertEqual(Path(stored.storage_path).read_bytes(), b"same")
+
+    async def test_delete_keeps_files_of_a_still_referenced_blob(self):
+        stored = await self.service.store_photo(make_upload(b"same"))
+        self.mock_repository.delete_photo.return_value = stored
+        self.mock_repository.release_blobs.return_value = []
+
+        self.assertTrue(await self.service.delete_photo(stored.id))
+
+        self.mock_repository.release_blobs.assert_awaited_once_with(
+            {stored.sha256: stored.storage_path}
+        )
+        self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+
+    async def test_delete_removes_an_unreferenced_blob_and_its_variants(self):
+        stored = await self.service.store_photo(make_upload(b"same"))
+        variant_path = Path(f"{stored.storage_path}.thumbnail.jpg")
+        variant_path.write_bytes(b"thumb")
+        self.mock_repository.delete_photo.return_value = stored
+        self.mock_repository.release_blobs.return_value = [stored.storage_path]
+
+        self.assertTrue(await self.service.delete_photo(stored.id))
+
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_delete_of_unknown_photo(self):
+        self.mock_repository.delete_photo.return_value = None
+
+        self.assertFalse(await self.service.delete_photo(uuid.uuid4()))
+        self.mock_repository.release_blobs.assert_not_called()
+
+
+class TestFileRemovalFollowsTheTransaction(PhotoServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.unit_of_work = UnitOfWork(MagicMock())
+        self.service = ListingPhotoService(
+            repository=self.mock_repository,
+            storage=PhotoStorageLayout([self.storage.name]),
+            io_pool=self.io_pool,
+            unit_of_work=self.unit_of_work,
+        )
+
+    async def test_delete_removes_files_only_after_commit(self):
+        stored = await self.service.store_photo(make_upload(b"same"))
+        self.mock_repository.delete_photo.return_value = stored
+        self.mock_repository.release_blobs.return_value = [stored.storage_path]
+
+        async with self.unit_of_work.scope():
+            self.assertTrue(await self.service.delete_photo(stored.id))
+            self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_rolled_back_delete_keeps_files(self):
+        stored = await self.service.store_photo(make_upload(b"same"))
+        self.mock_repository.delete_photo.return_value = stored
+        self.mock_repository.release_blobs.return_value = [stored.storage_path]
+
+        with self.assertRaises(RuntimeError):
+            async with self.unit_of_work.scope():
+                await self.service.delete_photo(stored.id)
+                raise RuntimeError("commit failed")
+
+        self.assertEqual(self.stored_files(), [Path(stored.storage_path)])
+
+    async def test_rolled_back_upload_removes_its_file(self):
+        self.mock_repository.release_blobs.side_effect = lambda blobs: list(
+            blobs.values()
+        )
+
+        with self.assertRaises(RuntimeError):
+            async with self.unit_of_work.scope():
+                await self.service.store_photo(make_upload(b"new"))
+                self.assertEqual(len(self.stored_files()), 1)
+                raise RuntimeError("commit failed")
+
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_upload_is_placed_and_inserted_in_its_own_transaction(self):
+        scopes = []
+
+        def create_photos(items):
+            scopes.append(self.unit_of_work.in_scope)
+            return [saved_photo(item) for item in items]
+
+        self.mock_repository.lock_blobs.side_effect = lambda items: scopes.append(
+            self.unit_of_work.in_scope
+        )
+        self.mock_repository.create_photos.side_effect = create_photos
+
+        await self.service.store_photos([make_upload(b"new")])
+
+        self.assertEqual(scopes, [True, True])
+        self.assertFalse(self.unit_of_work.in_scope)
+
+    async def test_failed_upload_commit_removes_its_file(self):
+        self.mock_repository.release_blobs.side_effect = lambda blobs: list(
+            blobs.values()
+        )
+
+        commit = AsyncMock(side_effect=[RuntimeError("commit failed"), None])
+        with patch.object(UnitOfWork, "_end_transaction", commit):
+            with self.assertRaises(RuntimeError):
+                await self.service.store_photo(make_upload(b"new"))
+
+        self.assertEqual(self.stored_files(), [])
+
+
+class TestOrphanSweep(PhotoServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = ListingPhotoService(
+            repository=self.mock_repository,
+            storage=PhotoStorageLayout([self.storage.name]),
+            io_pool=self.io_pool,
+            sweep_batch_size=2,
+            sweep_pause_seconds=0,
+            sweep_grace_seconds=60,
+        )
+        self.referenced = {self.write_file("kept", age=3600)}
+        self.orphan = self.write_file("orphan", age=3600)
+        self.fresh = self.write_file("fresh", age=0)
+        self.temp = self.storage_dir / ".upload-1.part"
+        self.temp.write_bytes(b"partial")
+        os.utime(self.temp, (time.time() - 3600,) * 2)
+        self.active_temp = self.storage_dir / ".upload-2.part"
+        self.active_temp.write_bytes(b"writing")
+
+        self.mock_repository.lock_storage = MagicMock()
+        self.mock_repository.lock_storage.return_value.__aenter__.return_value = True
+        self.mock_repository.release_unreferenced_blobs.return_value = 1
+        self.mock_repository.find_referenced_paths.side_effect = (
+            lambda paths: self.referenced & set(paths)
+        )
+        self.missing_id = uuid.uuid4()
+        rows = [
+            (uuid.uuid4(), next(iter(self.referenced))),
+            (self.missing_id, str(self.storage_dir / "gone")),
+        ]
+        self.mock_repository.list_photo_paths.side_effect = (
+            lambda after_id, limit: rows if after_id is None else []
+        )
+
+    def write_file(self, name: str, age: float) -> str:
+        path = self.storage_dir / name[:2] / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(name.encode())
+        os.utime(path, (time.time() - age,) * 2)
+        return str(path)
+
+    async def test_reclaims_old_orphans_and_reports_missing_files(self):
+        report = await self.service.sweep_orphans()
+
+        self.assertEqual(report.released_blobs, 1)
+        self.assertEqual(report.scanned_files, 5)
+        # The temp file left by a crashed upload goes, the one in use stays.
+        self.assertEqual(report.orphaned_files, 2)
+        self.assertEqual(report.orphaned_bytes, len(b"orphan") + len(b"partial"))
+        self.assertEqual(report.missing_files, 1)
+        self.assertEqual(report.missing_photo_ids, [self.missing_id])
+        self.assertEqual(
+            {str(path) for path in self.stored_files()},
+            self.referenced | {self.fresh, str(self.active_temp)},
+        )
+        self.assertEqual(self.mock_repository.find_referenced_paths.await_count, 3)
+        self.assertEqual(self.service.sweep_stats()["orphaned_files"], 2)
+
+    async def test_dry_run_changes_nothing(self):
+        report = await self.service.sweep_orphans(dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(report.orphaned_files, 2)
+        self.assertTrue(Path(self.orphan).exists())
+        self.assertTrue(self.temp.exists())
+        self.mock_repository.release_unreferenced_blobs.assert_not_called()
+
+    async def test_skips_while_the_storage_is_locked(self):
+        self.mock_repository.lock_storage.return_value.__aenter__.return_value = False
+
+        report = await self.service.sweep_orphans()
+
+        self.assertTrue(report.skipped)
+        self.assertTrue(Path(self.orphan).exists())
+        self.mock_repository.release_unreferenced_blobs.assert_not_called()
+        self.mock_repository.find_referenced_paths.assert_not_called()
+        self.assertTrue(self.service.sweep_stats()["skipped"])
@@ -0,0 +1,193 @@
+import errno
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.application.interfaces.services.photo_service import ListingPhotoService
+from app.infrastructure.migrate_photo_storage import (
+    migrate_photo_storage,
+    relocate_files,
+)
+from app.infrastructure.photo_storage import PhotoStorageLayout, move_file
+from app.infrastructure.workers import WorkerPool
+
+
+class TestPhotoStorageLayout(unittest.TestCase):
+    def setUp(self):
+        storage = tempfile.TemporaryDirectory()
+        self.addCleanup(storage.cleanup)
+        self.base = Path(storage.name)
+
+    def test_fans_content_addressed_names_out_by_hash(self):
+        layout = PhotoStorageLayout([self.base])
+        sha256 = hashlib.sha256(b"photo").hexdigest()
+
+        self.assertEqual(
+            layout.path_for(sha256),
+            self.base / sha256[:2] / sha256[2:4] / sha256,
+        )
+
+    def test_spreads_files_over_every_root(self):
+        roots = [self.base / "volume-a", self.base / "volume-b"]
+        layout = PhotoStorageLayout([f" {roots[0]}", str(roots[1]), ""], depth=1)
+
+        used_roots = {
+            layout.path_for(hashlib.sha256(str(i).encode()).hexdigest()).parents[1]
+            for i in range(50)
+        }
+
+        self.assertEqual(layout.roots, roots)
+        self.assertEqual(used_roots, set(roots))
+        self.assertTrue(all(root.is_dir() for root in roots))
+
+    def test_hashes_legacy_names_for_placement(self):
+        layout = PhotoStorageLayout([self.base])
+        path = layout.path_for("0123456789abcdef0123456789abcdef.png")
+
+        self.assertEqual(path.name, "0123456789abcdef0123456789abcdef.png")
+        self.assertNotEqual(path.parent.parent.name, "01")
+        self.assertEqual(path, layout.path_for(path.name))
+
+    def test_iter_files_includes_temporary_files(self):
+        layout = PhotoStorageLayout([self.base])
+        stored = layout.path_for(hashlib.sha256(b"photo").hexdigest())
+        stored.parent.mkdir(parents=True)
+        stored.write_bytes(b"photo")
+        temp_path = layout.temp_path()
+        temp_path.write_bytes(b"partial")
+        (self.base / ".hidden").write_bytes(b"hidden")
+
+        self.assertEqual(sorted(layout.iter_files()), sorted([stored, temp_path]))
+
+    def test_requires_a_root(self):
+        with self.assertRaises(ValueError):
+            PhotoStorageLayout([" "])
+
+
+class TestMoveFile(unittest.TestCase):
+    def setUp(self):
+        storage = tempfile.TemporaryDirectory()
+        self.addCleanup(storage.cleanup)
+        self.base = Path(storage.name)
+        self.source = self.base / "source"
+        self.source.write_bytes(b"photo")
+
+    def test_copies_when_moving_across_volumes(self):
+        target = self.base / "other" / "target"
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+
+        with patch(
+            "app.infrastructure.photo_storage.os.replace",
+            side_effect=[cross_device, None],
+        ) as replace:
+            move_file(self.source, target)
+
+        replace.assert_called_with(target.with_name(".target.part"), target)
+        self.assertFalse(self.source.exists())
+        self.assertEqual(target.with_name(".target.part").read_bytes(), b"photo")
+
+    def test_relocates_an_original_with_its_variants(self):
+        old_path = self.base / "abc.png"
+        old_path.write_bytes(b"original")
+        (self.base / "abc.thumbnail.jpg").write_bytes(b"thumbnail")
+        new_path = self.base / "ab" / "abc.png"
+
+        self.assertTrue(relocate_files(old_path, new_path))
+        self.assertTrue(relocate_files(old_path, new_path))
+
+        self.assertEqual(
+            sorted(path.name for path in self.base.rglob("*") if path.is_file()),
+            ["abc.png", "abc.thumbnail.jpg", "source"],
+        )
+        self.assertEqual(new_path.read_bytes(), b"original")
+        self.assertFalse(relocate_files(self.base / "gone.png", self.base / "x.png"))
+
+
+class FakeEngine:
+    """Hands out connections that track the photo storage lock and run
+    ``before_update`` ahead of the first row update."""
+
+    def __init__(self, paths: list[str], before_update) -> None:
+        self.paths = paths
+        self.before_update = before_update
+        self.storage_locked = False
+
+    @asynccontextmanager
+    async def connect(self):
+        conn = AsyncMock()
+        conn.scalars.return_value = MagicMock(all=MagicMock(return_value=self.paths))
+        yield conn
+
+    @asynccontextmanager
+    async def begin(self):
+        took_lock = False
+
+        async def execute(statement, params=None):
+            nonlocal took_lock
+            if "pg_advisory_xact_lock" in str(statement):
+                took_lock = self.storage_locked = True
+            elif str(statement).startswith("UPDATE") and self.before_update:
+                before_update, self.before_update = self.before_update, None
+                await before_update()
+
+        conn = AsyncMock()
+        conn.execute.side_effect = execute
+        try:
+            yield conn
+        finally:
+            if took_lock:
+                self.storage_locked = False
+
+
+class TestMigrationAndSweep(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        storage = tempfile.TemporaryDirectory()
+        self.addCleanup(storage.cleanup)
+        self.base = Path(storage.name)
+        self.layout = PhotoStorageLayout([self.base / "photos"])
+        self.repository = AsyncMock()
+        self.repository.list_photo_paths.return_value = []
+        self.service = ListingPhotoService(
+            repository=self.repository,
+            storage=self.layout,
+            io_pool=WorkerPool(ThreadPoolExecutor, max_workers=2),
+            sweep_pause_seconds=0,
+            sweep_grace_seconds=60,
+        )
+
+    async def test_sweep_between_relocation_and_update_keeps_moved_files(self):
+        old_path = self.base / "photos" / "abc.png"
+        old_path.parent.mkdir(exist_ok=True)
+        old_path.write_bytes(b"original")
+        os.utime(old_path, (time.time() - 3600,) * 2)
+        new_path = self.layout.path_for("abc.png")
+        # The rows still point at the old path until the batch is updated.
+        self.repository.find_referenced_paths.side_effect = (
+            lambda paths: {str(old_path)} & set(paths)
+        )
+        reports = []
+
+        async def sweep():
+            self.assertTrue(new_path.exists())
+            reports.append(await self.service.sweep_orphans())
+
+        engine = FakeEngine([str(old_path)], before_update=sweep)
+
+        @asynccontextmanager
+        async def lock_storage():
+            yield not engine.storage_locked
+
+        self.repository.lock_storage = lock_storage
+
+        self.assertEqual(await migrate_photo_storage(engine, self.layout), (1, 0))
+
+        (report,) = reports
+        self.assertTrue(report.skipped)
+        self.assertEqual(new_path.read_bytes(), b"original")
+        self.repository.find_referenced_paths.assert_not_called()
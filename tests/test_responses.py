@@ -0,0 +1,65 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from app.presentation.api.v1.responses import ETagFileResponse, PydanticJSONResponse
+from app.presentation.schemas.listing_schema import ListingPage
+from tests.test_listing_service import make_listing_db
+
+
+class TestPydanticJSONResponse(unittest.TestCase):
+    def test_renders_models_like_the_default_encoder(self):
+        listings = [make_listing_db(i) for i in range(1, 3)]
+        page = ListingPage(items=listings, next_cursor="abc")
+
+        for content in (listings, page):
+            with self.subTest(content=type(content).__name__):
+                response = PydanticJSONResponse(content)
+
+                self.assertEqual(response.media_type, "application/json")
+                self.assertEqual(
+                    json.loads(response.body), jsonable_encoder(content)
+                )
+
+
+class TestETagFileResponse(unittest.TestCase):
+    def setUp(self):
+        storage = tempfile.TemporaryDirectory()
+        self.addCleanup(storage.cleanup)
+        self.path = Path(storage.name) / "photo.png"
+        self.path.write_bytes(b"0123456789")
+
+        app = FastAPI()
+
+        @app.get("/file")
+        async def serve_file():
+            return ETagFileResponse(self.path, etag='"abc"', media_type="image/png")
+
+        self.client = TestClient(app)
+
+    def test_uses_the_supplied_etag(self):
+        response = self.client.get("/file")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["etag"], '"abc"')
+        self.assertEqual(response.headers["accept-ranges"], "bytes")
+        self.assertEqual(response.content, b"0123456789")
+
+    def test_if_range_is_checked_against_the_supplied_etag(self):
+        matching = self.client.get(
+            "/file", headers={"Range": "bytes=2-4", "If-Range": '"abc"'}
+        )
+        stale = self.client.get(
+            "/file", headers={"Range": "bytes=2-4", "If-Range": '"old"'}
+        )
+
+        self.assertEqual(matching.status_code, 206)
+        self.assertEqual(matching.content, b"234")
+        self.assertEqual(matching.headers["content-range"], "bytes 2-4/10")
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.content, b"0123456789")
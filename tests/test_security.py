@@ -1,10 +1,14 @@
+import asyncio
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 
 import jwt
 from fastapi import HTTPException
 
+from app.infrastructure.cache import TTLCache, principal_cache
 from app.infrastructure.security import (
     authenticate_user,
     create_token,
@@ -12,6 +16,7 @@ from app.infrastructure.security import (
     verify_password,
     verify_token,
 )
+from app.infrastructure.workers import WorkerPool, WorkerPoolFullError
 
 
 class MockUser:
@@ -29,6 +34,9 @@ class MockUser:
 
 
 class TestSecurityModule(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        principal_cache.clear()
+
     async def test_get_password_hash_returns_string(self):
         hashed = await get_password_hash("password123")
         self.assertIsInstance(hashed, str)
@@ -300,5 +308,150 @@ class TestSecurityModule(unittest.IsolatedAsyncioTestCase):
         mock_get_user.assert_called_once_with(username="unknown_user")
 
 
+class TestPrincipalCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        principal_cache.clear()
+
+    def _valid_payload(self, mock_config, mock_jwt_decode, mock_datetime_module):
+        mock_config.SECRET_KEY = "test_secret"
+        mock_config.ALGORITHM = "HS256"
+        now = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        mock_jwt_decode.return_value = {
+            "sub": "testuser",
+            "exp": now + timedelta(minutes=30),
+        }
+        mock_datetime_module.datetime.now.return_value = now
+        mock_datetime_module.timezone.utc = timezone.utc
+
+    @patch("app.infrastructure.security.datetime")
+    @patch("app.infrastructure.security.get_user_by_username", new_callable=AsyncMock)
+    @patch("app.infrastructure.security.jwt.decode")
+    @patch("app.infrastructure.security.config")
+    async def test_verify_token_uses_cached_principal(
+        self, mock_config, mock_jwt_decode, mock_get_user, mock_datetime_module
+    ):
+        self._valid_payload(mock_config, mock_jwt_decode, mock_datetime_module)
+        mock_get_user.return_value = MockUser(username="testuser")
+
+        self.assertTrue(await verify_token(token="fake.valid.token"))
+        self.assertTrue(await verify_token(token="fake.valid.token"))
+
+        mock_get_user.assert_called_once_with(username="testuser")
+        self.assertEqual(principal_cache.hits, 1)
+        self.assertEqual(principal_cache.misses, 1)
+
+    @patch("app.infrastructure.security.datetime")
+    @patch("app.infrastructure.security.get_user_by_username", new_callable=AsyncMock)
+    @patch("app.infrastructure.security.jwt.decode")
+    @patch("app.infrastructure.security.config")
+    async def test_invalidated_principal_is_loaded_again(
+        self, mock_config, mock_jwt_decode, mock_get_user, mock_datetime_module
+    ):
+        self._valid_payload(mock_config, mock_jwt_decode, mock_datetime_module)
+        mock_get_user.return_value = MockUser(username="testuser")
+
+        await verify_token(token="fake.valid.token")
+        principal_cache.invalidate("testuser")
+        mock_get_user.return_value = None
+
+        with self.assertRaises(HTTPException) as cm:
+            await verify_token(token="fake.valid.token")
+
+        self.assertEqual(cm.exception.status_code, 401)
+        self.assertEqual(mock_get_user.await_count, 2)
+
+    @patch("app.infrastructure.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, mock_monotonic):
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        mock_monotonic.return_value = 100
+        cache.set("user", "principal")
+
+        mock_monotonic.return_value = 105
+        self.assertEqual(cache.get("user"), "principal")
+
+        mock_monotonic.return_value = 111
+        self.assertIsNone(cache.get("user"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+
+class TestPasswordHashPool(unittest.IsolatedAsyncioTestCase):
+    @patch("app.infrastructure.security.password_context.hash")
+    async def test_hashing_runs_outside_event_loop_thread(self, mock_hash):
+        mock_hash.side_effect = lambda password: threading.current_thread().name
+
+        thread_name = await get_password_hash("password123")
+
+        self.assertNotEqual(thread_name, threading.current_thread().name)
+        self.assertTrue(thread_name.startswith("password-hash"))
+
+    async def test_pool_rejects_jobs_when_queue_is_full(self):
+        pool = WorkerPool(ThreadPoolExecutor, max_workers=1, max_queue=1)
+        release = threading.Event()
+        self.addCleanup(pool.shutdown)
+        self.addCleanup(release.set)
+
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+
+        self.assertEqual(pool.stats()["active"], 1)
+        self.assertEqual(pool.stats()["queued"], 1)
+        with self.assertRaises(WorkerPoolFullError):
+            await pool.run(release.wait)
+
+        release.set()
+        await asyncio.gather(running, queued)
+        self.assertEqual(pool.stats()["rejected"], 1)
+        self.assertEqual(pool.stats()["completed"], 2)
+        self.assertEqual(pool.stats()["queued"], 0)
+
+    async def test_cancelled_caller_keeps_running_job_counted(self):
+        pool = WorkerPool(ThreadPoolExecutor, max_workers=1, max_queue=1)
+        release = threading.Event()
+        self.addCleanup(pool.shutdown)
+        self.addCleanup(release.set)
+
+        abandoned = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await abandoned
+
+        self.assertEqual(pool.stats()["active"], 1)
+        waiting = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        self.assertEqual(pool.stats()["queued"], 1)
+        with self.assertRaises(WorkerPoolFullError):
+            await pool.run(release.wait)
+
+        release.set()
+        await waiting
+        self.assertEqual(pool.stats()["completed"], 2)
+        self.assertEqual(pool.stats()["active"], 0)
+
+    async def test_failed_jobs_are_not_counted_as_completed(self):
+        pool = WorkerPool(ThreadPoolExecutor, max_workers=1)
+        self.addCleanup(pool.shutdown)
+
+        with self.assertRaises(ValueError):
+            await pool.run(int, "not a number")
+
+        self.assertEqual(pool.stats()["failed"], 1)
+        self.assertEqual(pool.stats()["completed"], 0)
+        self.assertEqual(pool.stats()["avg_seconds"], 0.0)
+        self.assertEqual(pool.stats()["active"], 0)
+
+
 if __name__ == "__main__":
     unittest.main()
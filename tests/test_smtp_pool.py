@@ -0,0 +1,156 @@
+import unittest
+from email.message import EmailMessage
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+
+from app.infrastructure.smtp_pool import SMTPConnectionPool
+
+
+def _smtp_connection():
+    smtp = AsyncMock()
+    smtp.is_connected = True
+    smtp.close = MagicMock()
+    return smtp
+
+
+class TestSMTPConnectionPool(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connections = []
+        smtp_patcher = patch("app.infrastructure.smtp_pool.aiosmtplib.SMTP")
+        self.smtp_class = smtp_patcher.start()
+        self.addCleanup(smtp_patcher.stop)
+        self.smtp_class.side_effect = self._new_connection
+
+        self.now = 1000.0
+        clock_patcher = patch(
+            "app.infrastructure.smtp_pool.time.monotonic", side_effect=lambda: self.now
+        )
+        clock_patcher.start()
+        self.addCleanup(clock_patcher.stop)
+
+        self.pool = SMTPConnectionPool(
+            hostname="smtp.example.com",
+            port=587,
+            username="sender@example.com",
+            password="secret",
+            size=2,
+            idle_timeout=240,
+            noop_after=30,
+            timeout=10,
+        )
+        self.message = EmailMessage()
+
+    def _new_connection(self, **kwargs):
+        smtp = _smtp_connection()
+        self.connections.append(smtp)
+        return smtp
+
+    async def test_connection_is_reused_between_messages(self):
+        await self.pool.send_message(self.message)
+        await self.pool.send_message(self.message)
+
+        self.smtp_class.assert_called_once_with(
+            hostname="smtp.example.com", port=587, timeout=10
+        )
+        (smtp,) = self.connections
+        smtp.connect.assert_awaited_once_with()
+        smtp.login.assert_awaited_once_with("sender@example.com", "secret")
+        self.assertEqual(smtp.send_message.await_count, 2)
+        smtp.quit.assert_not_awaited()
+        smtp.noop.assert_not_awaited()
+        self.assertEqual(self.pool.stats()["reused"], 1)
+        self.assertEqual(self.pool.stats()["idle"], 1)
+        self.assertEqual(self.pool.stats()["in_use"], 0)
+
+    async def test_quiet_connection_is_checked_with_noop(self):
+        await self.pool.send_message(self.message)
+        self.now += 31
+
+        await self.pool.send_message(self.message)
+
+        (smtp,) = self.connections
+        smtp.noop.assert_awaited_once_with()
+        self.assertEqual(self.pool.stats()["health_checks"], 1)
+
+    async def test_failed_noop_reconnects(self):
+        await self.pool.send_message(self.message)
+        self.connections[0].noop.side_effect = aiosmtplib.SMTPServerDisconnected(
+            "gone"
+        )
+        self.now += 31
+
+        await self.pool.send_message(self.message)
+
+        stale, fresh = self.connections
+        stale.close.assert_called_once_with()
+        self.assertEqual(stale.send_message.await_count, 1)
+        fresh.send_message.assert_awaited_once_with(self.message)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+
+    async def test_idle_connection_expires(self):
+        await self.pool.send_message(self.message)
+        self.now += 240
+
+        await self.pool.send_message(self.message)
+
+        expired, fresh = self.connections
+        expired.quit.assert_awaited_once_with()
+        expired.noop.assert_not_awaited()
+        fresh.send_message.assert_awaited_once_with(self.message)
+        self.assertEqual(self.pool.stats()["expired"], 1)
+
+    async def test_dropped_reused_connection_is_retried_once(self):
+        await self.pool.send_message(self.message)
+        self.connections[0].send_message.side_effect = (
+            aiosmtplib.SMTPServerDisconnected("gone")
+        )
+
+        await self.pool.send_message(self.message)
+
+        dropped, fresh = self.connections
+        dropped.close.assert_called_once_with()
+        fresh.send_message.assert_awaited_once_with(self.message)
+        self.assertEqual(self.pool.stats()["retried"], 1)
+        self.assertEqual(self.pool.stats()["idle"], 1)
+
+    async def test_dropped_fresh_connection_is_not_retried(self):
+        self.smtp_class.side_effect = None
+        smtp = _smtp_connection()
+        smtp.send_message.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+        self.smtp_class.return_value = smtp
+
+        with self.assertRaises(aiosmtplib.SMTPServerDisconnected):
+            await self.pool.send_message(self.message)
+
+        self.smtp_class.assert_called_once()
+        self.assertEqual(self.pool.stats()["idle"], 0)
+        self.assertEqual(self.pool.stats()["in_use"], 0)
+
+    async def test_failed_login_closes_connection(self):
+        self.smtp_class.side_effect = None
+        smtp = _smtp_connection()
+        smtp.login.side_effect = aiosmtplib.SMTPAuthenticationError(535, "denied")
+        self.smtp_class.return_value = smtp
+
+        with self.assertRaises(aiosmtplib.SMTPAuthenticationError):
+            await self.pool.send_message(self.message)
+
+        smtp.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats()["opened"], 0)
+        self.assertEqual(self.pool.stats()["in_use"], 0)
+
+    async def test_close_quits_idle_connections(self):
+        await self.pool.send_message(self.message)
+        self.connections[0].quit.side_effect = aiosmtplib.SMTPException("quit")
+
+        await self.pool.close()
+
+        (smtp,) = self.connections
+        smtp.quit.assert_awaited_once_with()
+        smtp.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats()["idle"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from app.infrastructure.unit_of_work import UnitOfWork
+
+
+def make_engine():
+    transaction = MagicMock()
+    transaction.commit = AsyncMock()
+    transaction.rollback = AsyncMock()
+    transaction.is_active = False
+
+    connection = MagicMock()
+    connection.begin = AsyncMock(return_value=transaction)
+    connection.close = AsyncMock()
+
+    engine = MagicMock()
+    engine.connect = AsyncMock(return_value=connection)
+    return engine, connection, transaction
+
+
+class TestUnitOfWork(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.engine, self.connection, self.transaction = make_engine()
+        self.unit_of_work = UnitOfWork(self.engine)
+
+    async def test_outside_scope_opens_a_session_per_call(self):
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(side_effect=["first", "second"])
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        self.unit_of_work._session_factory = factory
+
+        async with self.unit_of_work() as first:
+            pass
+        async with self.unit_of_work() as second:
+            pass
+
+        self.assertEqual((first, second), ("first", "second"))
+        self.assertEqual(factory.call_count, 2)
+        self.engine.connect.assert_not_awaited()
+
+    async def test_scope_shares_one_connection_and_commits_once(self):
+        async with self.unit_of_work.scope():
+            async with self.unit_of_work() as first:
+                await first.commit()
+            async with self.unit_of_work() as second:
+                pass
+
+        self.assertIs(first, second)
+        self.engine.connect.assert_awaited_once()
+        self.connection.begin.assert_awaited_once()
+        self.transaction.commit.assert_awaited_once()
+        self.transaction.rollback.assert_not_awaited()
+        self.connection.close.assert_awaited_once()
+
+    async def test_scope_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            async with self.unit_of_work.scope():
+                async with self.unit_of_work():
+                    raise RuntimeError("boom")
+
+        self.transaction.rollback.assert_awaited_once()
+        self.transaction.commit.assert_not_awaited()
+        self.connection.close.assert_awaited_once()
+
+    async def test_scope_without_database_access_checks_out_nothing(self):
+        async with self.unit_of_work.scope():
+            pass
+
+        self.engine.connect.assert_not_awaited()
+
+    async def test_nested_scope_joins_outer_scope(self):
+        async with self.unit_of_work.scope():
+            async with self.unit_of_work.scope():
+                async with self.unit_of_work():
+                    pass
+            self.transaction.commit.assert_not_awaited()
+
+        self.transaction.commit.assert_awaited_once()
+
+    async def test_after_commit_callbacks_wait_for_the_commit(self):
+        events = []
+
+        async def callback():
+            events.append(("callback", self.unit_of_work.in_scope))
+
+        self.transaction.commit.side_effect = lambda: events.append("commit")
+        async with self.unit_of_work.scope():
+            async with self.unit_of_work():
+                pass
+            await self.unit_of_work.after_commit(callback)
+            self.unit_of_work.after_rollback(AsyncMock())
+            self.assertEqual(events, [])
+
+        self.assertEqual(events, ["commit", ("callback", False)])
+
+    async def test_after_commit_runs_right_away_outside_a_scope(self):
+        callback = AsyncMock()
+
+        await self.unit_of_work.after_commit(callback)
+
+        callback.assert_awaited_once_with()
+
+    async def test_failed_commit_runs_rollback_callbacks(self):
+        on_commit, on_rollback = AsyncMock(), AsyncMock()
+        self.transaction.commit.side_effect = RuntimeError("commit failed")
+
+        with self.assertRaises(RuntimeError):
+            async with self.unit_of_work.scope():
+                async with self.unit_of_work():
+                    pass
+                await self.unit_of_work.after_commit(on_commit)
+                self.unit_of_work.after_rollback(on_rollback)
+
+        on_commit.assert_not_awaited()
+        on_rollback.assert_awaited_once_with()
+
+    async def test_failing_callback_does_not_fail_the_commit(self):
+        after = AsyncMock()
+
+        async with self.unit_of_work.scope():
+            await self.unit_of_work.after_commit(
+                AsyncMock(side_effect=OSError("gone"))
+            )
+            await self.unit_of_work.after_commit(after)
+
+        after.assert_awaited_once_with()